@@ -0,0 +1,61 @@
+import tracemalloc
+
+from santorinai.board import Board
+
+# This script measures the memory retained by Board.copy() results, as kept by
+# search players in their trees and caches, and compares it with the previous
+# layout of the board: dict backed objects, a list of lists for the levels and
+# tuple positions for the pawns.
+# Run it from the root of the project with:
+#   python -m benchmarks.board_memory
+
+nb_boards = 10000
+
+
+class DictPawn:
+    # Previous layout of a pawn
+    def __init__(self, pawn):
+        self.number = pawn.number
+        self.order = pawn.order
+        self.player_number = pawn.player_number
+        self.pos = tuple(pawn.pos)
+
+
+class DictBoard:
+    # Previous layout of a board
+    def __init__(self, board):
+        self.pawns = [DictPawn(pawn) for pawn in board.pawns]
+        self.nb_players = board.nb_players
+        self.nb_pawns = board.nb_pawns
+        self.board_size = board.board_size
+        self.board = [list(column) for column in board.board]
+        self.winner_player_number = board.winner_player_number
+        self.turn_number = board.turn_number
+        self.player_turn = board.player_turn
+
+
+def bytes_per_board(make_board):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    boards = [make_board() for _ in range(nb_boards)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    retained = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del boards
+    return retained / nb_boards
+
+
+# A board in the middle of a game
+board = Board(2)
+for position in [(1, 1), (3, 3), (1, 3), (3, 1)]:
+    board.place_pawn(position)
+board.play_move(1, (2, 2), (2, 3))
+board.play_move(1, (2, 1), (1, 0))
+
+before = bytes_per_board(lambda: DictBoard(board))
+after = bytes_per_board(board.copy)
+
+print(f"Previous layout: {before:7.0f} bytes per retained board")
+print(f"Current layout:  {after:7.0f} bytes per retained board")
+print(f"Saved:           {1 - after / before:7.0%}")
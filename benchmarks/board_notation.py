@@ -0,0 +1,43 @@
+import pickle
+import timeit
+
+from santorinai.board import Board
+
+# This script compares the ways of passing a board between processes or
+# storing it: pickle, the text notation and the 16 bytes encoding.
+# It prints the size of each serialization and the time to serialize and
+# parse a board.
+# Run it from the root of the project with:
+#   python -m benchmarks.board_notation
+
+nb_runs = 20000
+
+# A board in the middle of a game
+board = Board(2)
+for position in [(1, 1), (3, 3), (1, 3), (3, 1)]:
+    board.place_pawn(position)
+board.play_move(1, (2, 2), (2, 3))
+board.play_move(1, (2, 1), (1, 0))
+board.play_move(2, (1, 2), (0, 2))
+
+serializations = {
+    "pickle": (pickle.dumps, pickle.loads),
+    "notation": (Board.to_notation, Board.from_notation),
+    "bytes": (Board.to_bytes, Board.from_bytes),
+}
+
+
+def microseconds(function, argument):
+    duration = min(timeit.repeat(lambda: function(argument), number=nb_runs, repeat=5))
+    return duration / nb_runs * 1e6
+
+
+print(f"{'':10} {'size':>6} {'serialize':>11} {'parse':>9}")
+for name, (serialize, parse) in serializations.items():
+    serialized = serialize(board)
+    assert parse(serialized).position_key() == board.position_key()
+    print(
+        f"{name:10} {len(serialized):4} B"
+        f" {microseconds(serialize, board):8.2f} us"
+        f" {microseconds(parse, serialized):6.2f} us"
+    )
@@ -0,0 +1,37 @@
+import sys
+import time
+from importlib import import_module
+
+from santorinai.perft import KNOWN_PERFT, opening_board, perft
+
+# This script measures the speed of the move generation of Board backends:
+# the number of positions counted per second by perft on the opening
+# positions, checking the counts against the known ones.
+# Run it from the root of the project with:
+#   python -m benchmarks.perft_speed [module:BoardClass ...]
+
+depths = {
+    "empty board, 2 players": 4,
+    "corners, 2 players": 3,
+    "centre cross, 2 players": 3,
+}
+
+backends = sys.argv[1:] or ["santorinai.board:Board"]
+
+for backend in backends:
+    module_name, _, class_name = backend.partition(":")
+    board_class = getattr(import_module(module_name), class_name)
+    print(f"{backend}:")
+
+    for name, depth in depths.items():
+        board = opening_board(name, board_class)
+
+        start = time.perf_counter()
+        count = perft(board, depth)
+        elapsed = time.perf_counter() - start
+
+        status = "ok" if count == KNOWN_PERFT[name][depth] else "WRONG COUNT"
+        print(
+            f"  {name}, depth {depth}: {count} positions in {elapsed:.2f}s,"
+            f" {count / elapsed:.0f} positions/s ({status})"
+        )
@@ -0,0 +1,59 @@
+from time import perf_counter
+
+from santorinai.board import Board
+from santorinai.player_examples.first_choice_player import FirstChoicePlayer
+from santorinai.subprocess_player import SubprocessPlayer
+
+# This script measures the overhead of the stdio protocol of SubprocessPlayer:
+# the round trip of an empty request, and a play_move call compared to the
+# same player called in process, with the board sent as JSON or written in
+# shared memory.
+# Run it from the root of the project with:
+#   python -m benchmarks.subprocess_player_latency
+
+nb_calls = 2000
+
+# A board in the middle of a game
+board = Board(2)
+for position in [(1, 1), (3, 3), (1, 3), (3, 1)]:
+    board.place_pawn(position)
+board.play_move(1, (2, 2), (2, 3))
+board.play_move(1, (2, 1), (1, 0))
+
+
+def time_calls(function):
+    start = perf_counter()
+    for _ in range(nb_calls):
+        function()
+    return (perf_counter() - start) / nb_calls * 1e6
+
+
+# Process startup and player initialisation
+start = perf_counter()
+subprocess_player = SubprocessPlayer(
+    "santorinai.player_examples.first_choice_player:FirstChoicePlayer", 1
+)
+startup_ms = (perf_counter() - start) * 1000
+
+shared_board_player = SubprocessPlayer(
+    "santorinai.player_examples.first_choice_player:FirstChoicePlayer",
+    1,
+    shared_board=True,
+)
+in_process_player = FirstChoicePlayer(1)
+
+ping_us = time_calls(lambda: subprocess_player.agent.request({"cmd": "ping"}))
+in_process_us = time_calls(lambda: in_process_player.play_move(board.copy()))
+subprocess_us = time_calls(lambda: subprocess_player.play_move(board.copy()))
+shared_board_us = time_calls(lambda: shared_board_player.play_move(board.copy()))
+
+subprocess_player.close()
+shared_board_player.close()
+
+print(f"Process startup:              {startup_ms:8.1f} ms")
+print(f"Protocol round trip (ping):   {ping_us:8.1f} us")
+print(f"play_move in process:         {in_process_us:8.1f} us")
+print(f"play_move through subprocess: {subprocess_us:8.1f} us")
+print(f"Overhead per move:            {subprocess_us - in_process_us:8.1f} us")
+print(f"play_move with shared board:  {shared_board_us:8.1f} us")
+print(f"Overhead per move:            {shared_board_us - in_process_us:8.1f} us")
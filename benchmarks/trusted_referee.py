@@ -0,0 +1,50 @@
+import timeit
+
+from santorinai.player_examples.random_player import RandomPlayer
+from santorinai.tester import Tester
+
+# This script compares the speed of the referee modes of the Tester, for
+# random players flagged as trusted (they only answer legal moves): moves
+# validated by the board, moves played without validation, and moves played
+# without validation then checked by replaying each game.
+# Run it from the root of the project with:
+#   python -m benchmarks.trusted_referee
+
+nb_games = 500
+
+
+class TrustedRandomPlayer(RandomPlayer):
+    trusted = True
+
+
+class OtherTrustedRandomPlayer(TrustedRandomPlayer):
+    def name(self):
+        return "Other Random"
+
+
+modes = {
+    "validated": dict(trusted_referee=False),
+    "trusted": dict(trusted_referee=True, verify_trusted_games=False),
+    "trusted + replay": dict(trusted_referee=True, verify_trusted_games=True),
+    "trusted + 10% sample": dict(
+        trusted_referee=True, verify_trusted_games=False, trusted_sample_rate=0.1
+    ),
+}
+
+
+def play(settings):
+    tester = Tester()
+    tester.verbose_level = 0
+    tester.seed = 0
+    for name, value in settings.items():
+        setattr(tester, name, value)
+    return tester.play_1v1(
+        TrustedRandomPlayer(1), OtherTrustedRandomPlayer(2), nb_games=nb_games
+    )[0]
+
+
+expected_results = play(modes["validated"])
+for name, settings in modes.items():
+    assert play(settings) == expected_results
+    duration = min(timeit.repeat(lambda: play(settings), number=1, repeat=3))
+    print(f"{name:22} {nb_games / duration:8.0f} games/s")
@@ -1,7 +1,14 @@
+import os
+
+from santorinai.checkpoint import MatchCheckpoint
+from santorinai.result_cache import ResultCache
+from santorinai.results_store import ResultsStore
 from santorinai.tester import Tester
 from santorinai.player_examples.random_player import RandomPlayer
 from santorinai.player_examples.first_choice_player import FirstChoicePlayer
 from santorinai.player_examples.basic_player import BasicPlayer
+from santorinai.sprt import SPRT
+from santorinai.worker_pool import WorkerPool
 
 # This script is used to compare the performance of a list of players.
 # It will display a table with the results of each player against each other player.
@@ -23,95 +30,227 @@ tester.verbose_level = 0
 # tester.delay_between_moves = 0.5  # Delay between each move in seconds
 # tester.display_board = True  # Display a graphical view of the board in a window
 
-nb_games = 1000
-results = {}  # We will count the number of victories for each player
+# Replay the same games on each run, each game is seeded from the seed and its number
+# tester.seed = 0
+
+nb_games = 1000  # Maximum number of games per pairing
+
+# Stop a pairing as soon as one player is shown to be stronger
+# Set to False to always play nb_games games
+use_sprt = True
+
+# The progress of each pairing is saved in this directory. Run the script again
+# after an interruption (Ctrl-C, crash) to continue where it stopped
+checkpoint_dir = "evaluator_checkpoints"
+resume = True
+
+# Each game is stored in this database, the results below are read from it.
+# The games of this evaluation are labeled with the run name, the ones of other
+# runs are kept
+results_path = "evaluator_results.db"
+run = "player_list_evaluator"
 
-# Initialize global victory type evaluator
-dic_global_win_lose_type = {}
+# Number of worker processes playing the games, 0 to play them in this process.
+# The workers are started once and play all the pairings
+nb_workers = 0
 
-# Match all combinations of players
-for i, player1_class in enumerate(players_classes):
-    # Get the name of the player
-    player1_name = player1_class(i).name()
-    results[player1_name] = {}
+# Keep the outcome of each game in this cache, by source of the players, rules
+# and seed: the next runs only play the pairings whose players changed, and the
+# games added by a greater nb_games. Needs tester.seed, replaces the checkpoints
+cache_path = None  # "evaluator_cache.db"
 
-    for j, player2_class in enumerate(players_classes):
-        if i == j:
-            continue
 
-        # Init the players
-        p1 = player1_class(1)
-        p2 = player2_class(2)
+def main():
+    store = ResultsStore(results_path, run)
+    tester.subscribe(store)
+    pool = WorkerPool(nb_workers) if nb_workers else None
+    cache = ResultCache(cache_path) if cache_path else None
 
-        # Initialize victory type evaluator dic
-        dic_win_lose_type = {p1.name(): {}, p2.name(): {}}
+    player_names = [player_class(1).name() for player_class in players_classes]
 
-        # Get the name of the player 2
-        player2_name = p2.name()
-        results[player1_name][player2_name] = 0
+    # Match all combinations of players
+    for i, player1_class in enumerate(players_classes):
+        # Get the name of the player
+        player1_name = player_names[i]
 
-        print(f"\n\nPlaying {player1_name} vs {player2_name}:")
+        for j, player2_class in enumerate(players_classes):
+            if i == j:
+                continue
 
-        # Play 100 games
-        victories_number, dic_global_win_lose_type[f"{p1.name()}vs{p2.name()}"] = (
-            tester.play_1v1(
-                p1, p2, nb_games=nb_games, dic_win_lose_type=dic_win_lose_type
+            player2_name = player_names[j]
+
+            print(f"\n\nPlaying {player1_name} vs {player2_name}:")
+
+            # Play the games, H0: player 1 is 100 Elo weaker, H1: 100 Elo stronger
+            sprt = SPRT(-100, 100) if use_sprt else None
+
+            if cache is not None:
+                # All the games of the pairing are sent to the store again
+                store.truncate_pairing(player1_name, player2_name)
+                tester.play_1v1_cached(
+                    cache,
+                    player1_class,
+                    player2_class,
+                    nb_games=nb_games,
+                    sprt=sprt,
+                    pool=pool,
+                )
+                if tester.interrupted:
+                    break
+                continue
+
+            # Only keep the stored games counted by the checkpoint, the others are
+            # played again
+            checkpoint = os.path.join(
+                checkpoint_dir, f"{player1_name} vs {player2_name}.json"
             )
-        )
+            progress = MatchCheckpoint.load(checkpoint) if resume else None
+            resume_pairing = progress is not None
+            try:
+                store.truncate_pairing(
+                    player1_name,
+                    player2_name,
+                    progress.nb_played_games if progress else 0,
+                )
+            except ValueError as error:
+                # The store misses games counted by the checkpoint
+                print(f"{error}, the pairing is played again")
+                store.truncate_pairing(player1_name, player2_name)
+                resume_pairing = False
 
-        results[player1_name][player2_name] = victories_number[player1_name]
+            if pool is None:
+                tester.play_1v1(
+                    player1_class(1),
+                    player2_class(2),
+                    nb_games=nb_games,
+                    sprt=sprt,
+                    checkpoint=checkpoint,
+                    resume=resume_pairing,
+                )
+            else:
+                tester.play_1v1_parallel(
+                    pool,
+                    player1_class,
+                    player2_class,
+                    nb_games=nb_games,
+                    sprt=sprt,
+                    checkpoint=checkpoint,
+                    resume=resume_pairing,
+                )
 
-print(f"dic_global_win_lose_type = \n{dic_global_win_lose_type}")
+            if tester.interrupted:
+                break
 
-print()
-print("Results:")
-print(results)
-print()
+        if tester.interrupted:
+            print("\nInterrupted, run the script again to resume. Partial results:")
+            break
 
-# Display the results in a table
-players = list(results.keys())
+    # Read the results of the run
+    pairings = {
+        (pairing.player1, pairing.player2): pairing for pairing in store.pairings(run)
+    }
+    dic_global_win_lose_type = {
+        f"{player1}vs{player2}": store.win_lose_types(player1, player2, run)
+        for player1, player2 in pairings
+    }
+    results = {
+        player1: {
+            player2: pairings[player1, player2].wins1
+            for player2 in player_names
+            if (player1, player2) in pairings
+        }
+        for player1 in player_names
+    }
+    played_games = {
+        player1: {
+            player2: pairings[player1, player2].nb_games
+            for player2 in player_names
+            if (player1, player2) in pairings
+        }
+        for player1 in player_names
+    }
 
-num_players = len(players)
+    print(f"dic_global_win_lose_type = \n{dic_global_win_lose_type}")
 
-# Create the header row
-header = ["Players"]
-for player in players:
-    header.append("p2. " + player)
+    print()
+    print("Results:")
+    print(results)
+    print()
 
-# Create the separator row
-separator = ["---"] * (num_players + 1)
+    # Display the results in a table
+    players = player_names
 
-# Create the data rows
-rows = []
-for i in range(num_players):
-    row = ["p1. " + players[i]]
-    for j in range(num_players):
-        if i != j:
+    num_players = len(players)
+
+    # Create the header row
+    header = ["Players"]
+    for player in players:
+        header.append("p2. " + player)
+
+    # Create the separator row
+    separator = ["---"] * (num_players + 1)
+
+    # Create the data rows
+    rows = []
+    for i in range(num_players):
+        row = ["p1. " + players[i]]
+        for j in range(num_players):
             player1 = players[i]
             player2 = players[j]
-            row.append(
-                str(int((results[player1].get(player2, "") / nb_games) * 100)) + "%"
-            )
-        else:
-            row.append("-")
-    rows.append(row)
+            if i != j and played_games[player1].get(player2):
+                row.append(
+                    str(
+                        int(
+                            results[player1].get(player2, "")
+                            / played_games[player1][player2]
+                            * 100
+                        )
+                    )
+                    + "%"
+                )
+            else:
+                row.append("-")
+        rows.append(row)
+
+    # Combine the header, separator, and data rows
+    table = [header, separator] + rows
 
-# Combine the header, separator, and data rows
-table = [header, separator] + rows
+    # Convert the table to Markdown format
+    markdown_table = "\n".join(["|".join(row) for row in table])
+    print(markdown_table)
 
-# Convert the table to Markdown format
-markdown_table = "\n".join(["|".join(row) for row in table])
-print(markdown_table)
+    # Display winning rates
+    winning_rates = {}
 
+    for player, opponents in results.items():
+        total_wins = sum(opponents.values())
+        total_games = sum(played_games[player].values())
+        winning_rates[player] = total_wins / total_games if total_games else 0.0
+
+    print("\nGlobal Winning Rates:")
+    for player, winning_rate in winning_rates.items():
+        print(f" - {player}: {winning_rate:.2%}")
+
+    # Bradley-Terry ratings of the players
+    print("\nRatings (Elo, 95% interval):")
+    for player, rating, low, high in store.rating_table(run).ratings():
+        print(f" - {player}: {rating:.0f} [{low:.0f}, {high:.0f}]")
+
+    print("\nThinking time per game:")
+    for pairing in pairings.values():
+        print(
+            f" - {pairing.player1} vs {pairing.player2}:"
+            f" {pairing.think_time1 / pairing.nb_games * 1000:.1f} ms,"
+            f" {pairing.think_time2 / pairing.nb_games * 1000:.1f} ms"
+        )
 
-# Display winning rates
-winning_rates = {}
+    store.close()
+    if pool is not None:
+        pool.close()
+    if cache is not None:
+        cache.close()
 
-for player, opponents in results.items():
-    total_wins = sum(opponents.values())
-    winning_rate = total_wins / (nb_games * len(opponents))
-    winning_rates[player] = winning_rate
 
-print("\nGlobal Winning Rates:")
-for player, winning_rate in winning_rates.items():
-    print(f" - {player}: {winning_rate:.2%}")
+# The workers import this script, the evaluation is only run by the main process
+if __name__ == "__main__":
+    main()
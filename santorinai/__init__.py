@@ -1,6 +1,7 @@
 from .board import Board
-from .player import Player
+from .player import Player, AsyncPlayer, BatchedPlayer
 from .tester import Tester
+from .async_tester import AsyncTester
 from .pawn import Pawn
 from .player_examples.random_player import RandomPlayer
 from .player_examples.first_choice_player import FirstChoicePlayer
@@ -0,0 +1,145 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from santorinai.player import AsyncPlayer, Player
+from santorinai.sprt import SPRT
+from santorinai.tester import Tester
+
+
+class AsyncTester(Tester):
+    """
+    Run many games concurrently in a single process, for players waiting on I/O.
+
+    AsyncPlayer decisions are awaited, the decisions of synchronous players
+    are run in a thread executor. While a player is waiting, the other games
+    keep going.
+
+    A synchronous player is called from several threads at once, up to
+    max_in_flight_per_player decisions: it must be thread-safe, or
+    max_in_flight_per_player set to 1.
+
+    The board can't be displayed and there is no delay between moves. The
+    players are shared by the running games, so Player.new_game is not called.
+    """
+
+    max_concurrent_games = 100
+    max_in_flight_per_player = 8  # Maximum number of pending decisions per player
+
+    def play_1v1(
+        self,
+        player1: Player,
+        player2: Player,
+        nb_games: int = 1,
+        dic_win_lose_type=None,
+        sprt: SPRT = None,
+        checkpoint: str = None,
+        resume: bool = False,
+    ):
+        """
+        Play a 1v1 match, blocking until all the games are played.
+        See play_1v1_async.
+
+        The games end in any order, so a match can't be stopped by a sequential
+        test or resumed: sprt, checkpoint and resume are not supported.
+        """
+        if sprt is not None or checkpoint is not None or resume:
+            raise ValueError(
+                "AsyncTester does not support sprt, checkpoint and resume,"
+                " use Tester.play_1v1"
+            )
+        return asyncio.run(
+            self.play_1v1_async(player1, player2, nb_games, dic_win_lose_type)
+        )
+
+    async def play_1v1_async(
+        self,
+        player1: Player,
+        player2: Player,
+        nb_games: int = 1,
+        dic_win_lose_type=None,
+    ):
+        """
+        Play a 1v1 match between player1 and player2, with concurrent games
+
+        Args:
+            player1 (Player): the first player, synchronous or asynchronous
+            player2 (Player): the second player, synchronous or asynchronous
+            nb_games (int): the number of games to play
+            dic_win_lose_type (dict): the winning and loosing conditions to update
+
+        Returns:
+            dict: the number of victories for each player
+            dict: the different types of winning and loosing conditions
+        """
+        player_names = self._validate_players(player1, player2)
+
+        if self.display_board or self.delay_between_moves > 0:
+            raise ValueError("AsyncTester can't display the board between moves")
+
+        # Initialize the number of victories
+        nb_victories = {
+            player1.name(): 0,
+            player2.name(): 0,
+        }
+
+        # Initialize empty dic_win_lose_type in not passed
+        if not dic_win_lose_type:
+            dic_win_lose_type = {player1.name(): {}, player2.name(): {}}
+
+        players = [player1, player2]
+        observers = self._match_observers()
+        in_flight = [asyncio.Semaphore(self.max_in_flight_per_player) for _ in players]
+
+        game_numbers = iter(range(1, nb_games + 1))
+        nb_workers = min(self.max_concurrent_games, nb_games)
+
+        with ThreadPoolExecutor(max_workers=2 * self.max_in_flight_per_player) as ex:
+
+            async def play_games():
+                # Each worker plays games until there is no more game to play
+                for game_nb in game_numbers:
+                    winner_idx, reason, forfeit = await self._play_game_async(
+                        players, in_flight, ex, observers, game_nb
+                    )
+                    self._register_result(
+                        player_names,
+                        nb_victories,
+                        dic_win_lose_type,
+                        winner_idx,
+                        reason,
+                        forfeit,
+                    )
+
+            await asyncio.gather(*(play_games() for _ in range(nb_workers)))
+
+        self._end_match(observers, player_names, nb_victories, nb_games)
+
+        return nb_victories, dic_win_lose_type
+
+    async def _play_game_async(
+        self, players, in_flight, executor, observers=(), game_number=1
+    ):
+        """
+        Play a single game, awaiting the decisions of the players
+
+        Returns:
+            int: the index of the winning player, None if nobody won
+            Reason: the reason of the victory
+            bool: True if the game was won because the other player failed
+        """
+        loop = asyncio.get_running_loop()
+        game = self._game_steps(players, observers, game_number, reset_players=False)
+        try:
+            player_idx, decision, args = next(game)
+            while True:
+                player = players[player_idx]
+                async with in_flight[player_idx]:
+                    if isinstance(player, AsyncPlayer):
+                        answer = await getattr(player, decision)(*args)
+                    else:
+                        answer = await loop.run_in_executor(
+                            executor, getattr(player, decision), *args
+                        )
+                player_idx, decision, args = game.send(answer)
+        except StopIteration as game_over:
+            return game_over.value
@@ -1,5 +1,119 @@
-from santorinai.pawn import Pawn
-from typing import Tuple, List
+from santorinai.pawn import (
+    Pawn,
+    BOARD_SIZE,
+    NB_CELLS,
+    UNPLACED,
+    CELL_POSITIONS,
+    position_to_cell,
+)
+from santorinai.reasons import Reason
+import struct
+from itertools import product
+from typing import FrozenSet, Iterator, List, Optional, Set, Tuple
+
+# Cells around each cell, in the order of the (x, y) offsets
+# (-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)
+NEIGHBOUR_CELLS = [
+    [
+        (x + dx) * BOARD_SIZE + y + dy
+        for dx in range(-1, 2)
+        for dy in range(-1, 2)
+        if (dx != 0 or dy != 0)
+        and 0 <= x + dx < BOARD_SIZE
+        and 0 <= y + dy < BOARD_SIZE
+    ]
+    for x in range(BOARD_SIZE)
+    for y in range(BOARD_SIZE)
+]
+
+# The 8 neighbour slots of each cell, -1 for the slots outside of the board,
+# so that drawing a slot uniformly gives every neighbour the same probability
+NEIGHBOUR_SLOTS = [
+    [
+        (
+            (x + dx) * BOARD_SIZE + y + dy
+            if 0 <= x + dx < BOARD_SIZE and 0 <= y + dy < BOARD_SIZE
+            else -1
+        )
+        for dx in range(-1, 2)
+        for dy in range(-1, 2)
+        if dx != 0 or dy != 0
+    ]
+    for x in range(BOARD_SIZE)
+    for y in range(BOARD_SIZE)
+]
+
+# Number of failed draws before sample_random_action lists the actions
+MAX_SAMPLING_ATTEMPTS = 32
+
+NO_THREATS = frozenset()
+
+# Position notation, see Board.to_notation:
+# the name of each cell in the pawns field, "--" for an unplaced pawn
+CELL_NAMES = [f"{x}{y}" for x, y in CELL_POSITIONS[:NB_CELLS]] + ["--"]
+CELLS_BY_NAME = {name: cell for cell, name in enumerate(CELL_NAMES)}
+LEVEL_DIGITS = bytes.maketrans(bytes(range(5)), b"01234")
+DIGIT_LEVELS = bytes.maketrans(b"01234", bytes(range(5)))
+
+# Position encoding, see Board.to_bytes: the levels in base 5, the pawn cells
+# on 5 bits each with the number of players in the 2 high bits, the player
+# turn, the winner (0 if none) and the turn number
+PACKED_BOARD = struct.Struct("<QIBBH")
+PAWN_CELL_BITS = 5
+NB_PLAYERS_SHIFT = 30
+# The levels are packed by rows of BOARD_SIZE cells: value of each row
+ROW_VALUES = {
+    bytes(levels): value
+    for value, levels in enumerate(product(range(5), repeat=BOARD_SIZE))
+}
+ROW_LEVELS = list(ROW_VALUES)
+NB_ROW_VALUES = len(ROW_LEVELS)
+# (number, order, player number) of the pawns of 2 and 3 player games
+PAWN_IDENTITIES = {
+    nb_players: [
+        (number, (number - 1) // nb_players + 1, (number - 1) % nb_players + 1)
+        for number in range(1, nb_players * 2 + 1)
+    ]
+    for nb_players in (2, 3)
+}
+
+
+class BoardGrid(tuple):
+    """
+    The board[x][y] view of the levels of a board.
+
+    Each column is a memoryview on the flat bytearray of the board, so reading
+    and writing board[x][y] updates the board without copying.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, cells: bytearray):
+        view = memoryview(cells)
+        return super().__new__(
+            cls,
+            (view[x * BOARD_SIZE : (x + 1) * BOARD_SIZE] for x in range(BOARD_SIZE)),
+        )
+
+    def tolist(self) -> List[List[int]]:
+        """
+        Returns the levels as a list of lists.
+        """
+        return [column.tolist() for column in self]
+
+    def __eq__(self, other) -> bool:
+        try:
+            return self.tolist() == [list(column) for column in other]
+        except TypeError:
+            return False
+
+    def __ne__(self, other) -> bool:
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(self.tolist())
 
 
 class Board:
@@ -14,7 +128,7 @@ class Board:
         winner_player_number (int): The player number of the winning player, if any.
 
     Board values:
-        A 5x5 2D list representing the current state of the board:
+        A 5x5 2D view, board[x][y], on the flat bytearray storing the board:
         - 0: Empty space
         - 1: Tower level 1
         - 2: Tower level 2
@@ -26,6 +140,21 @@ class Board:
 
     """
 
+    __slots__ = (
+        "pawns",
+        "nb_players",
+        "nb_pawns",
+        "board_size",
+        "cells",
+        "_grid",
+        "winner_player_number",
+        "turn_number",
+        "player_turn",
+        "_pawn_threats",
+        "_player_threats",
+        "_threats_key",
+    )
+
     def __init__(self, number_of_players: int):
         """
         Initializes a new instance of the Board class.
@@ -54,10 +183,10 @@ class Board:
             self.pawns.append(Pawn(pawn_number, pawn_order, player_number))
 
         # Initialize the board
-        self.board_size = 5
-        self.board = [
-            [0 for _ in range(self.board_size)] for _ in range(self.board_size)
-        ]
+        # The level of each cell, at index x * board_size + y
+        self.board_size = BOARD_SIZE
+        self.cells = bytearray(NB_CELLS)
+        self._grid = None
 
         # Board values:
         # 0 = empty
@@ -71,9 +200,29 @@ class Board:
         self.turn_number = 1
         self.player_turn = 1
 
+        # Winning threats index, built on the first call to winning_threats
+        self._pawn_threats = None
+        self._player_threats = None
+        self._threats_key = None
+
+    @property
+    def board(self) -> BoardGrid:
+        """
+        The levels of the board, board[x][y].
+        """
+        grid = self._grid
+        if grid is None:
+            grid = self._grid = BoardGrid(self.cells)
+        return grid
+
+    @board.setter
+    def board(self, levels: List[List[int]]):
+        for x, column in enumerate(levels):
+            self.cells[x * BOARD_SIZE : (x + 1) * BOARD_SIZE] = bytes(column)
+
     def is_move_possible(
         self, start_pos: Tuple[int, int], end_pos: Tuple[int, int]
-    ) -> Tuple[bool, str]:
+    ) -> Tuple[bool, Reason]:
         """
         Checks if a move from the start position to the end position is possible.
 
@@ -83,40 +232,38 @@ class Board:
 
         Returns:
             bool: True if the move is possible, False otherwise.
-            str: A string describing why the move is not possible.
+            Reason: Why the move is not possible.
         """
         # Check if the start and end positions are within the board bounds
         if not self.is_position_within_board(start_pos):
-            return False, "It is not possible to move from outside the board."
+            return False, Reason.MOVE_FROM_OUTSIDE
         if not self.is_position_within_board(end_pos):
-            return False, "It is not possible to move outside the board: " + str(
-                end_pos
-            )
+            return False, Reason.MOVE_OUTSIDE
 
         # We can't move to the same position
         if start_pos == end_pos:
-            return False, "It is not possible to move to the same position."
+            return False, Reason.MOVE_SAME_POSITION
 
-        start_level = self.board[start_pos[0]][start_pos[1]]
-        end_level = self.board[end_pos[0]][end_pos[1]]
+        start_level = self.cells[start_pos[0] * BOARD_SIZE + start_pos[1]]
+        end_level = self.cells[end_pos[0] * BOARD_SIZE + end_pos[1]]
 
         # Check if the end position is not terminated
         if end_level == 4:
-            return False, "It is not possible to move on a terminated tower."
+            return False, Reason.MOVE_ON_TERMINATED
 
         # Check if the end position is not to high
         if end_level - start_level > 1:
-            return False, "It is not possible to move two levels in one move."
+            return False, Reason.MOVE_TOO_HIGH
 
         # Check if the end position is adjacent to the start position
         if not self.is_position_adjacent(start_pos, end_pos):
-            return False, "It is not possible to move that far."
+            return False, Reason.MOVE_TOO_FAR
 
         # Check if the end position is not occupied by another pawn
         if self.is_pawn_on_position(end_pos):
-            return False, "It is not possible to move on another pawn."
+            return False, Reason.MOVE_ON_PAWN
 
-        return True, "The move is possible."
+        return True, Reason.MOVE_POSSIBLE
 
     def is_position_within_board(self, position: Tuple[int, int]):
         """
@@ -158,8 +305,13 @@ class Board:
         Returns:
             bool: True if a pawn is on the position, False otherwise.
         """
+        try:
+            cell = position_to_cell(position)
+        except ValueError:
+            return False
+
         for pawn in self.pawns:
-            if pawn.pos == position:
+            if pawn.cell == cell:
                 return True
         return False
 
@@ -175,33 +327,33 @@ class Board:
 
         Returns:
             bool: True if the build is possible, False otherwise.
-            str: A string describing why the build is not possible.
+            Reason: Why the build is not possible.
         """
         # Check if the builder position is within the board bounds
         if not self.is_position_within_board(builder_position):
-            return False, "It is not possible to build from outside the board."
+            return False, Reason.BUILD_FROM_OUTSIDE
 
         # Check if the build position is within the board bounds
         if not self.is_position_within_board(build_position):
-            return False, "It is not possible to build outside the board."
+            return False, Reason.BUILD_OUTSIDE
 
         # We can't build on the same position
         if builder_position == build_position:
-            return False, "It is not possible to build where you are standing."
+            return False, Reason.BUILD_ON_SELF
 
         # Check if the build position is not terminated
-        if self.board[build_position[0]][build_position[1]] == 4:
-            return False, "It is not possible to build on a terminated tower."
+        if self.cells[build_position[0] * BOARD_SIZE + build_position[1]] == 4:
+            return False, Reason.BUILD_ON_TERMINATED
 
         # Check if the build position is adjacent to the builder position
         if not self.is_position_adjacent(builder_position, build_position):
-            return False, "It is not possible to build that far."
+            return False, Reason.BUILD_TOO_FAR
 
         # Check if the build position is not occupied by another pawn
         if self.is_pawn_on_position(build_position):
-            return False, "It is not possible to build on another pawn."
+            return False, Reason.BUILD_ON_PAWN
 
-        return True, "The build is possible."
+        return True, Reason.BUILD_POSSIBLE
 
     def get_player_pawns(self, player_number: int) -> List[Pawn]:
         """
@@ -264,48 +416,181 @@ class Board:
             Pawn: The first unplaced pawn of the player.
         """
         for pawn in self.pawns:
-            if pawn.player_number == player_number and (
-                pawn.pos[0] is None or pawn.pos[1] is None
-            ):
+            if pawn.player_number == player_number and pawn.cell == UNPLACED:
                 return pawn
 
-    def get_possible_movement_positions(self, pawn: Pawn) -> List[Tuple[int, int]]:
+    def iter_moves(self, pawn: Pawn) -> Iterator[Tuple[int, int]]:
         """
-        Gets all the possible moves for a given pawn.
+        Yields the possible moves of a pawn one by one, in the order of
+        get_possible_movement_positions, so that callers looking for the first
+        matching move stop as soon as they find it.
 
         Args:
             pawn (Pawn): The pawn for which to get the possible moves.
 
-        Returns:
-            list: A list of all the possible moves for the given pawn.
+        Yields:
+            tuple: The possible move positions (x, y) of the pawn.
         """
-        possible_moves = []
+        cells = self.cells
+        occupied = [p.cell for p in self.pawns]
 
         # If pawn position is None, it means it has not been placed yet
         # Every position is possible except the ones occupied by other pawns
         # and the ones where tower are terminated
-        if pawn.pos[0] is None or pawn.pos[1] is None:
-            for x in range(self.board_size):
-                for y in range(self.board_size):
-                    if self.board[x][y] != 4 and not self.is_pawn_on_position((x, y)):
-                        possible_moves.append((x, y))
-            return possible_moves
+        if pawn.cell == UNPLACED:
+            for cell in range(NB_CELLS):
+                if cells[cell] != 4 and cell not in occupied:
+                    yield CELL_POSITIONS[cell]
+            return
 
         # Get all the possible moves from the 8 positions around the pawn
-        for x in range(-1, 2):
-            for y in range(-1, 2):
-                # We can't move on the same position
-                if x == 0 and y == 0:
-                    continue
+        max_level = cells[pawn.cell] + 1
+        for cell in NEIGHBOUR_CELLS[pawn.cell]:
+            # The level must not be terminated nor too high, and the
+            # position must not be occupied
+            level = cells[cell]
+            if level != 4 and level <= max_level and cell not in occupied:
+                yield CELL_POSITIONS[cell]
+
+    def iter_move_builds(
+        self, pawn: Pawn
+    ) -> Iterator[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """
+        Yields the possible moves and builds of a pawn one by one, in the order
+        of get_possible_movement_and_building_positions. The pawn is not moved.
 
-                new_pawn_pos = (pawn.pos[0] + x, pawn.pos[1] + y)
+        Args:
+            pawn (Pawn): The pawn for which to get the possible moves and builds.
 
-                # Check if the move is possible
-                move_possible, _ = self.is_move_possible(pawn.pos, new_pawn_pos)
-                if move_possible:
-                    possible_moves.append((pawn.pos[0] + x, pawn.pos[1] + y))
+        Yields:
+            tuple: (move_position, build_position), build_position is None if
+            the pawn is not placed yet.
+        """
+        if pawn.cell == UNPLACED:
+            # Pawn not placed yet
+            for position in self.iter_moves(pawn):
+                yield position, None
+            return
+
+        cells = self.cells
+        # Once moved, the pawn no longer occupies its original position
+        others = [p.cell for p in self.pawns if p is not pawn]
+
+        for move in self.iter_moves(pawn):
+            move_cell = move[0] * BOARD_SIZE + move[1]
+            for cell in NEIGHBOUR_CELLS[move_cell]:
+                if cells[cell] != 4 and cell not in others:
+                    yield move, CELL_POSITIONS[cell]
+
+    def iter_all_actions(
+        self, player_number: int
+    ) -> Iterator[Tuple[int, Tuple[int, int], Tuple[int, int]]]:
+        """
+        Yields the possible actions of a player one by one, in the format
+        returned by Player.play_move.
+
+        Args:
+            player_number (int): The number of the player.
+
+        Yields:
+            tuple: (pawn order, move_position, build_position)
+        """
+        for pawn in self.get_player_pawns(player_number):
+            for move, build in self.iter_move_builds(pawn):
+                yield pawn.order, move, build
 
-        return possible_moves
+    def has_any_move(self, player_number: int) -> bool:
+        """
+        Checks if a player can move at least one of its pawns, stopping at
+        the first possible move found.
+
+        Args:
+            player_number (int): The number of the player.
+
+        Returns:
+            bool: True if the player is not stuck, False otherwise.
+        """
+        for pawn in self.pawns:
+            if pawn.player_number == player_number:
+                for _ in self.iter_moves(pawn):
+                    return True
+        return False
+
+    def sample_random_action(
+        self, rng
+    ) -> Optional[Tuple[int, Tuple[int, int], Tuple[int, int]]]:
+        """
+        Draws a uniformly random legal action of the playing player, without
+        listing all the possible actions.
+
+        A pawn, a move slot and a build slot are drawn among the 2 x 8 x 8
+        possibilities until they form a legal action, so that every legal
+        action has the same probability. When few actions are legal, they are
+        listed after MAX_SAMPLING_ATTEMPTS failed draws.
+
+        Args:
+            rng: The random generator, random.Random or the random module.
+
+        Returns:
+            tuple: (pawn order, move_position, build_position), in the format
+            returned by Player.play_move. During the placement, the pawn to
+            place and its position with a None build position.
+            None if the player can't play.
+        """
+        cells = self.cells
+        pawns = self.get_player_pawns(self.player_turn)
+        occupied = [pawn.cell for pawn in self.pawns]
+
+        # Placement: a free position
+        for pawn in pawns:
+            if pawn.cell == UNPLACED:
+                for _ in range(MAX_SAMPLING_ATTEMPTS):
+                    cell = int(rng.random() * NB_CELLS)
+                    if cells[cell] != 4 and cell not in occupied:
+                        return pawn.order, CELL_POSITIONS[cell], None
+                positions = self.get_possible_movement_positions(pawn)
+                if not positions:
+                    return None
+                return pawn.order, positions[int(rng.random() * len(positions))], None
+
+        # Move and build
+        for _ in range(MAX_SAMPLING_ATTEMPTS):
+            draw = int(rng.random() * 128)
+            pawn = pawns[draw >> 6]
+            move_cell = NEIGHBOUR_SLOTS[pawn.cell][(draw >> 3) & 7]
+            if move_cell < 0:
+                continue
+            level = cells[move_cell]
+            if level == 4 or level > cells[pawn.cell] + 1 or move_cell in occupied:
+                continue
+            build_cell = NEIGHBOUR_SLOTS[move_cell][draw & 7]
+            if build_cell < 0 or cells[build_cell] == 4:
+                continue
+            if build_cell != pawn.cell and build_cell in occupied:
+                continue
+            return pawn.order, CELL_POSITIONS[move_cell], CELL_POSITIONS[build_cell]
+
+        # Few legal actions: list them and draw one
+        actions = [
+            (pawn.order, move, build)
+            for pawn in pawns
+            for move, build in self.iter_move_builds(pawn)
+        ]
+        if not actions:
+            return None
+        return actions[int(rng.random() * len(actions))]
+
+    def get_possible_movement_positions(self, pawn: Pawn) -> List[Tuple[int, int]]:
+        """
+        Gets all the possible moves for a given pawn.
+
+        Args:
+            pawn (Pawn): The pawn for which to get the possible moves.
+
+        Returns:
+            list: A list of all the possible moves for the given pawn.
+        """
+        return list(self.iter_moves(pawn))
 
     def get_possible_building_positions(self, pawn: Pawn) -> List[Tuple[int, int]]:
         """
@@ -318,21 +603,17 @@ class Board:
             list: A list of all the possible builds for the given pawn.
         """
 
-        if pawn.pos[0] is None or pawn.pos[1] is None:
+        if pawn.cell == UNPLACED:
             return []
 
         possible_builds = []
+        cells = self.cells
+        occupied = [p.cell for p in self.pawns]
 
         # Get all the possible builds
-        for x in range(-1, 2):
-            for y in range(-1, 2):
-                if x == 0 and y == 0:
-                    continue
-                build_possible, _ = self.is_build_possible(
-                    pawn.pos, (pawn.pos[0] + x, pawn.pos[1] + y)
-                )
-                if build_possible:
-                    possible_builds.append((pawn.pos[0] + x, pawn.pos[1] + y))
+        for cell in NEIGHBOUR_CELLS[pawn.cell]:
+            if cells[cell] != 4 and cell not in occupied:
+                possible_builds.append(CELL_POSITIONS[cell])
 
         return possible_builds
 
@@ -343,28 +624,9 @@ class Board:
         :return: A list of all the possible moves and builds for the given pawn.
         [(move_position, build_position), ...]
         """
+        return list(self.iter_move_builds(pawn))
 
-        if pawn.pos[0] is None or pawn.pos[1] is None:
-            # Pawn not placed yet
-            possible_spawn_positions = self.get_possible_movement_positions(pawn)
-            return [(position, None) for position in possible_spawn_positions]
-
-        possible_moves_and_builds = []
-        original_position = (pawn.pos[0], pawn.pos[1])
-        possible_moves = self.get_possible_movement_positions(pawn)
-
-        for move in possible_moves:
-            pawn.move(move)
-            possible_builds = self.get_possible_building_positions(pawn)
-            for build in possible_builds:
-                possible_moves_and_builds.append((move, build))
-
-        # Move the pawn back to its original position
-        pawn.move(original_position)
-
-        return possible_moves_and_builds
-
-    def place_pawn(self, position: Tuple[int, int]) -> Tuple[bool, str]:
+    def place_pawn(self, position: Tuple[int, int]) -> Tuple[bool, Reason]:
         """
         Places a pawn on the board.
 
@@ -373,16 +635,16 @@ class Board:
 
         Returns:
             bool: True if the pawn was placed, False otherwise.
-            str: A string describing why the pawn was not placed.
+            Reason: Why the pawn was not placed.
         """
         # Check if the game is over
         if self.is_game_over():
-            return False, "The game is over."
+            return False, Reason.GAME_OVER
 
         # Check if the pawn has already been placed
         unplaced_pawns = self.get_first_unplaced_player_pawn(self.player_turn)
         if unplaced_pawns is None:
-            return False, "All the pawns have already been placed."
+            return False, Reason.ALL_PAWNS_PLACED
 
         # Check input
         ok, msg = self.is_position_valid(position)
@@ -391,22 +653,25 @@ class Board:
 
         # Check if the position is not occupied by another pawn
         if self.is_pawn_on_position(position):
-            return False, "The position is already occupied by another pawn."
+            return False, Reason.POSITION_OCCUPIED
 
         # Place the pawn
+        track_threats = self._is_threat_index_current()
         unplaced_pawns.pos = position
+        if track_threats:
+            self._update_threats({unplaced_pawns.cell})
 
         # Next player's turn
         self.next_turn()
 
-        return True, "The pawn was placed."
+        return True, Reason.PAWN_PLACED
 
     def play_move(
         self,
         pawn_number: int,
         move_position: Tuple[int, int],
         build_position: Tuple[int, int],
-    ) -> Tuple[bool, str]:
+    ) -> Tuple[bool, Reason]:
         """
         Plays a move on the board with the chosen playing pawn.
 
@@ -417,33 +682,33 @@ class Board:
 
         Returns:
             bool: True if the move was played, False otherwise.
-            str: A string describing why the move was not played.
+            Reason: Why the move was not played.
         """
 
         # Validate the input
         if not isinstance(pawn_number, int):
-            return False, "The pawn number is not an integer."
+            return False, Reason.INVALID_PAWN_TYPE
 
         if pawn_number < 1 or pawn_number > 2:
-            return False, "The pawn number is invalid (must be 1 or 2)."
+            return False, Reason.INVALID_PAWN_NUMBER
 
         # Check if all pawn are placed
         unplaced_pawns = self.get_first_unplaced_player_pawn(self.player_turn)
         if unplaced_pawns is not None:
-            return False, "All the pawns have not been placed yet."
+            return False, Reason.PAWNS_NOT_PLACED
 
         # Get the moving pawn
         pawn = self.get_playing_pawn(pawn_number)
 
         # Check if the game is over
         if self.is_game_over():
-            return False, "The game is over."
+            return False, Reason.GAME_OVER
 
         # Check if there is any possible move
         possible_moves = self.get_possible_movement_positions(pawn)
         if len(possible_moves) == 0:
             # The selected pawn is stuck
-            return False, "The selected pawn is stuck."
+            return False, Reason.PAWN_STUCK
 
         # === MOVE ===
         # Check the input
@@ -457,13 +722,17 @@ class Board:
             return False, reason
 
         # Apply the move
+        track_threats = self._is_threat_index_current()
         initial_pos = pawn.pos
+        initial_cell = pawn.cell
         pawn.move(move_position)
 
         # Check if the tower is terminated
-        if self.board[pawn.pos[0]][pawn.pos[1]] == 3:
+        if self.cells[pawn.cell] == 3:
             self.winner_player_number = pawn.player_number
-            return True, "The player pawn reached the top of a tower."
+            if track_threats:
+                self._update_threats({initial_cell, pawn.cell})
+            return True, Reason.TOWER_TOP
 
         # === BUILD ===
         # Check the input
@@ -486,28 +755,24 @@ class Board:
             return False, reason
 
         # Build the tower
-        self.board[build_position[0]][build_position[1]] += 1
+        build_cell = build_position[0] * BOARD_SIZE + build_position[1]
+        self.cells[build_cell] += 1
+        if track_threats:
+            self._update_threats({initial_cell, pawn.cell, build_cell})
 
         if self.is_everyone_stuck():
             self.winner_player_number = pawn.player_number
-            return True, "No one can play, the game is over."
+            return True, Reason.EVERYONE_STUCK
 
         # Change the turn
         self.next_turn()
 
         # Check if the next player is stuck
-        next_player_pawns = self.get_player_pawns(self.player_turn)
-        next_player_stuck = True
-        for p in next_player_pawns:
-            if len(self.get_possible_movement_positions(p)) > 0:
-                next_player_stuck = False
-                break
-
-        if next_player_stuck:
+        if not self.has_any_move(self.player_turn):
             self.winner_player_number = pawn.player_number
-            return True, "The next player is stuck, the game is over."
+            return True, Reason.NEXT_PLAYER_STUCK
 
-        return True, "The move was played."
+        return True, Reason.MOVE_PLAYED
 
     def play_move_simple(
         self,
@@ -526,11 +791,72 @@ class Board:
             build_position (tuple): The position (x, y) to build a tower on.
         """
         # Apply the move
-        self.pawns[pawn_number].move(move_position)
+        track_threats = self._is_threat_index_current()
+        pawn = self.pawns[pawn_number]
+        initial_cell = pawn.cell
+        pawn.move(move_position)
 
         # Build the tower
-        self.board[build_position[0]][build_position[1]] += 1
+        build_cell = build_position[0] * BOARD_SIZE + build_position[1]
+        self.cells[build_cell] += 1
+        if track_threats:
+            self._update_threats({initial_cell, pawn.cell, build_cell})
+
+    def play_move_trusted(
+        self,
+        pawn_number: int,
+        move_position: Tuple[int, int],
+        build_position: Tuple[int, int],
+    ) -> Tuple[bool, Reason]:
+        """
+        Plays a move known to be legal, without checking it: same result as
+        play_move for a legal move, undefined for an illegal one.
 
+        Only the end of the game is detected: the next player is checked for
+        a possible move, and everyone else only if they are stuck. An answer
+        raising an exception leaves the board unchanged.
+
+        Args:
+            pawn_number (int): Number of the pawn to play with (1 or 2).
+            move_position (tuple): The position (x, y) to move the pawn to.
+            build_position (tuple): The position (x, y) to build a tower on.
+
+        Returns:
+            bool: True.
+            Reason: Why the move was played, see play_move.
+        """
+        # Apply the move
+        track_threats = self._is_threat_index_current()
+        pawn = self.get_playing_pawn(pawn_number)
+        initial_cell = pawn.cell
+        pawn.move(move_position)
+
+        if self.cells[pawn.cell] == 3:
+            self.winner_player_number = pawn.player_number
+            if track_threats:
+                self._update_threats({initial_cell, pawn.cell})
+            return True, Reason.TOWER_TOP
+
+        # Build the tower, the pawn is moved back if the build position raises
+        try:
+            build_cell = build_position[0] * BOARD_SIZE + build_position[1]
+            self.cells[build_cell] += 1
+        except Exception:
+            pawn.cell = initial_cell
+            raise
+        if track_threats:
+            self._update_threats({initial_cell, pawn.cell, build_cell})
+
+        next_player = self.player_turn % self.nb_players + 1
+        if self.has_any_move(next_player):
+            self.next_turn()
+            return True, Reason.MOVE_PLAYED
+
+        self.winner_player_number = pawn.player_number
+        if self.is_everyone_stuck():
+            return True, Reason.EVERYONE_STUCK
+        self.next_turn()
+        return True, Reason.NEXT_PLAYER_STUCK
 
     def is_position_valid(self, pos: Tuple[int, int]):
         """
@@ -541,27 +867,25 @@ class Board:
 
         Returns:
             bool: True if the position is valid, False otherwise.
-            str: A string describing why the pos is not valid.
+            Reason: Why the pos is not valid.
         """
 
         # Check if the pos is a tuple
         if not isinstance(pos, tuple):
-            return False, "The position is not a tuple, but a {}.".format(type(pos))
+            return False, Reason.POSITION_NOT_TUPLE
 
         # Check if the pos is a 2D pos
         if len(pos) != 2:
-            return False, "The position is not a coordinate, it but has {} dim.".format(
-                len(pos)
-            )
+            return False, Reason.POSITION_NOT_COORDINATE
 
         if not isinstance(pos[0], int) or not isinstance(pos[1], int):
-            return False, "Not all the coordinates are integers: {}.".format(pos)
+            return False, Reason.POSITION_NOT_INTEGERS
 
         # Check if the pos is in the board bounds
         if not self.is_position_within_board(pos):
-            return False, "The position is not within the board bounds."
+            return False, Reason.POSITION_OUTSIDE
 
-        return True, "The position is valid."
+        return True, Reason.POSITION_VALID
 
     def is_game_over(self):
         """
@@ -584,7 +908,7 @@ class Board:
             bool: True if everyone is stuck, False otherwise.
         """
         for pawn in self.pawns:
-            if len(self.get_possible_movement_positions(pawn)) > 0:
+            for _ in self.iter_moves(pawn):
                 return False
 
         return True
@@ -606,13 +930,15 @@ class Board:
         Returns:
             Board: A copy of the board.
         """
-        # Create a new board
-        board_copy = Board(self.nb_players)
+        # Create a new board, without creating pawns that would be replaced
+        board_copy = Board.__new__(Board)
+        board_copy.nb_players = self.nb_players
+        board_copy.nb_pawns = self.nb_pawns
+        board_copy.board_size = self.board_size
 
         # Copy the board
-        for x in range(self.board_size):
-            for y in range(self.board_size):
-                board_copy.board[x][y] = self.board[x][y]
+        board_copy.cells = bytearray(self.cells)
+        board_copy._grid = None
 
         # Copy the pawns
         board_copy.pawns = [pawn.copy() for pawn in self.pawns]
@@ -622,8 +948,316 @@ class Board:
         board_copy.player_turn = self.player_turn
         board_copy.winner_player_number = self.winner_player_number
 
+        # Share the winning threats index, its sets are never modified in place
+        board_copy._threats_key = self._threats_key
+        if self._threats_key is None:
+            board_copy._pawn_threats = None
+            board_copy._player_threats = None
+        else:
+            board_copy._pawn_threats = list(self._pawn_threats)
+            board_copy._player_threats = list(self._player_threats)
+
         return board_copy
 
+    def position_key(self) -> bytes:
+        """
+        Gets a hashable key of the position: the levels, the pawn positions
+        and the player to play. Boards with the same key have the same
+        possible moves, whatever the order of the moves that led to them.
+
+        Returns:
+            bytes: The key of the position.
+        """
+        return (
+            bytes(self.cells)
+            + bytes([pawn.cell for pawn in self.pawns])
+            + bytes([self.player_turn])
+        )
+
+    def to_notation(self) -> str:
+        """
+        Gets the notation of the position, a single line parsed back by
+        from_notation. Equal positions have the same notation.
+
+        It has 5 fields separated by spaces:
+        - the levels, by x then y, with a "/" between the x columns,
+        - the cell "xy" of each pawn by pawn number, "--" if it is not placed,
+        - the player turn,
+        - the turn number,
+        - the winner player number, "-" if none.
+
+        For instance, after the placement of the first pawn at (1, 2):
+        "00000/00000/00000/00000/00000 12,--,--,-- 2 2 -"
+
+        Returns:
+            str: The notation.
+        """
+        levels = bytes(self.cells).translate(LEVEL_DIGITS).decode()
+        winner = self.winner_player_number
+        return (
+            "/".join(
+                [levels[start : start + BOARD_SIZE] for start in range(0, NB_CELLS, 5)]
+            )
+            + " "
+            + ",".join([CELL_NAMES[pawn.cell] for pawn in self.pawns])
+            + f" {self.player_turn} {self.turn_number} "
+            + ("-" if winner is None else str(winner))
+        )
+
+    @classmethod
+    def from_notation(cls, notation: str) -> "Board":
+        """
+        Creates a board from its notation, see to_notation.
+
+        Args:
+            notation (str): The notation.
+
+        Returns:
+            Board: The board.
+
+        Raises:
+            ValueError: If the notation is not valid.
+        """
+        try:
+            levels, pawns, player_turn, turn_number, winner = notation.split(" ")
+            columns = levels.split("/")
+            if len(columns) != BOARD_SIZE or any(
+                len(column) != BOARD_SIZE for column in columns
+            ):
+                raise ValueError("5 columns of 5 levels are expected")
+            levels = "".join(columns).encode()
+            if levels.strip(b"01234"):
+                raise ValueError("The levels should be between 0 and 4")
+            pawn_cells = [CELLS_BY_NAME[name] for name in pawns.split(",")]
+            return cls._from_state(
+                len(pawn_cells) // 2,
+                bytearray(levels.translate(DIGIT_LEVELS)),
+                pawn_cells,
+                int(player_turn),
+                int(turn_number),
+                None if winner == "-" else int(winner),
+            )
+        except (KeyError, ValueError) as error:
+            raise ValueError(f"Invalid notation '{notation}': {error}") from None
+
+    def to_bytes(self) -> bytes:
+        """
+        Encodes the position on PACKED_BOARD.size (16) bytes, decoded by
+        from_bytes. Equal positions have the same encoding.
+
+        Returns:
+            bytes: The encoding.
+        """
+        cells = bytes(self.cells)
+        levels = 0
+        for start in range(0, NB_CELLS, BOARD_SIZE):
+            levels = levels * NB_ROW_VALUES + ROW_VALUES[cells[start : start + 5]]
+
+        pawns = self.nb_players << NB_PLAYERS_SHIFT
+        shift = 0
+        for pawn in self.pawns:
+            pawns |= pawn.cell << shift
+            shift += PAWN_CELL_BITS
+
+        return PACKED_BOARD.pack(
+            levels,
+            pawns,
+            self.player_turn,
+            self.winner_player_number or 0,
+            self.turn_number,
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Board":
+        """
+        Creates a board from its encoding, see to_bytes.
+
+        Args:
+            data (bytes): The encoding.
+
+        Returns:
+            Board: The board.
+
+        Raises:
+            ValueError: If the encoding is not valid.
+        """
+        try:
+            levels, pawns, player_turn, winner, turn_number = PACKED_BOARD.unpack(data)
+        except struct.error as error:
+            raise ValueError(f"Invalid board encoding: {error}") from None
+
+        rows = []
+        for _ in range(BOARD_SIZE):
+            levels, row = divmod(levels, NB_ROW_VALUES)
+            rows.append(ROW_LEVELS[row])
+        if levels:
+            raise ValueError("Invalid board encoding: levels out of range")
+        rows.reverse()
+
+        nb_players = pawns >> NB_PLAYERS_SHIFT
+        pawn_cells = [
+            pawns >> (PAWN_CELL_BITS * shift) & 31 for shift in range(nb_players * 2)
+        ]
+        return cls._from_state(
+            nb_players,
+            bytearray(b"".join(rows)),
+            pawn_cells,
+            player_turn,
+            turn_number,
+            winner or None,
+        )
+
+    @classmethod
+    def _from_state(
+        cls,
+        nb_players: int,
+        cells: bytearray,
+        pawn_cells: List[int],
+        player_turn: int,
+        turn_number: int,
+        winner_player_number: Optional[int],
+    ) -> "Board":
+        """
+        Creates a board from decoded fields, checking them.
+        """
+        pawn_identities = PAWN_IDENTITIES.get(nb_players)
+        if pawn_identities is None or len(pawn_cells) != len(pawn_identities):
+            raise ValueError("2 or 3 players with 2 pawns each are expected")
+        placed_cells = [cell for cell in pawn_cells if cell != UNPLACED]
+        if len(set(placed_cells)) != len(placed_cells) or max(pawn_cells) > UNPLACED:
+            raise ValueError("The pawns should be on different cells")
+        if not 1 <= player_turn <= nb_players:
+            raise ValueError(f"No player {player_turn}")
+        if winner_player_number is not None and not (
+            1 <= winner_player_number <= nb_players
+        ):
+            raise ValueError(f"No player {winner_player_number}")
+
+        # Like copy, without validating the pawns again
+        board = cls.__new__(cls)
+        board.nb_players = nb_players
+        board.nb_pawns = nb_players * 2
+        board.board_size = BOARD_SIZE
+        board.cells = cells
+        board._grid = None
+
+        board.pawns = []
+        for (number, order, player_number), cell in zip(pawn_identities, pawn_cells):
+            pawn = Pawn.__new__(Pawn)
+            pawn.number = number
+            pawn.order = order
+            pawn.player_number = player_number
+            pawn.cell = cell
+            board.pawns.append(pawn)
+
+        board.winner_player_number = winner_player_number
+        board.turn_number = turn_number
+        board.player_turn = player_turn
+        board._pawn_threats = None
+        board._player_threats = None
+        board._threats_key = None
+        return board
+
+    def winning_threats(self, player_number: int) -> FrozenSet[Tuple[int, int]]:
+        """
+        Gets the positions where a player could win on its next move: free
+        level 3 positions next to one of its pawns standing on level 2 or more.
+
+        The threats are indexed on the first call, then updated incrementally
+        by place_pawn, play_move and play_move_simple. If the board or the
+        pawns were modified directly, the index is rebuilt.
+
+        Args:
+            player_number (int): The number of the player.
+
+        Returns:
+            frozenset: The winning positions (x, y) of the player.
+        """
+        if self._threats_key != self._state_key():
+            self._build_threats()
+        return self._player_threats[player_number - 1]
+
+    def _state_key(self) -> bytes:
+        """
+        The levels and the pawn positions, to detect direct modifications.
+        """
+        return bytes(self.cells) + bytes([pawn.cell for pawn in self.pawns])
+
+    def _pawn_threat_cells(self, pawn: Pawn) -> FrozenSet[int]:
+        """
+        The cells where a pawn could win on its next move.
+        """
+        cells = self.cells
+        if pawn.cell == UNPLACED or cells[pawn.cell] < 2:
+            return NO_THREATS
+
+        occupied = [p.cell for p in self.pawns]
+        return frozenset(
+            cell
+            for cell in NEIGHBOUR_CELLS[pawn.cell]
+            if cells[cell] == 3 and cell not in occupied
+        )
+
+    def _player_threat_positions(
+        self, player_number: int
+    ) -> FrozenSet[Tuple[int, int]]:
+        """
+        The positions where a player could win, from the threats of its pawns.
+        """
+        return frozenset(
+            CELL_POSITIONS[cell]
+            for pawn, threats in zip(self.pawns, self._pawn_threats)
+            if pawn.player_number == player_number
+            for cell in threats
+        )
+
+    def _build_threats(self):
+        """
+        Computes the winning threats of every pawn and player.
+        """
+        self._pawn_threats = [self._pawn_threat_cells(pawn) for pawn in self.pawns]
+        self._player_threats = [
+            self._player_threat_positions(player_number)
+            for player_number in range(1, self.nb_players + 1)
+        ]
+        self._threats_key = self._state_key()
+
+    def _is_threat_index_current(self) -> bool:
+        """
+        Checks, before a change of the board, if the threats index can be
+        updated incrementally. A stale index is dropped, to be rebuilt later.
+        """
+        if self._threats_key is None:
+            return False
+        if self._threats_key != self._state_key():
+            self._threats_key = None
+            return False
+        return True
+
+    def _update_threats(self, changed_cells: Set[int]):
+        """
+        Updates the threats index after a change of the given cells. Only the
+        pawns standing on, or next to, a changed cell can have new threats.
+        """
+        updated_players = set()
+        for i, pawn in enumerate(self.pawns):
+            cell = pawn.cell
+            if cell == UNPLACED:
+                continue
+            if cell in changed_cells or not changed_cells.isdisjoint(
+                NEIGHBOUR_CELLS[cell]
+            ):
+                threats = self._pawn_threat_cells(pawn)
+                if threats != self._pawn_threats[i]:
+                    self._pawn_threats[i] = threats
+                    updated_players.add(pawn.player_number)
+
+        for player_number in updated_players:
+            self._player_threats[player_number - 1] = self._player_threat_positions(
+                player_number
+            )
+        self._threats_key = self._state_key()
+
     def __repr__(self) -> str:
         """
         Returns a string representation of the board.
@@ -636,13 +1270,43 @@ class Board:
         for y in range(self.board_size - 1, -1, -1):
             for x in range(self.board_size):
                 # Check if there is a pawn at this position
+                cell = x * BOARD_SIZE + y
                 pawn = None
                 for p in self.pawns:
-                    if p.pos == (x, y):
+                    if p.cell == cell:
                         pawn = p
                         break
                 pawn_number = str(pawn.number) if pawn is not None else "_"
-                output += pawn_number + str(self.board[x][y]) + " "
+                output += pawn_number + str(self.cells[cell]) + " "
             output += "\n"
 
         return output
+
+    def __getstate__(self):
+        # The grid view can't be pickled, it is created again when needed
+        return (
+            self.pawns,
+            self.nb_players,
+            self.nb_pawns,
+            self.board_size,
+            self.cells,
+            self.winner_player_number,
+            self.turn_number,
+            self.player_turn,
+        )
+
+    def __setstate__(self, state):
+        (
+            self.pawns,
+            self.nb_players,
+            self.nb_pawns,
+            self.board_size,
+            self.cells,
+            self.winner_player_number,
+            self.turn_number,
+            self.player_turn,
+        ) = state
+        self._grid = None
+        self._pawn_threats = None
+        self._player_threats = None
+        self._threats_key = None
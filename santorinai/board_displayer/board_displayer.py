@@ -1,5 +1,21 @@
+import time
+from typing import List
+
 import PySimpleGUI as sg
 from santorinai.board import Board
+from santorinai.board_displayer.geometry import (
+    BOARD_PLANE,
+    DRAWING_ORDER,
+    SIZE_X,
+    SIZE_Y,
+    cell_content,
+    cell_shapes,
+    cells_to_redraw,
+    changed_cells,
+    isometric_cube,
+    pawn_shapes,
+    snapshot,
+)
 
 # Board display util
 # Used to display a game board live
@@ -18,17 +34,9 @@ from santorinai.board import Board
 # A list of pawns with a number and a pos.
 
 sg.theme("Dark Blue 3")
-SIZE = 5
-
-pawns_colors = {
-    1: "grey",
-    2: "blue",
-    3: "white",
-}
 
-SIZE_X = 800
-SIZE_Y = 300
-TILE_SIZE = SIZE_X / 5
+# Frames per second of a BoardRenderer
+DEFAULT_FPS = 30
 
 
 def init_window(player_names):
@@ -52,6 +60,31 @@ def init_window(player_names):
     return window
 
 
+def draw_shape(graph: sg.Graph, shape):
+    """
+    Draw a shape of the geometry module on a graph.
+    :param graph: The graph to draw on.
+    :param shape: The shape.
+    :return: The id of the drawn figure.
+    """
+    if shape[0] == "polygon":
+        _, points, line_color, fill_color, line_width = shape
+        return graph.draw_polygon(
+            points, line_color=line_color, fill_color=fill_color, line_width=line_width
+        )
+    if shape[0] == "oval":
+        _, top_left, bottom_right, line_color, fill_color, line_width = shape
+        return graph.draw_oval(
+            top_left,
+            bottom_right,
+            line_color=line_color,
+            fill_color=fill_color,
+            line_width=line_width,
+        )
+    _, text, location, font, color = shape
+    return graph.draw_text(text, location, font=font, color=color)
+
+
 def draw_isometric_cube(
     window: sg.Window, x, y, size, cube_heigth, color, line_color, line_width
 ):
@@ -69,175 +102,67 @@ def draw_isometric_cube(
     if graph is None:
         return
 
-    ratio = SIZE_X / SIZE_Y
+    for shape in isometric_cube(x, y, size, cube_heigth, color, line_color, line_width):
+        draw_shape(graph, shape)
 
-    AY = y + size / ratio
-    B2Y = y - size / ratio
-    B1Y = B3Y = y
-    C2Y = B2Y - cube_heigth
-    C1Y = C3Y = B1Y - cube_heigth
 
-    AX = B2X = C2X = x
-    B1X = C1X = x - size
-    B3X = C3X = x + size
+def frame_cell_shapes(frame, i, j):
+    """
+    The shapes of a cell of a board snapshot: its tower and its pawn.
+    """
+    level, pawn = cell_content(frame, i, j)
+    shapes = cell_shapes(i, j, level)
+    if pawn is not None:
+        shapes += pawn_shapes(i, j, level, *pawn)
+    return shapes
 
-    graph.draw_polygon(
-        [
-            (B1X, B1Y),
-            (B2X, B2Y),
-            (C2X, C2Y),
-            (C1X, C1Y),
-        ],
-        line_color=line_color,
-        fill_color=color,
-        line_width=line_width,
-    )
-    graph.draw_polygon(
-        [
-            (B3X, B3Y),
-            (B2X, B2Y),
-            (C2X, C2Y),
-            (C3X, C3Y),
-        ],
-        line_color=line_color,
-        fill_color=color,
-        line_width=line_width,
-    )
-    graph.draw_polygon(
-        [
-            (B1X, B1Y),
-            (B2X, B2Y),
-            (B3X, B3Y),
-            (AX, AY),
-        ],
-        line_color=line_color,
-        fill_color=color,
-        line_width=line_width,
-    )
 
+class BoardView:
+    """
+    The drawing of a board on a graph, keeping the figures of each cell so
+    that only the cells which changed since the last frame are drawn again.
+    """
 
-def update_board(window: sg.Window, board: Board):
-    graph = window["-GRAPH-"]
-    graph.erase()
-
-    # Draw the board plane
-    graph.draw_polygon(
-        (
-            (-10, SIZE_Y / 2),
-            (SIZE_X / 2, -10),
-            (10 + SIZE_X, SIZE_Y / 2),
-            (SIZE_X / 2, SIZE_Y + 5),
-        ),
-        line_color="black",
-        fill_color="white",
-        line_width=0,
-    )
-
-    # Board
-    for i in range(SIZE - 1, -1, -1):
-        for j in range(SIZE - 1, -1, -1):
-            level = board.board[i][j]
-
-            x = (j - i) * TILE_SIZE / 2 + SIZE_X / 2
-            y = (j + i) * TILE_SIZE / 5.2 + 25
-
-            if level >= 0:
-                color = "light grey"
-                line_width = 2
-                line_color = "black"
-                cube_size = TILE_SIZE / 2 - 10
-                cube_heigth = 0
-
-            draw_isometric_cube(
-                window, x, y, cube_size, cube_heigth, color, line_color, line_width
-            )
+    def __init__(self, graph: sg.Graph):
+        self.graph = graph
+        self.frame = None
+        self.cell_figures = {}
+
+    def draw(self, frame):
+        """
+        Draw a board snapshot, see geometry.snapshot.
+        """
+        if self.frame is None:
+            self.graph.erase()
+            draw_shape(self.graph, BOARD_PLANE)
+            cells = set(DRAWING_ORDER)
+            changed = cells
+        else:
+            changed = changed_cells(self.frame, frame)
+            cells = cells_to_redraw(changed)
+
+        # From the back to the front: the changed cells are drawn again, and
+        # the cells in front of them are raised over them
+        for cell in DRAWING_ORDER:
+            if cell not in cells:
+                continue
+            if cell in changed:
+                for figure in self.cell_figures.get(cell, ()):
+                    self.graph.delete_figure(figure)
+                self.cell_figures[cell] = [
+                    draw_shape(self.graph, shape)
+                    for shape in frame_cell_shapes(frame, *cell)
+                ]
+            else:
+                for figure in self.cell_figures[cell]:
+                    self.graph.bring_figure_to_front(figure)
+
+        self.frame = frame
 
-            if level >= 1:
-                color = "#f0f0f0"
-                line_width = 2
-                # line_color = "dark grey"
-                line_color = "black"
-                cube_size = TILE_SIZE / 2 - 25
-                cube_heigth = TILE_SIZE / 5
-                y += cube_heigth
-
-            draw_isometric_cube(
-                window, x, y, cube_size, cube_heigth, color, line_color, line_width
-            )
-            if level >= 2:
-                color = "#d0d0d0"
-                line_width = 2
-                line_color = "black"
-                cube_size = TILE_SIZE / 2 - 30
-                cube_heigth = TILE_SIZE / 6
-                y += cube_heigth
-
-            draw_isometric_cube(
-                window, x, y, cube_size, cube_heigth, color, line_color, line_width
-            )
-            if level >= 3:
-                color = "#b0b0b0"
-                line_width = 2
-                line_color = "black"
-                cube_size = TILE_SIZE / 2 - 35
-                cube_heigth = TILE_SIZE / 8
-                y += cube_heigth
-
-            draw_isometric_cube(
-                window, x, y, cube_size, cube_heigth, color, line_color, line_width
-            )
-            if level >= 4:
-                color = "blue"
-                line_width = 2
-                line_color = "black"
-                cube_size = TILE_SIZE / 2 - 45
-                cube_heigth = TILE_SIZE / 10
-                y += cube_heigth
-
-            draw_isometric_cube(
-                window, x, y, cube_size, cube_heigth, color, line_color, line_width
-            )
 
-            # Pawns
-            for pawn in board.pawns:
-                x, y = pawn.pos
-                if (x, y) == (None, None):
-                    continue
-
-                if (x, y) != (i, j):
-                    continue
-
-                level = board.board[x][y]
-                PAWN_SIZE = 50
-                x_pos = (y - x) * TILE_SIZE / 2 + SIZE_X / 2
-                y_pos = (y + x) * TILE_SIZE / 5.2 + cube_heigth * level + PAWN_SIZE
-
-                color = pawns_colors[pawn.player_number]
-                line_width = 2
-                line_color = "black"
-
-                # Draw the pawn's shadow
-                graph.DrawOval(
-                    (x_pos - 14, y_pos - PAWN_SIZE / 2 - 2),
-                    (x_pos + 14, y_pos - PAWN_SIZE / 2 + 8),
-                    fill_color="black",
-                )
-                # Draw the pawn
-                graph.DrawOval(
-                    (x_pos - 14, y_pos - PAWN_SIZE / 2),
-                    (x_pos + 14, y_pos + PAWN_SIZE / 2),
-                    line_color=line_color,
-                    fill_color=color,
-                    line_width=line_width,
-                )
-
-                # Draw the pawn's number
-                graph.DrawText(
-                    pawn.number,
-                    (x_pos, y_pos - 3),
-                    font="Courier 15",
-                    color="white",
-                )
+def update_board(window: sg.Window, board: Board):
+    view = BoardView(window["-GRAPH-"])
+    view.draw(snapshot(board))
 
     event, values = window.read(timeout=10)
 
@@ -246,6 +171,112 @@ def update_board(window: sg.Window, board: Board):
     return False
 
 
+class BoardRenderer:
+    """
+    Displays boards in a window at a bounded frame rate, so that the games
+    are not slowed down by the display.
+
+    The renderer is synchronous: the window is created, drawn and closed by
+    the thread playing the games, which should be the main thread, as Tk
+    only supports one thread and it must be the main one on macOS. The
+    window is drawn from submit at most fps times per second, with the last
+    submitted snapshot: the snapshots submitted between two frames are
+    dropped, so a submit between two frames only copies the board.
+
+    Usage:
+
+        renderer = BoardRenderer(["Player 1", "Player 2"])
+        renderer.start()
+        renderer.submit(board)
+        renderer.wait(0.5)  # Keep the window responsive without playing
+        renderer.close()
+    """
+
+    def __init__(self, player_names: List[str], fps: float = DEFAULT_FPS):
+        self.player_names = player_names
+        self.fps = fps
+        self.nb_drawn_frames = 0
+        self.nb_dropped_frames = 0
+        self.closed = False  # True when the window has been closed
+        self._pending_frame = None  # The last snapshot, not drawn yet
+        self._window = None
+        self._view = None
+        self._next_frame_time = 0.0
+
+    def start(self):
+        """
+        Open the window, from the thread drawing it.
+        """
+        try:
+            self._window = init_window(self.player_names)
+        except Exception:
+            self.closed = True
+            raise
+        self._view = BoardView(self._window["-GRAPH-"])
+
+    def submit(self, board: Board):
+        """
+        Keep a snapshot of a board, replacing the one not drawn yet, and draw
+        it if a frame is due. Never waits.
+        """
+        if self.closed:
+            return
+        if self._pending_frame is not None:
+            self.nb_dropped_frames += 1
+        self._pending_frame = snapshot(board)
+
+        if time.perf_counter() >= self._next_frame_time:
+            self._refresh(0)
+
+    def wait(self, seconds: float):
+        """
+        Wait while keeping the window responsive, the last submitted snapshot
+        is drawn.
+        """
+        end_time = time.perf_counter() + seconds
+        if self._window is None:
+            time.sleep(seconds)
+            return
+
+        while self._window is not None:
+            remaining = end_time - time.perf_counter()
+            if remaining <= 0:
+                break
+            self._refresh(remaining)
+
+    def close(self):
+        """
+        Draw the last submitted snapshot, then close the window.
+        """
+        if self._window is None:
+            return
+        self._draw_last_frame()
+        close_window(self._window)
+        self._window = None
+
+    def _draw_last_frame(self):
+        if self._pending_frame is not None:
+            self._view.draw(self._pending_frame)
+            self._pending_frame = None
+            self.nb_drawn_frames += 1
+
+    def _refresh(self, timeout: float):
+        """
+        Draw the last snapshot, then handle the events of the window for at
+        most timeout seconds.
+        """
+        if self._window is None:
+            return
+        self._draw_last_frame()
+        self._next_frame_time = time.perf_counter() + 1 / self.fps
+
+        event, _ = self._window.read(timeout=int(timeout * 1000))
+        if event == sg.WIN_CLOSED:
+            self.closed = True
+            close_window(self._window)
+            self._window = None
+
+
 def close_window(window):
     window.close()
 
@@ -0,0 +1,218 @@
+from functools import lru_cache
+
+# Geometry of the isometric view of the board, without any drawing library:
+# the shapes of a cell are computed once per cell and level, then reused by
+# every frame.
+#
+# A shape is a tuple:
+#   ("polygon", points, line_color, fill_color, line_width)
+#   ("oval", top_left, bottom_right, line_color, fill_color, line_width)
+#   ("text", text, location, font, color)
+
+SIZE = 5
+
+SIZE_X = 800
+SIZE_Y = 300
+TILE_SIZE = SIZE_X / 5
+PAWN_SIZE = 50
+
+pawns_colors = {
+    1: "grey",
+    2: "blue",
+    3: "white",
+}
+
+# (color, cube size, cube height) of the floor and the 4 levels of a tower
+LEVEL_CUBES = [
+    ("light grey", TILE_SIZE / 2 - 10, 0),
+    ("#f0f0f0", TILE_SIZE / 2 - 25, TILE_SIZE / 5),
+    ("#d0d0d0", TILE_SIZE / 2 - 30, TILE_SIZE / 6),
+    ("#b0b0b0", TILE_SIZE / 2 - 35, TILE_SIZE / 8),
+    ("blue", TILE_SIZE / 2 - 45, TILE_SIZE / 10),
+]
+
+BOARD_PLANE = (
+    "polygon",
+    (
+        (-10, SIZE_Y / 2),
+        (SIZE_X / 2, -10),
+        (10 + SIZE_X, SIZE_Y / 2),
+        (SIZE_X / 2, SIZE_Y + 5),
+    ),
+    "black",
+    "white",
+    0,
+)
+
+# Drawing order of the cells (i, j), from the back to the front
+DRAWING_ORDER = [
+    (i, j) for i in range(SIZE - 1, -1, -1) for j in range(SIZE - 1, -1, -1)
+]
+
+
+@lru_cache(maxsize=None)
+def isometric_cube(x, y, size, cube_heigth, color, line_color, line_width):
+    """
+    The 3 faces of an isometric cube.
+    :param x: The x-coordinate of the cube.
+    :param y: The y-coordinate of the cube.
+    :param size: The size of the cube.
+    :param cube_heigth: The height of the cube.
+    :param color: The fill color of the cube.
+    :param line_color: The color of the cube's outline.
+    :param line_width: The width of the cube's outline.
+    :return: The polygon shapes of the faces.
+    """
+    ratio = SIZE_X / SIZE_Y
+
+    AY = y + size / ratio
+    B2Y = y - size / ratio
+    B1Y = B3Y = y
+    C2Y = B2Y - cube_heigth
+    C1Y = C3Y = B1Y - cube_heigth
+
+    AX = B2X = C2X = x
+    B1X = C1X = x - size
+    B3X = C3X = x + size
+
+    return (
+        (
+            "polygon",
+            ((B1X, B1Y), (B2X, B2Y), (C2X, C2Y), (C1X, C1Y)),
+            line_color,
+            color,
+            line_width,
+        ),
+        (
+            "polygon",
+            ((B3X, B3Y), (B2X, B2Y), (C2X, C2Y), (C3X, C3Y)),
+            line_color,
+            color,
+            line_width,
+        ),
+        (
+            "polygon",
+            ((B1X, B1Y), (B2X, B2Y), (B3X, B3Y), (AX, AY)),
+            line_color,
+            color,
+            line_width,
+        ),
+    )
+
+
+@lru_cache(maxsize=None)
+def cell_shapes(i, j, level):
+    """
+    The shapes of the floor and the tower of a cell.
+    :param i: The x position of the cell on the board.
+    :param j: The y position of the cell on the board.
+    :param level: The level of the tower, 0 to 4.
+    :return: The shapes, in drawing order.
+    """
+    x = (j - i) * TILE_SIZE / 2 + SIZE_X / 2
+    y = (j + i) * TILE_SIZE / 5.2 + 25
+
+    shapes = ()
+    for color, cube_size, cube_heigth in LEVEL_CUBES[: min(level, 4) + 1]:
+        y += cube_heigth
+        shapes += isometric_cube(x, y, cube_size, cube_heigth, color, "black", 2)
+    return shapes
+
+
+@lru_cache(maxsize=None)
+def pawn_shapes(i, j, level, pawn_number, player_number):
+    """
+    The shapes of a pawn standing on a cell.
+    :param i: The x position of the cell on the board.
+    :param j: The y position of the cell on the board.
+    :param level: The level of the tower under the pawn.
+    :param pawn_number: The number of the pawn, written on it.
+    :param player_number: The player of the pawn, giving its color.
+    :return: The shapes, in drawing order.
+    """
+    cube_heigth = LEVEL_CUBES[min(level, 4)][2]
+    x_pos = (j - i) * TILE_SIZE / 2 + SIZE_X / 2
+    y_pos = (j + i) * TILE_SIZE / 5.2 + cube_heigth * level + PAWN_SIZE
+
+    return (
+        # The pawn's shadow
+        (
+            "oval",
+            (x_pos - 14, y_pos - PAWN_SIZE / 2 - 2),
+            (x_pos + 14, y_pos - PAWN_SIZE / 2 + 8),
+            None,
+            "black",
+            1,
+        ),
+        # The pawn
+        (
+            "oval",
+            (x_pos - 14, y_pos - PAWN_SIZE / 2),
+            (x_pos + 14, y_pos + PAWN_SIZE / 2),
+            "black",
+            pawns_colors[player_number],
+            2,
+        ),
+        # The pawn's number
+        ("text", pawn_number, (x_pos, y_pos - 3), "Courier 15", "white"),
+    )
+
+
+def front_cells(i, j):
+    """
+    The cells drawn after a cell which can hide a part of it: the cells in
+    front of it in the isometric view.
+    :return: The cells (i, j), in drawing order.
+    """
+    return [
+        (front_i, front_j)
+        for front_i, front_j in DRAWING_ORDER
+        if front_i <= i and front_j <= j and (front_i, front_j) != (i, j)
+    ]
+
+
+def snapshot(board):
+    """
+    A copy of what is displayed of a board, cheap to take after each move.
+    :param board: The board.
+    :return: The levels of the cells, indexed by x * SIZE + y, and the
+        (pawn number, player number) of the pawn on each occupied cell.
+    """
+    pawns = {}
+    for pawn in board.pawns:
+        if pawn.cell < SIZE * SIZE:
+            pawns[pawn.cell] = (pawn.number, pawn.player_number)
+    return bytes(board.cells), pawns
+
+
+def cell_content(frame, i, j):
+    """
+    What is displayed on a cell of a snapshot: its level and its pawn.
+    """
+    levels, pawns = frame
+    cell = i * SIZE + j
+    return levels[cell], pawns.get(cell)
+
+
+def changed_cells(previous_frame, frame):
+    """
+    The cells whose level or pawn differ between two snapshots.
+    :return: A set of cells (i, j).
+    """
+    return {
+        (i, j)
+        for i, j in DRAWING_ORDER
+        if cell_content(previous_frame, i, j) != cell_content(frame, i, j)
+    }
+
+
+def cells_to_redraw(changed):
+    """
+    The changed cells and the cells in front of them, which must be drawn
+    again over the changed cells.
+    :return: A set of cells (i, j).
+    """
+    cells = set(changed)
+    for i, j in changed:
+        cells.update(front_cells(i, j))
+    return cells
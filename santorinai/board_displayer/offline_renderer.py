@@ -0,0 +1,458 @@
+import os
+from functools import lru_cache
+from multiprocessing import Pool
+from typing import List, Optional, Sequence
+
+from santorinai.board import Board
+from santorinai.board_displayer.geometry import (
+    BOARD_PLANE,
+    DRAWING_ORDER,
+    SIZE_X,
+    SIZE_Y,
+    TILE_SIZE,
+    cell_content,
+    cell_shapes,
+    pawn_shapes,
+    snapshot,
+)
+from santorinai.observers import GameEnd, GameStart, Move, Observer, Placement
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:  # Pillow is only needed for PNG and GIF images
+    Image = ImageDraw = ImageFont = None
+
+# Headless rendering of boards and recorded games, without a display:
+# SVG frames in pure Python, PNG frames and animated GIFs with Pillow.
+#
+# It uses the isometric layout of the board window (geometry.py). The shapes
+# of a cell only depend on its position by a translation, so a sprite is
+# made once per tower level and per pawn, and moved to each cell: <defs> in
+# SVG, cached RGBA images with Pillow.
+
+WIDTH = SIZE_X
+HEIGHT = SIZE_Y + 100
+BACKGROUND_COLOR = "#64778d"  # Of the "Dark Blue 3" theme of the window
+
+SVG = "svg"
+PNG = "png"
+GIF = "gif"
+FORMATS = (SVG, PNG, GIF)
+
+# Time each frame of a GIF is displayed, in milliseconds
+DEFAULT_FRAME_DURATION = 500
+
+
+def _cell_offset(i, j):
+    """
+    The translation from the cell (0, 0) to the cell (i, j), in image
+    coordinates: the y axis of the window goes up, the one of images down.
+    """
+    return (j - i) * TILE_SIZE / 2, -(j + i) * TILE_SIZE / 5.2
+
+
+def _color(color: Optional[str]) -> Optional[str]:
+    # Tk accepts "light grey", SVG and Pillow only "lightgrey"
+    return None if color is None else color.replace(" ", "")
+
+
+def _image_point(point):
+    return point[0], HEIGHT - point[1]
+
+
+def _require_pillow():
+    if Image is None:
+        raise ImportError(
+            "Pillow is required to render PNG and GIF images: pip install pillow"
+        )
+
+
+class RecordedGame:
+    """
+    The snapshots of the board after each placement and move of a game.
+
+    Attributes:
+        game_number (int): The number of the game in its match.
+        player_names (list): The names of the players, in playing order.
+        frames (list): The board snapshots, see geometry.snapshot.
+        winner_name (str): The name of the winner, None if nobody won.
+    """
+
+    __slots__ = ("game_number", "player_names", "frames", "winner_name")
+
+    def __init__(self, game_number: int, player_names: List[str]):
+        self.game_number = game_number
+        self.player_names = player_names
+        self.frames = []
+        self.winner_name = None
+
+
+class GameRecorder(Observer):
+    """
+    Records the games played by a Tester, to render them afterwards. The
+    events are sorted by game number, so the interleaved games of
+    play_1v1_batched and AsyncTester are recorded apart.
+
+    Usage:
+
+        recorder = GameRecorder()
+        tester.subscribe(recorder)
+        tester.play_1v1(player1, player2, nb_games=100)
+        render_games(recorder.games, "games", formats=(GIF,))
+
+    Attributes:
+        games (list): The RecordedGame of each game, in starting order.
+    """
+
+    def __init__(self):
+        self.games = []
+        self._running_games = {}  # The RecordedGame of each running game number
+
+    def on_game_start(self, event: GameStart):
+        game = RecordedGame(event.game_number, list(event.player_names))
+        game.frames.append(snapshot(event.board))
+        self.games.append(game)
+        self._running_games[event.game_number] = game
+
+    def on_placement(self, event: Placement):
+        if event.success:
+            self._running_games[event.game_number].frames.append(snapshot(event.board))
+
+    def on_move(self, event: Move):
+        if event.success:
+            self._running_games[event.game_number].frames.append(snapshot(event.board))
+
+    def on_game_end(self, event: GameEnd):
+        game = self._running_games.pop(event.game_number)
+        game.winner_name = event.winner_name
+
+
+# SVG
+
+
+def _svg_shape(shape) -> str:
+    if shape[0] == "polygon":
+        _, points, line_color, fill_color, line_width = shape
+        coordinates = " ".join(f"{x:.1f},{y:.1f}" for x, y in map(_image_point, points))
+        return (
+            f'<polygon points="{coordinates}" fill="{_color(fill_color)}"'
+            f' stroke="{_color(line_color)}" stroke-width="{line_width}"/>'
+        )
+
+    if shape[0] == "oval":
+        _, corner, opposite_corner, line_color, fill_color, line_width = shape
+        (x0, y0), (x1, y1) = map(_image_point, (corner, opposite_corner))
+        stroke = _color(line_color) or "none"
+        return (
+            f'<ellipse cx="{(x0 + x1) / 2:.1f}" cy="{(y0 + y1) / 2:.1f}"'
+            f' rx="{abs(x1 - x0) / 2:.1f}" ry="{abs(y1 - y0) / 2:.1f}"'
+            f' fill="{_color(fill_color)}" stroke="{stroke}"'
+            f' stroke-width="{line_width}"/>'
+        )
+
+    _, text, location, font, color = shape
+    x, y = _image_point(location)
+    font_family, font_size = font.split()
+    return (
+        f'<text x="{x:.1f}" y="{y:.1f}" text-anchor="middle"'
+        f' dominant-baseline="central" font-family="{font_family}, monospace"'
+        f' font-size="{font_size}pt" fill="{_color(color)}">{text}</text>'
+    )
+
+
+@lru_cache(maxsize=None)
+def _svg_sprite(sprite_id: str, shapes) -> str:
+    return f'<g id="{sprite_id}">' + "".join(map(_svg_shape, shapes)) + "</g>"
+
+
+def board_svg(frame) -> str:
+    """
+    Renders a board snapshot as an SVG image.
+
+    Args:
+        frame: The snapshot, see geometry.snapshot.
+
+    Returns:
+        str: The SVG document.
+    """
+    sprites = {}
+    uses = []
+    for i, j in DRAWING_ORDER:
+        level, pawn = cell_content(frame, i, j)
+        dx, dy = _cell_offset(i, j)
+
+        sprite_ids = [f"level-{level}"]
+        sprites[sprite_ids[0]] = _svg_sprite(sprite_ids[0], cell_shapes(0, 0, level))
+        if pawn is not None:
+            sprite_ids.append(f"pawn-{level}-{pawn[0]}-{pawn[1]}")
+            sprites[sprite_ids[1]] = _svg_sprite(
+                sprite_ids[1], pawn_shapes(0, 0, level, *pawn)
+            )
+
+        for sprite_id in sprite_ids:
+            uses.append(f'<use xlink:href="#{sprite_id}" x="{dx:.1f}" y="{dy:.1f}"/>')
+
+    return "".join(
+        [
+            f'<svg xmlns="http://www.w3.org/2000/svg"'
+            f' xmlns:xlink="http://www.w3.org/1999/xlink"'
+            f' width="{WIDTH}" height="{HEIGHT}" viewBox="0 0 {WIDTH} {HEIGHT}">',
+            "<defs>",
+            *sprites.values(),
+            "</defs>",
+            f'<rect width="{WIDTH}" height="{HEIGHT}" fill="{BACKGROUND_COLOR}"/>',
+            _svg_shape(BOARD_PLANE),
+            *uses,
+            "</svg>\n",
+        ]
+    )
+
+
+# Pillow
+
+
+@lru_cache(maxsize=1)
+def _font():
+    try:
+        return ImageFont.load_default(size=20)
+    except TypeError:  # Pillow < 10.1
+        return ImageFont.load_default()
+
+
+def _draw_shapes(draw, shapes, origin=(0, 0)):
+    """
+    Draws shapes with Pillow, moved by -origin in image coordinates.
+    """
+
+    def point(graph_point):
+        x, y = _image_point(graph_point)
+        return x - origin[0], y - origin[1]
+
+    for shape in shapes:
+        if shape[0] == "polygon":
+            _, points, line_color, fill_color, line_width = shape
+            points = [point(graph_point) for graph_point in points]
+            draw.polygon(points, fill=_color(fill_color))
+            if line_width > 0:
+                draw.line(
+                    points + points[:1], fill=_color(line_color), width=line_width
+                )
+
+        elif shape[0] == "oval":
+            _, corner, opposite_corner, line_color, fill_color, line_width = shape
+            (x0, y0), (x1, y1) = point(corner), point(opposite_corner)
+            draw.ellipse(
+                (min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)),
+                fill=_color(fill_color),
+                outline=_color(line_color),
+                width=line_width if line_color is not None else 0,
+            )
+
+        else:
+            _, text, location, _, color = shape
+            x, y = point(location)
+            left, top, right, bottom = draw.textbbox((0, 0), str(text), font=_font())
+            draw.text(
+                (x - (left + right) / 2, y - (top + bottom) / 2),
+                str(text),
+                fill=_color(color),
+                font=_font(),
+            )
+
+
+def _render_sprite(shapes):
+    """
+    Renders shapes on a transparent image fitting them.
+
+    Returns:
+        Image: The sprite.
+        tuple: The position of its top left corner in the image of the board.
+    """
+    points = []
+    for shape in shapes:
+        if shape[0] == "polygon":
+            points += shape[1]
+        elif shape[0] == "oval":
+            points += [shape[1], shape[2]]
+        else:
+            x, y = shape[2]
+            points += [(x - 20, y - 20), (x + 20, y + 20)]
+    points = [_image_point(point) for point in points]
+
+    # Margin for the outlines
+    left = int(min(x for x, _ in points)) - 3
+    top = int(min(y for _, y in points)) - 3
+    right = int(max(x for x, _ in points)) + 4
+    bottom = int(max(y for _, y in points)) + 4
+
+    sprite = Image.new("RGBA", (right - left, bottom - top), (0, 0, 0, 0))
+    _draw_shapes(ImageDraw.Draw(sprite), shapes, (left, top))
+    return sprite, (left, top)
+
+
+@lru_cache(maxsize=None)
+def _level_sprite(level: int):
+    return _render_sprite(cell_shapes(0, 0, level))
+
+
+@lru_cache(maxsize=None)
+def _pawn_sprite(level: int, pawn_number: int, player_number: int):
+    return _render_sprite(pawn_shapes(0, 0, level, pawn_number, player_number))
+
+
+@lru_cache(maxsize=1)
+def _background():
+    background = Image.new("RGBA", (WIDTH, HEIGHT), BACKGROUND_COLOR)
+    _draw_shapes(ImageDraw.Draw(background), [BOARD_PLANE])
+    return background
+
+
+def board_image(frame):
+    """
+    Renders a board snapshot as a Pillow image.
+
+    Args:
+        frame: The snapshot, see geometry.snapshot.
+
+    Returns:
+        PIL.Image.Image: The RGBA image.
+    """
+    _require_pillow()
+
+    image = _background().copy()
+    for i, j in DRAWING_ORDER:
+        level, pawn = cell_content(frame, i, j)
+        dx, dy = _cell_offset(i, j)
+
+        sprites = [_level_sprite(level)]
+        if pawn is not None:
+            sprites.append(_pawn_sprite(level, *pawn))
+        for sprite, (left, top) in sprites:
+            image.alpha_composite(sprite, (round(left + dx), round(top + dy)))
+    return image
+
+
+# Files
+
+
+def save_frame(frame, path: str):
+    """
+    Saves a board snapshot as an SVG or PNG file, after the path extension.
+    """
+    if path.endswith("." + SVG):
+        with open(path, "w") as file:
+            file.write(board_svg(frame))
+    elif path.endswith("." + PNG):
+        board_image(frame).save(path)
+    else:
+        raise ValueError(f"Unknown image format: {path}")
+
+
+def save_board(board: Board, path: str):
+    """
+    Saves a board as an SVG or PNG file, after the path extension.
+    """
+    save_frame(snapshot(board), path)
+
+
+def save_gif(frames: Sequence, path: str, duration: int = DEFAULT_FRAME_DURATION):
+    """
+    Saves board snapshots as an animated GIF.
+
+    Args:
+        frames (list): The snapshots, see geometry.snapshot.
+        path (str): The GIF file.
+        duration (int): The time each snapshot is displayed, in milliseconds.
+    """
+    _require_pillow()
+    images = [board_image(frame).convert("RGB") for frame in frames]
+    images[0].save(
+        path, save_all=True, append_images=images[1:], duration=duration, loop=0
+    )
+
+
+def render_game(
+    game: RecordedGame,
+    output_dir: str,
+    formats: Sequence[str] = (GIF,),
+    duration: int = DEFAULT_FRAME_DURATION,
+) -> List[str]:
+    """
+    Renders a recorded game in a directory:
+    game_<number>/frame_<number>.svg or .png for each frame, and
+    game_<number>.gif for the animation.
+
+    Args:
+        game (RecordedGame): The game.
+        output_dir (str): The directory, created if needed.
+        formats (list): SVG, PNG and/or GIF.
+        duration (int): The time each frame of a GIF is displayed, in
+            milliseconds.
+
+    Returns:
+        list: The written files.
+    """
+    for image_format in formats:
+        if image_format not in FORMATS:
+            raise ValueError(f"Unknown image format '{image_format}'")
+
+    name = f"game_{game.game_number:04d}"
+    paths = []
+
+    frame_formats = [image_format for image_format in formats if image_format != GIF]
+    if frame_formats:
+        frames_dir = os.path.join(output_dir, name)
+        os.makedirs(frames_dir, exist_ok=True)
+        for frame_nb, frame in enumerate(game.frames):
+            for image_format in frame_formats:
+                path = os.path.join(frames_dir, f"frame_{frame_nb:03d}.{image_format}")
+                save_frame(frame, path)
+                paths.append(path)
+
+    if GIF in formats:
+        os.makedirs(output_dir, exist_ok=True)
+        path = os.path.join(output_dir, f"{name}.{GIF}")
+        save_gif(game.frames, path, duration)
+        paths.append(path)
+
+    return paths
+
+
+def _render_game_task(task) -> List[str]:
+    return render_game(*task)
+
+
+def render_games(
+    games: Sequence[RecordedGame],
+    output_dir: str,
+    formats: Sequence[str] = (GIF,),
+    processes: Optional[int] = None,
+    duration: int = DEFAULT_FRAME_DURATION,
+) -> List[str]:
+    """
+    Renders recorded games in parallel, see render_game.
+
+    Args:
+        games (list): The games.
+        output_dir (str): The directory, created if needed.
+        formats (list): SVG, PNG and/or GIF.
+        processes (int): The number of worker processes, defaults to the
+            number of cores. With 1, the games are rendered in this process.
+        duration (int): The time each frame of a GIF is displayed, in
+            milliseconds.
+
+    Returns:
+        list: The written files, by game.
+    """
+    if (PNG in formats or GIF in formats) and Image is None:
+        _require_pillow()
+
+    tasks = [(game, output_dir, tuple(formats), duration) for game in games]
+
+    if processes == 1:
+        results = map(_render_game_task, tasks)
+        return [path for paths in results for path in paths]
+
+    with Pool(processes) as pool:
+        results = pool.imap(_render_game_task, tasks)
+        return [path for paths in results for path in paths]
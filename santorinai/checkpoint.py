@@ -0,0 +1,211 @@
+import copy
+import json
+import os
+import random
+import signal
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from santorinai.reasons import reason_code, reason_from_code
+from santorinai.sprt import SPRT
+
+# Progress of a match saved in a JSON file, so that an interrupted match can
+# be resumed where it stopped, see Tester.play_1v1.
+#
+# Only finished games are saved: a game interrupted in the middle is played
+# again from its start when the match is resumed. The state of the random
+# module after the last finished game is saved too, so that a resumed match
+# goes on with the same random numbers as an uninterrupted one.
+
+CHECKPOINT_VERSION = 1
+
+
+class MatchCheckpoint:
+    """
+    The progress of a match, saved atomically in a file.
+
+    Attributes:
+        path (str): The checkpoint file.
+        player_names (list): The names of the players of the match.
+        nb_played_games (int): The number of finished games.
+        nb_victories (dict): The number of victories of each player.
+        dic_win_lose_type (dict): The winning and loosing conditions, saved
+            by reason code.
+        sprt_results (list): The wins, losses and draws of the SPRT, if any.
+        random_state (tuple): The state of the random module after the last
+            finished game.
+    """
+
+    def __init__(self, path: str, player_names: List[str]):
+        self.path = path
+        self.player_names = list(player_names)
+        self.nb_played_games = 0
+        self.nb_victories = {name: 0 for name in player_names}
+        self.dic_win_lose_type = {name: {} for name in player_names}
+        self.sprt_results = None
+        self.random_state = random.getstate()
+
+    @classmethod
+    def load(cls, path: str) -> Optional["MatchCheckpoint"]:
+        """
+        Loads a checkpoint file.
+
+        Returns:
+            MatchCheckpoint: The checkpoint, None if the file does not exist.
+        """
+        try:
+            with open(path) as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return None
+
+        if data.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"{path} is not a checkpoint of this version")
+
+        checkpoint = cls(path, data["player_names"])
+        checkpoint.nb_played_games = data["nb_played_games"]
+        checkpoint.nb_victories = data["nb_victories"]
+        checkpoint.dic_win_lose_type = {
+            name: {reason_from_code(code): count for code, count in counts.items()}
+            for name, counts in data["dic_win_lose_type"].items()
+        }
+        checkpoint.sprt_results = data["sprt_results"]
+        version, internal_state, gauss_next = data["random_state"]
+        checkpoint.random_state = (version, tuple(internal_state), gauss_next)
+        return checkpoint
+
+    def record(
+        self,
+        nb_played_games: int,
+        nb_victories: Dict[str, int],
+        dic_win_lose_type: Dict,
+        sprt: Optional[SPRT] = None,
+    ):
+        """
+        Records the progress after a finished game, without saving it.
+        """
+        self.nb_played_games = nb_played_games
+        self.nb_victories = dict(nb_victories)
+        self.dic_win_lose_type = copy.deepcopy(dic_win_lose_type)
+        if sprt is not None:
+            self.sprt_results = [sprt.wins, sprt.losses, sprt.draws]
+        self.random_state = random.getstate()
+
+    def restore(
+        self,
+        nb_victories: Dict[str, int],
+        dic_win_lose_type: Dict,
+        sprt: Optional[SPRT] = None,
+        restore_random_state: bool = True,
+    ):
+        """
+        Puts back the recorded progress in the statistics of a match.
+
+        Args:
+            nb_victories (dict): Updated in place.
+            dic_win_lose_type (dict): Updated in place.
+            sprt (SPRT): Updated in place, if any.
+            restore_random_state (bool): If True, the random module is put
+                back in its state after the last finished game.
+        """
+        nb_victories.update(self.nb_victories)
+        dic_win_lose_type.clear()
+        dic_win_lose_type.update(copy.deepcopy(self.dic_win_lose_type))
+        if sprt is not None and self.sprt_results is not None:
+            sprt.wins, sprt.losses, sprt.draws = self.sprt_results
+        if restore_random_state:
+            random.setstate(self.random_state)
+
+    def save(self):
+        """
+        Writes the recorded progress. The file is replaced atomically: it
+        always holds a complete checkpoint, even if the process is killed
+        while writing.
+        """
+        data = {
+            "version": CHECKPOINT_VERSION,
+            "player_names": self.player_names,
+            "nb_played_games": self.nb_played_games,
+            "nb_victories": self.nb_victories,
+            "dic_win_lose_type": {
+                name: {reason_code(reason): count for reason, count in counts.items()}
+                for name, counts in self.dic_win_lose_type.items()
+            },
+            "sprt_results": self.sprt_results,
+            "random_state": self.random_state,
+        }
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=directory, prefix=".checkpoint-", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(file_descriptor, "w") as file:
+                json.dump(data, file)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporary_path, self.path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+
+class InterruptGuard:
+    """
+    Defers the Ctrl-C received while the result of a game is counted, so
+    that a match is never stopped with half updated statistics. Outside of
+    the deferred sections, Ctrl-C raises KeyboardInterrupt as usual.
+
+    Usage:
+
+        with InterruptGuard() as guard:
+            for game in games:
+                result = play(game)
+                with guard.deferred():
+                    count(result)
+
+    The guard only works in the main thread, with the default handler of
+    SIGINT: otherwise Ctrl-C is handled as before.
+    """
+
+    def __init__(self):
+        self._deferring = False
+        self._pending = False
+        self._previous_handler = None
+
+    def __enter__(self):
+        if (
+            threading.current_thread() is threading.main_thread()
+            and signal.getsignal(signal.SIGINT) is signal.default_int_handler
+        ):
+            self._previous_handler = signal.signal(signal.SIGINT, self._handle)
+        return self
+
+    def __exit__(self, *_):
+        if self._previous_handler is not None:
+            signal.signal(signal.SIGINT, self._previous_handler)
+            self._previous_handler = None
+
+    @contextmanager
+    def deferred(self):
+        """
+        Raises the KeyboardInterrupt of a Ctrl-C received in the block at its
+        end.
+        """
+        self._deferring = True
+        try:
+            yield
+        finally:
+            self._deferring = False
+        if self._pending:
+            self._pending = False
+            raise KeyboardInterrupt
+
+    def _handle(self, signum, frame):
+        if self._deferring:
+            self._pending = True
+        else:
+            raise KeyboardInterrupt
@@ -0,0 +1,627 @@
+import random
+from multiprocessing import Pipe, Process
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Optional, Sequence, Tuple
+
+from santorinai.board import Board, NEIGHBOUR_SLOTS
+from santorinai.pawn import BOARD_SIZE, CELL_POSITIONS, NB_CELLS, UNPLACED
+from santorinai.player import Player
+from santorinai.tester import PLACE_PAWN, PLAY_MOVE, ask_batch
+
+# Reinforcement learning environments, in the style of gym.
+#
+# Observations are planes of 5 x 5 bytes, 0 or 1, flattened in a bytearray:
+#   - 5 planes for the levels 0 to 4 of the cells,
+#   - 1 plane per player for its pawns, starting with the observing player
+#     then the next players in turn order.
+# numpy.frombuffer(observation, numpy.uint8).reshape(-1, 5, 5) gives the planes.
+#
+# Actions are integers in range(NB_ACTIONS):
+#   - during the placement, the cell index x * 5 + y where the pawn is placed,
+#   - then (pawn order - 1) * 64 + move slot * 8 + build slot, where the move
+#     slot is the direction of the move from the pawn and the build slot the
+#     direction of the build from the moved pawn, in the order of
+#     NEIGHBOUR_SLOTS.
+# The legal mask of a position is a bytearray with 1 for the legal actions.
+#
+# Rewards are 1 when the agent wins, -1 when it loses, 0 otherwise.
+
+NB_ACTIONS = 2 * 8 * 8
+NB_LEVEL_PLANES = 5
+
+# Slot of each neighbour of each cell
+NEIGHBOUR_SLOT = [
+    {neighbour: slot for slot, neighbour in enumerate(slots) if neighbour >= 0}
+    for slots in NEIGHBOUR_SLOTS
+]
+
+# Modes of VecEnv
+SEQUENTIAL = "sequential"
+BATCHED = "batched"
+SUBPROCESS = "subprocess"
+
+
+def observation_size(nb_players: int) -> int:
+    """
+    The number of bytes of an observation.
+    """
+    return (NB_LEVEL_PLANES + nb_players) * NB_CELLS
+
+
+def encode_observation(
+    board: Board, player_number: int, out: bytearray = None, offset: int = 0
+) -> bytearray:
+    """
+    Encodes a position as seen by a player in observation planes.
+
+    Args:
+        board (Board): The position.
+        player_number (int): The number of the observing player.
+        out (bytearray): The buffer to write the observation to, a new one
+            if not given.
+        offset (int): The index of the observation in out.
+
+    Returns:
+        bytearray: The buffer containing the observation.
+    """
+    size = observation_size(board.nb_players)
+    if out is None:
+        out = bytearray(size)
+        offset = 0
+    else:
+        out[offset : offset + size] = bytes(size)
+
+    for cell, level in enumerate(board.cells):
+        out[offset + level * NB_CELLS + cell] = 1
+
+    for pawn in board.pawns:
+        if pawn.cell != UNPLACED:
+            plane = (
+                NB_LEVEL_PLANES
+                + (pawn.player_number - player_number) % board.nb_players
+            )
+            out[offset + plane * NB_CELLS + pawn.cell] = 1
+
+    return out
+
+
+def encode_legal_mask(
+    board: Board, out: bytearray = None, offset: int = 0
+) -> bytearray:
+    """
+    Encodes the legal actions of the playing player.
+
+    Args:
+        board (Board): The position.
+        out (bytearray): The buffer to write the mask to, a new one if not given.
+        offset (int): The index of the mask in out.
+
+    Returns:
+        bytearray: The buffer containing the mask.
+    """
+    if out is None:
+        out = bytearray(NB_ACTIONS)
+        offset = 0
+    else:
+        out[offset : offset + NB_ACTIONS] = bytes(NB_ACTIONS)
+
+    if board.is_game_over():
+        return out
+
+    pawn = board.get_first_unplaced_player_pawn(board.player_turn)
+    if pawn is not None:
+        for x, y in board.iter_moves(pawn):
+            out[offset + x * BOARD_SIZE + y] = 1
+        return out
+
+    for order, move, build in board.iter_all_actions(board.player_turn):
+        out[offset + encode_action(board, (order, move, build))] = 1
+    return out
+
+
+def encode_action(board: Board, ply) -> int:
+    """
+    Converts the answer of a player to an action.
+
+    Args:
+        board (Board): The position the ply is played from.
+        ply: A position during the placement, else (pawn order,
+            move_position, build_position). The positions must be adjacent.
+
+    Returns:
+        int: The action.
+    """
+    pawn = board.get_first_unplaced_player_pawn(board.player_turn)
+    if pawn is not None:
+        x, y = ply
+        return x * BOARD_SIZE + y
+
+    order, (move_x, move_y), (build_x, build_y) = ply
+    pawn = board.get_player_pawn(board.player_turn, order)
+    move_cell = move_x * BOARD_SIZE + move_y
+    move_slot = NEIGHBOUR_SLOT[pawn.cell][move_cell]
+    build_slot = NEIGHBOUR_SLOT[move_cell][build_x * BOARD_SIZE + build_y]
+    return (order - 1) * 64 + move_slot * 8 + build_slot
+
+
+def decode_action(board: Board, action: int):
+    """
+    Converts an action to the answer of a player.
+
+    Args:
+        board (Board): The position the action is played from.
+        action (int): The action.
+
+    Returns:
+        A position during the placement, else (pawn order, move_position,
+        build_position). Positions outside of the board are None.
+    """
+    pawn = board.get_first_unplaced_player_pawn(board.player_turn)
+    if pawn is not None:
+        return CELL_POSITIONS[action] if 0 <= action < NB_CELLS else None
+
+    order = action // 64 + 1
+    pawn = board.get_player_pawn(board.player_turn, order)
+    move_cell = NEIGHBOUR_SLOTS[pawn.cell][(action >> 3) & 7]
+    if move_cell < 0:
+        return order, None, None
+
+    build_cell = NEIGHBOUR_SLOTS[move_cell][action & 7]
+    if build_cell < 0:
+        return order, CELL_POSITIONS[move_cell], None
+    return order, CELL_POSITIONS[move_cell], CELL_POSITIONS[build_cell]
+
+
+class SantoriniEnv:
+    """
+    A game against Player opponents, played by an agent through actions.
+
+    The opponents play their turns inside reset and step, so observations are
+    always taken when the agent has to play or when the game is over.
+    An illegal action of the agent loses the game, an invalid answer of an
+    opponent makes the agent win.
+
+    Attributes:
+        nb_players (int): The number of players, including the agent.
+        agent_number (int): The player number of the agent.
+        opponents (dict): The opponent Player of each other player number.
+        board (Board): The current position.
+        done (bool): True if the game is over.
+        reward (float): The reward of the last step.
+    """
+
+    def __init__(self, opponents: Sequence, agent_number: int = 1):
+        """
+        Args:
+            opponents (list): One opponent per other player, in player number
+                order. A Player class is created with its player number.
+            agent_number (int): The player number of the agent.
+        """
+        self.nb_players = len(opponents) + 1
+        if self.nb_players not in (2, 3):
+            raise ValueError("There should be 1 or 2 opponents")
+        if not 1 <= agent_number <= self.nb_players:
+            raise ValueError(f"The agent number should be 1 to {self.nb_players}")
+
+        self.agent_number = agent_number
+        self.observation_size = observation_size(self.nb_players)
+
+        opponent_numbers = [
+            number for number in range(1, self.nb_players + 1) if number != agent_number
+        ]
+        self.opponents = {}
+        for number, opponent in zip(opponent_numbers, opponents):
+            if isinstance(opponent, type):
+                opponent = opponent(number)
+            if not isinstance(opponent, Player):
+                raise TypeError("The opponents should be Player classes or objects")
+            self.opponents[number] = opponent
+
+        self.board = None
+        self.done = True
+        self.reward = 0.0
+
+    def reset(self, seed: Optional[int] = None) -> Tuple[bytearray, bytearray]:
+        """
+        Starts a new game and plays the opponents until the agent has to play.
+
+        Args:
+            seed (int): Seeds the random module, used by the example players.
+
+        Returns:
+            bytearray: The observation.
+            bytearray: The legal mask.
+        """
+        self.start(seed)
+        self.play_opponents()
+        return self.observation(), self.legal_mask()
+
+    def step(self, action: int) -> Tuple[bytearray, float, bool, bytearray]:
+        """
+        Plays an action of the agent, then the opponents until the agent has
+        to play again or the game is over.
+
+        Args:
+            action (int): The action of the agent.
+
+        Returns:
+            bytearray: The observation.
+            float: The reward.
+            bool: True if the game is over.
+            bytearray: The legal mask.
+        """
+        self.play_agent(action)
+        self.play_opponents()
+        return self.observation(), self.reward, self.done, self.legal_mask()
+
+    def observation(self) -> bytearray:
+        return encode_observation(self.board, self.agent_number)
+
+    def legal_mask(self) -> bytearray:
+        if self.done:
+            return bytearray(NB_ACTIONS)
+        return encode_legal_mask(self.board)
+
+    def start(self, seed: Optional[int] = None):
+        """
+        Starts a new game, without playing the opponents.
+        """
+        if seed is not None:
+            random.seed(seed)
+        self.board = Board(self.nb_players)
+        self.done = False
+        self.reward = 0.0
+
+    def play_agent(self, action: int):
+        """
+        Plays an action of the agent, without playing the opponents.
+        """
+        if self.done:
+            raise RuntimeError("The game is over, call reset to start a new one")
+
+        self.reward = 0.0
+        success = self._play(decode_action(self.board, action))
+        if not success:
+            self._finish(-1.0)
+
+    def opponent_request(self):
+        """
+        Gets the decision an opponent has to take, as asked by Tester.
+
+        Returns:
+            tuple: (opponent, PLACE_PAWN or PLAY_MOVE, arguments of the
+            opponent method), None if it is the turn of the agent or the game
+            is over.
+        """
+        if self.done or self.board.player_turn == self.agent_number:
+            return None
+
+        opponent = self.opponents[self.board.player_turn]
+        board_copy = self.board.copy()
+        pawn = board_copy.get_first_unplaced_player_pawn(board_copy.player_turn)
+        if pawn is not None:
+            return opponent, PLACE_PAWN, (board_copy, pawn)
+        return opponent, PLAY_MOVE, (board_copy,)
+
+    def answer_opponent(self, answer):
+        """
+        Plays the answer of an opponent to opponent_request.
+        """
+        if not self._play(answer):
+            # The opponent fails
+            self._finish(1.0)
+
+    def play_opponents(self):
+        """
+        Plays the opponents until the agent has to play or the game is over.
+        """
+        request = self.opponent_request()
+        while request is not None:
+            opponent, decision, args = request
+            self.answer_opponent(getattr(opponent, decision)(*args))
+            request = self.opponent_request()
+
+    def _play(self, ply) -> bool:
+        """
+        Plays a placement or a move of the playing player.
+
+        Returns:
+            bool: False if the ply is invalid.
+        """
+        if self.board.get_first_unplaced_player_pawn(self.board.player_turn):
+            success, _ = self.board.place_pawn(ply)
+        else:
+            pawn_number, move_position, build_position = ply
+            success, _ = self.board.play_move(
+                pawn_number, move_position, build_position
+            )
+
+        if success and self.board.is_game_over():
+            winner = self.board.winner_player_number
+            self._finish(1.0 if winner == self.agent_number else -1.0)
+        return success
+
+    def _finish(self, reward: float):
+        self.done = True
+        self.reward = reward
+
+
+class _EnvGroup:
+    """
+    Environments stepped together, writing their observations and legal
+    masks in shared buffers. The decisions asked to the same opponent object
+    are gathered with ask_batch.
+    """
+
+    def __init__(self, envs: List[SantoriniEnv], observations, legal_masks):
+        self.envs = envs
+        self.observations = observations
+        self.legal_masks = legal_masks
+
+    def reset(self, seed: Optional[int] = None):
+        for env_nb, env in enumerate(self.envs):
+            env.start(None if seed is None else seed + env_nb)
+        self._play_opponents()
+        self._encode()
+
+    def step(self, actions: Sequence[int]) -> Tuple[List[float], List[bool]]:
+        for env, action in zip(self.envs, actions):
+            env.play_agent(action)
+        self._play_opponents()
+
+        rewards = [env.reward for env in self.envs]
+        dones = [env.done for env in self.envs]
+
+        # Start the finished games again
+        for env in self.envs:
+            if env.done:
+                env.start()
+        self._play_opponents()
+
+        self._encode()
+        return rewards, dones
+
+    def _play_opponents(self):
+        while True:
+            # Group the pending decisions by opponent and kind of decision
+            groups = {}
+            for env in self.envs:
+                request = env.opponent_request()
+                if request is not None:
+                    opponent, decision, args = request
+                    group = groups.setdefault((id(opponent), decision), [opponent])
+                    group.append((env, args))
+
+            if not groups:
+                return
+
+            for (_, decision), (opponent, *requests) in groups.items():
+                answers = ask_batch(opponent, decision, [args for _, args in requests])
+                for (env, _), answer in zip(requests, answers):
+                    env.answer_opponent(answer)
+
+    def _encode(self):
+        for env_nb, env in enumerate(self.envs):
+            encode_observation(
+                env.board,
+                env.agent_number,
+                self.observations,
+                env_nb * env.observation_size,
+            )
+            if env.done:
+                self.legal_masks[env_nb * NB_ACTIONS : (env_nb + 1) * NB_ACTIONS] = (
+                    bytes(NB_ACTIONS)
+                )
+            else:
+                encode_legal_mask(env.board, self.legal_masks, env_nb * NB_ACTIONS)
+
+
+def _make_envs(nb_envs, opponents, agent_number, share_opponents):
+    if share_opponents:
+        # The same opponent objects play in all the environments
+        template = SantoriniEnv(opponents, agent_number)
+        opponents = list(template.opponents.values())
+    return [SantoriniEnv(opponents, agent_number) for _ in range(nb_envs)]
+
+
+def _worker(connection, names, first_env, nb_envs, opponents, agent_number):
+    """
+    Steps a group of environments in a subprocess, see VecEnv.
+    """
+    observations_memory = SharedMemory(names[0])
+    legal_masks_memory = SharedMemory(names[1])
+    try:
+        envs = _make_envs(nb_envs, opponents, agent_number, True)
+        size = envs[0].observation_size
+        observations = observations_memory.buf[
+            first_env * size : (first_env + nb_envs) * size
+        ]
+        legal_masks = legal_masks_memory.buf[
+            first_env * NB_ACTIONS : (first_env + nb_envs) * NB_ACTIONS
+        ]
+        group = _EnvGroup(envs, observations, legal_masks)
+
+        while True:
+            command, argument = connection.recv()
+            if command == "reset":
+                group.reset(argument)
+                connection.send(None)
+            elif command == "step":
+                connection.send(group.step(argument))
+            else:
+                break
+
+        del group
+        observations.release()
+        legal_masks.release()
+    finally:
+        observations_memory.close()
+        legal_masks_memory.close()
+        connection.close()
+
+
+class VecEnv:
+    """
+    Several SantoriniEnv stepped together, with the same opponents.
+
+    The observations and legal masks of all the environments are written in
+    two buffers, one after the other. A finished game is started again in
+    the same step, the returned observation is then the one of the new game.
+
+    Modes:
+        SEQUENTIAL: The environments are stepped one after the other, each
+            with its own opponent objects.
+        BATCHED: The same opponent objects play in all the environments, the
+            decisions of a BatchedPlayer are asked in a single call.
+        SUBPROCESS: The environments are split among worker processes, each
+            stepping its environments as in BATCHED mode and writing in
+            shared memory buffers.
+
+    Attributes:
+        nb_envs (int): The number of environments.
+        observation_size (int): The number of bytes of an observation.
+        observations: The buffer of nb_envs * observation_size bytes.
+        legal_masks: The buffer of nb_envs * NB_ACTIONS bytes.
+    """
+
+    def __init__(
+        self,
+        nb_envs: int,
+        opponents: Sequence[type],
+        agent_number: int = 1,
+        mode: str = SEQUENTIAL,
+        nb_workers: int = 2,
+    ):
+        """
+        Args:
+            nb_envs (int): The number of environments.
+            opponents (list): The Player class of each opponent, in player
+                number order.
+            agent_number (int): The player number of the agent.
+            mode (str): SEQUENTIAL, BATCHED or SUBPROCESS.
+            nb_workers (int): The number of processes in SUBPROCESS mode.
+        """
+        if mode not in (SEQUENTIAL, BATCHED, SUBPROCESS):
+            raise ValueError(f"Unknown mode '{mode}'")
+
+        self.nb_envs = nb_envs
+        self.mode = mode
+        self.observation_size = observation_size(len(opponents) + 1)
+        self.group = None
+        self.workers = []
+
+        if mode != SUBPROCESS:
+            self.observations = bytearray(nb_envs * self.observation_size)
+            self.legal_masks = bytearray(nb_envs * NB_ACTIONS)
+            envs = _make_envs(nb_envs, opponents, agent_number, mode == BATCHED)
+            self.group = _EnvGroup(envs, self.observations, self.legal_masks)
+            return
+
+        self._observations_memory = SharedMemory(
+            create=True, size=nb_envs * self.observation_size
+        )
+        self._legal_masks_memory = SharedMemory(create=True, size=nb_envs * NB_ACTIONS)
+        self.observations = self._observations_memory.buf[
+            : nb_envs * self.observation_size
+        ]
+        self.legal_masks = self._legal_masks_memory.buf[: nb_envs * NB_ACTIONS]
+
+        names = (self._observations_memory.name, self._legal_masks_memory.name)
+        nb_workers = min(nb_workers, nb_envs)
+        for worker_nb in range(nb_workers):
+            first_env = nb_envs * worker_nb // nb_workers
+            last_env = nb_envs * (worker_nb + 1) // nb_workers
+            connection, worker_connection = Pipe()
+            process = Process(
+                target=_worker,
+                args=(
+                    worker_connection,
+                    names,
+                    first_env,
+                    last_env - first_env,
+                    list(opponents),
+                    agent_number,
+                ),
+                daemon=True,
+            )
+            process.start()
+            worker_connection.close()
+            self.workers.append((connection, process, first_env, last_env))
+
+    def reset(self, seed: Optional[int] = None):
+        """
+        Starts new games in all the environments.
+
+        Args:
+            seed (int): The environment i seeds the random module with seed + i.
+
+        Returns:
+            The observations and legal masks buffers.
+        """
+        if self.group is not None:
+            self.group.reset(seed)
+        else:
+            for connection, _, first_env, _ in self.workers:
+                connection.send(("reset", None if seed is None else seed + first_env))
+            for connection, *_ in self.workers:
+                connection.recv()
+
+        return self.observations, self.legal_masks
+
+    def step(self, actions: Sequence[int]):
+        """
+        Plays an action of the agent in each environment.
+
+        Args:
+            actions (list): The action of each environment.
+
+        Returns:
+            The observations buffer, the list of rewards, the list of done
+            flags and the legal masks buffer.
+        """
+        if len(actions) != self.nb_envs:
+            raise ValueError(f"{len(actions)} actions for {self.nb_envs} environments")
+
+        if self.group is not None:
+            rewards, dones = self.group.step(actions)
+        else:
+            for connection, _, first_env, last_env in self.workers:
+                connection.send(("step", list(actions[first_env:last_env])))
+            rewards, dones = [], []
+            for connection, *_ in self.workers:
+                worker_rewards, worker_dones = connection.recv()
+                rewards += worker_rewards
+                dones += worker_dones
+
+        return self.observations, rewards, dones, self.legal_masks
+
+    def close(self):
+        """
+        Stops the workers and frees the shared memory. The buffers can't be
+        used any more.
+        """
+        if not self.workers:
+            return
+
+        for connection, process, *_ in self.workers:
+            try:
+                connection.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+            process.join(timeout=5)
+            if process.is_alive():
+                process.kill()
+            connection.close()
+        self.workers = []
+
+        self.observations.release()
+        self.legal_masks.release()
+        for memory in (self._observations_memory, self._legal_masks_memory):
+            memory.close()
+            memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
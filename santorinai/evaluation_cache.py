@@ -0,0 +1,159 @@
+from collections import OrderedDict
+from typing import Any, Callable
+
+from santorinai.board import Board
+
+# How long the evaluations are kept by an EvaluationCache
+MOVE = "move"  # Cleared by start_move, at the beginning of each play_move
+# Cleared by start_game, called by Player.new_game, so only for the players of
+# the drivers playing one game at a time, see Player.new_game
+GAME = "game"
+RUN = "run"  # Kept as long as the player, across all the games of a match
+
+
+class EvaluationCache:
+    """
+    A bounded cache of position evaluations for players, keyed by
+    Board.position_key. When it is full, the least recently used evaluation
+    is evicted.
+
+    Usage in a player:
+
+        def __init__(self, player_number, log_level=0):
+            super().__init__(player_number, log_level)
+            self.cache = EvaluationCache(capacity=100000, persistence=RUN)
+
+        def new_game(self):
+            self.cache.start_game()
+
+        def evaluate(self, board):
+            return self.cache.get_or_compute(board, self.slow_evaluation)
+
+    Attributes:
+        capacity (int): The maximum number of evaluations kept.
+        persistence (str): MOVE, GAME or RUN.
+        hits (int): The number of evaluations found in the cache.
+        misses (int): The number of evaluations not found in the cache.
+        evictions (int): The number of evaluations evicted to make room.
+    """
+
+    def __init__(self, capacity: int = 65536, persistence: str = GAME):
+        if capacity <= 0:
+            raise ValueError("The capacity should be positive")
+        if persistence not in (MOVE, GAME, RUN):
+            raise ValueError(f"Unknown persistence '{persistence}'")
+
+        self.capacity = capacity
+        self.persistence = persistence
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._evaluations = OrderedDict()
+
+    def get(self, board: Board, default=None) -> Any:
+        """
+        Gets the evaluation of a position.
+
+        Args:
+            board (Board): The position.
+            default: The value returned if the position is not in the cache.
+
+        Returns:
+            The evaluation of the position, or default.
+        """
+        key = board.position_key()
+        try:
+            evaluation = self._evaluations[key]
+        except KeyError:
+            self.misses += 1
+            return default
+
+        self._evaluations.move_to_end(key)
+        self.hits += 1
+        return evaluation
+
+    def put(self, board: Board, evaluation: Any):
+        """
+        Stores the evaluation of a position, evicting the least recently used
+        evaluation if the cache is full.
+
+        Args:
+            board (Board): The position.
+            evaluation: Its evaluation.
+        """
+        key = board.position_key()
+        self._evaluations[key] = evaluation
+        self._evaluations.move_to_end(key)
+
+        if len(self._evaluations) > self.capacity:
+            self._evaluations.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_compute(self, board: Board, evaluate: Callable[[Board], Any]) -> Any:
+        """
+        Gets the evaluation of a position, computing and storing it if the
+        position is not in the cache.
+
+        Args:
+            board (Board): The position.
+            evaluate (callable): Computes the evaluation of a board.
+
+        Returns:
+            The evaluation of the position.
+        """
+        key = board.position_key()
+        try:
+            evaluation = self._evaluations[key]
+        except KeyError:
+            self.misses += 1
+            evaluation = evaluate(board)
+            self.put(board, evaluation)
+            return evaluation
+
+        self._evaluations.move_to_end(key)
+        self.hits += 1
+        return evaluation
+
+    def start_move(self):
+        """
+        To call at the beginning of play_move, clears a MOVE cache.
+        """
+        if self.persistence == MOVE:
+            self._evaluations.clear()
+
+    def start_game(self):
+        """
+        To call in Player.new_game, clears a MOVE or GAME cache.
+        """
+        if self.persistence != RUN:
+            self._evaluations.clear()
+
+    def clear(self):
+        """
+        Removes all the evaluations and resets the counters.
+        """
+        self._evaluations.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        The proportion of the lookups found in the cache.
+        """
+        nb_lookups = self.hits + self.misses
+        return self.hits / nb_lookups if nb_lookups else 0.0
+
+    def __len__(self) -> int:
+        return len(self._evaluations)
+
+    def __contains__(self, board: Board) -> bool:
+        return board.position_key() in self._evaluations
+
+    def __repr__(self) -> str:
+        return (
+            f"EvaluationCache({len(self)}/{self.capacity} evaluations,"
+            f" {self.hits} hits, {self.misses} misses, {self.evictions} evictions,"
+            f" hit rate {self.hit_rate:.1%})"
+        )
@@ -0,0 +1,326 @@
+import argparse
+import random
+import time
+from importlib import import_module
+from multiprocessing import Pool
+from typing import List, Optional, Sequence, Tuple
+
+from santorinai.perft import legal_actions
+
+# Differential fuzzing of Board backends: the same random games are played on
+# several backends in lockstep, and their legal moves, answers and positions
+# are compared at every ply. The first backend is the reference.
+#
+# The plies are mostly legal, with some random invalid inputs to compare the
+# refusal reasons too. A divergence is shrunk to the shortest list of plies
+# still reproducing it, which can be replayed with replay().
+
+MAX_PLIES = 500
+
+
+class Divergence:
+    """
+    Plies making backends disagree.
+
+    Attributes:
+        nb_players (int): The number of players of the game.
+        plies (list): The plies played from the empty board, see legal_actions.
+        description (str): What differs after the last ply.
+        seed (int): The seed of the game the divergence was found in.
+    """
+
+    def __init__(self, nb_players: int, plies: List[Tuple], description: str, seed):
+        self.nb_players = nb_players
+        self.plies = plies
+        self.description = description
+        self.seed = seed
+
+    def __repr__(self) -> str:
+        return (
+            f"Divergence of game {self.seed} ({self.nb_players} players)"
+            f" after {len(self.plies)} plies: {self.description}\n"
+            f"Plies: {self.plies}"
+        )
+
+
+def load_backend(backend_spec: str):
+    """
+    Imports a Board backend.
+
+    Args:
+        backend_spec (str): The class, as "package.module:ClassName".
+
+    Returns:
+        type: The board class.
+    """
+    module_name, _, class_name = backend_spec.partition(":")
+    if not class_name:
+        raise ValueError(f"Invalid backend '{backend_spec}', use 'module:ClassName'")
+    return getattr(import_module(module_name), class_name)
+
+
+def random_invalid_ply(rng: random.Random, placement: bool) -> Tuple:
+    """
+    Draws a ply with random, mostly invalid, inputs.
+    """
+
+    def position():
+        return rng.choice(
+            [(rng.randrange(-1, 6), rng.randrange(-1, 6)), None, (1, 2, 3), "x"]
+        )
+
+    if placement:
+        return (position(),)
+    return rng.choice([1, 2, 3, 0, "1"]), position(), position()
+
+
+def play_ply(board, ply: Tuple):
+    """
+    Plays a ply on a board, the exceptions are returned as results.
+
+    Returns:
+        The result of place_pawn or play_move, or the name of the exception.
+    """
+    try:
+        if len(ply) == 1:
+            return board.place_pawn(ply[0])
+        return board.play_move(*ply)
+    except Exception as error:
+        return f"raised {type(error).__name__}"
+
+
+def observe(board):
+    """
+    The observable state of a board compared between the backends.
+    """
+    return {
+        "levels": [list(column) for column in board.board],
+        "pawns": [tuple(pawn.pos) for pawn in board.pawns],
+        "player_turn": board.player_turn,
+        "turn_number": board.turn_number,
+        "winner": board.winner_player_number,
+        "game_over": board.is_game_over(),
+        "legal_plies": set(legal_actions(board)),
+    }
+
+
+def _compare(boards, results=None) -> Optional[str]:
+    """
+    Describes the first difference between the reference and the other
+    backends, None if they agree.
+    """
+    if results is not None:
+        for backend_nb, result in enumerate(results[1:], 1):
+            if result != results[0]:
+                return f"backend {backend_nb} answered {result}, not {results[0]}"
+
+    reference = observe(boards[0])
+    for backend_nb, board in enumerate(boards[1:], 1):
+        state = observe(board)
+        for name, value in reference.items():
+            if state[name] != value:
+                if name == "legal_plies":
+                    return (
+                        f"backend {backend_nb} legal plies differ,"
+                        f" missing: {sorted(map(repr, value - state[name]))},"
+                        f" extra: {sorted(map(repr, state[name] - value))}"
+                    )
+                return f"backend {backend_nb} {name} is {state[name]}, not {value}"
+    return None
+
+
+def play_game(
+    board_classes: Sequence[type], seed: int, invalid_rate: float = 0.05
+) -> Tuple[Optional[Divergence], int]:
+    """
+    Plays a random game on all the backends in lockstep.
+
+    Args:
+        board_classes (list): The backends, the first one is the reference.
+        seed (int): The seed of the game.
+        invalid_rate (float): The probability of a random invalid ply.
+
+    Returns:
+        Divergence: The first divergence, not shrunk, None if none was found.
+        int: The number of played plies.
+    """
+    rng = random.Random(seed)
+    nb_players = rng.choice([2, 2, 3])
+    boards = [board_class(nb_players) for board_class in board_classes]
+
+    plies = []
+    difference = _compare(boards)
+    while difference is None and not boards[0].is_game_over():
+        if len(plies) >= MAX_PLIES:
+            break
+
+        legal_plies = legal_actions(boards[0])
+        if not legal_plies or rng.random() < invalid_rate:
+            placement = boards[0].get_first_unplaced_player_pawn(boards[0].player_turn)
+            ply = random_invalid_ply(rng, placement is not None)
+        else:
+            ply = rng.choice(legal_plies)
+
+        plies.append(ply)
+        difference = _compare(boards, [play_ply(board, ply) for board in boards])
+
+    if difference is None:
+        return None, len(plies)
+    return Divergence(nb_players, plies, difference, seed), len(plies)
+
+
+def replay(
+    board_classes: Sequence[type], nb_players: int, plies: List[Tuple]
+) -> Optional[Divergence]:
+    """
+    Plays given plies on all the backends in lockstep.
+
+    Returns:
+        Divergence: The first divergence, with the plies up to it, None if
+        the backends agree on all the plies.
+    """
+    boards = [board_class(nb_players) for board_class in board_classes]
+
+    difference = _compare(boards)
+    for ply_nb, ply in enumerate(plies):
+        if difference is not None:
+            break
+        difference = _compare(boards, [play_ply(board, ply) for board in boards])
+        if difference is not None:
+            plies = plies[: ply_nb + 1]
+
+    if difference is None:
+        return None
+    return Divergence(nb_players, list(plies), difference, "replay")
+
+
+def shrink(board_classes: Sequence[type], divergence: Divergence) -> Divergence:
+    """
+    Removes the plies which are not needed to reproduce a divergence, by
+    rounds then one by one, until no ply can be removed.
+
+    Returns:
+        Divergence: The shortest divergence found.
+    """
+    best = replay(board_classes, divergence.nb_players, divergence.plies)
+    if best is None:
+        return divergence
+
+    removed = True
+    while removed:
+        removed = False
+        # Removing whole rounds keeps the plies of each player in turn
+        for chunk_size in (best.nb_players, 1):
+            # Try from the last plies, the removed plies are not tried again
+            start = len(best.plies) - chunk_size
+            while start >= 0:
+                plies = best.plies[:start] + best.plies[start + chunk_size :]
+                candidate = replay(board_classes, best.nb_players, plies)
+                if candidate is not None:
+                    best = candidate
+                    removed = True
+                start = min(start, len(best.plies) - chunk_size + 1) - 1
+
+    best.seed = divergence.seed
+    return best
+
+
+def _fuzz_seeds(args):
+    """
+    Plays the games of some seeds, runs in the worker processes.
+
+    Returns:
+        list: The shrunk divergences.
+        int: The number of played plies.
+    """
+    board_classes, seeds, invalid_rate = args
+    divergences = []
+    nb_plies = 0
+    for seed in seeds:
+        divergence, game_plies = play_game(board_classes, seed, invalid_rate)
+        nb_plies += game_plies
+        if divergence is not None:
+            divergences.append(shrink(board_classes, divergence))
+    return divergences, nb_plies
+
+
+def fuzz(
+    board_classes: Sequence[type],
+    nb_games: int = 1000,
+    first_seed: int = 0,
+    processes: Optional[int] = None,
+    invalid_rate: float = 0.05,
+    games_per_task: int = 50,
+) -> Tuple[List[Divergence], int]:
+    """
+    Plays random games on Board backends in lockstep, in parallel.
+
+    Args:
+        board_classes (list): The backends, the first one is the reference.
+            They are sent to the worker processes, so they must be importable.
+        nb_games (int): The number of games to play.
+        first_seed (int): The seed of the first game, the next ones follow.
+        processes (int): The number of worker processes, defaults to the
+            number of cores. With 1, the games are played in this process.
+        invalid_rate (float): The probability of a random invalid ply.
+        games_per_task (int): The number of games sent at once to a worker.
+
+    Returns:
+        list: The shrunk divergences, by seed.
+        int: The number of played plies.
+    """
+    seeds = range(first_seed, first_seed + nb_games)
+    tasks = [
+        (list(board_classes), seeds[start : start + games_per_task], invalid_rate)
+        for start in range(0, nb_games, games_per_task)
+    ]
+
+    if processes == 1:
+        results = map(_fuzz_seeds, tasks)
+        return _gather(results)
+
+    with Pool(processes) as pool:
+        return _gather(pool.imap_unordered(_fuzz_seeds, tasks))
+
+
+def _gather(results) -> Tuple[List[Divergence], int]:
+    divergences = []
+    nb_plies = 0
+    for task_divergences, task_plies in results:
+        divergences += task_divergences
+        nb_plies += task_plies
+    return sorted(divergences, key=lambda divergence: divergence.seed), nb_plies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Board backends")
+    parser.add_argument(
+        "backends", nargs="+", help="module:ClassName, the first one is the reference"
+    )
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--invalid-rate", type=float, default=0.05)
+    args = parser.parse_args()
+
+    if len(args.backends) < 2:
+        parser.error("At least two backends are needed")
+
+    board_classes = [load_backend(spec) for spec in args.backends]
+
+    start = time.perf_counter()
+    divergences, nb_plies = fuzz(
+        board_classes, args.games, args.seed, args.processes, args.invalid_rate
+    )
+    elapsed = time.perf_counter() - start
+
+    for divergence in divergences:
+        print(divergence)
+    print(
+        f"{args.games} games, {nb_plies} plies in {elapsed:.1f}s:"
+        f" {len(divergences)} divergences"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from santorinai.board import Board
+from santorinai.reasons import Reason
+
+if TYPE_CHECKING:
+    from santorinai.board_displayer.board_displayer import BoardRenderer
+
+# Events of the games played by a Tester, sent to its observers.
+#
+# The events are only created when at least one observer listens, so that a
+# silent run does no formatting at all. The boards they carry are the ones
+# of the referee: observers must not modify them, and must copy them to keep
+# them after the call.
+
+
+class GameStart:
+    __slots__ = ("game_number", "player_names", "board")
+
+    def __init__(self, game_number: int, player_names: List[str], board: Board):
+        self.game_number = game_number
+        self.player_names = player_names
+        self.board = board
+
+
+class Placement:
+    __slots__ = (
+        "game_number",
+        "player_name",
+        "pawn_number",
+        "position",
+        "success",
+        "reason",
+        "board",
+    )
+
+    def __init__(
+        self,
+        game_number: int,
+        player_name: str,
+        pawn_number: int,
+        position: Tuple[int, int],
+        success: bool,
+        reason: Reason,
+        board: Board,
+    ):
+        # Number of the game in the match, several games can run at once
+        self.game_number = game_number
+        self.player_name = player_name
+        self.pawn_number = pawn_number  # Number of the pawn, from 1 to 6
+        self.position = position
+        self.success = success
+        self.reason = reason
+        self.board = board
+
+
+class Move:
+    __slots__ = (
+        "game_number",
+        "player_name",
+        "pawn_order",
+        "move_position",
+        "build_position",
+        "success",
+        "reason",
+        "board",
+    )
+
+    def __init__(
+        self,
+        game_number: int,
+        player_name: str,
+        pawn_order: int,
+        move_position: Tuple[int, int],
+        build_position: Tuple[int, int],
+        success: bool,
+        reason: Reason,
+        board: Board,
+    ):
+        self.game_number = game_number
+        self.player_name = player_name
+        self.pawn_order = pawn_order  # Order of the pawn for its player, 1 or 2
+        self.move_position = move_position
+        self.build_position = build_position
+        self.success = success
+        self.reason = reason
+        self.board = board
+
+
+class GameEnd:
+    __slots__ = (
+        "game_number",
+        "player_names",
+        "winner_idx",
+        "reason",
+        "forfeit",
+        "board",
+        "think_times",
+        "seed",
+    )
+
+    def __init__(
+        self,
+        game_number: int,
+        player_names: List[str],
+        winner_idx: Optional[int],
+        reason: Reason,
+        forfeit: bool,
+        board: Board,
+        think_times: Optional[List[float]] = None,
+        seed: Optional[str] = None,
+    ):
+        self.game_number = game_number
+        self.player_names = player_names
+        self.winner_idx = winner_idx  # None if nobody won
+        self.reason = reason
+        self.forfeit = forfeit  # True if the other player failed
+        self.board = board
+        # Seconds taken by each player, None if the games are not timed
+        self.think_times = think_times
+        self.seed = seed  # Seed of the random module for the game, if any
+
+    @property
+    def winner_name(self) -> Optional[str]:
+        if self.winner_idx is None:
+            return None
+        return self.player_names[self.winner_idx]
+
+    @property
+    def nb_plies(self) -> int:
+        """
+        The number of placements and moves played.
+        """
+        return self.board.turn_number - 1
+
+
+class Checkpoint:
+    __slots__ = ("path", "player_names", "nb_played_games")
+
+    def __init__(self, path: str, player_names: List[str], nb_played_games: int):
+        # Sent before the checkpoint file is written: the observers keeping the
+        # games should write the ones it counts, so that a resumed match
+        # finds them
+        self.path = path
+        self.player_names = player_names
+        self.nb_played_games = nb_played_games
+
+
+class MatchEnd:
+    __slots__ = ("player_names", "nb_victories", "nb_played_games", "sprt")
+
+    def __init__(
+        self,
+        player_names: List[str],
+        nb_victories: Dict[str, int],
+        nb_played_games: int,
+        sprt=None,
+    ):
+        self.player_names = player_names
+        self.nb_victories = nb_victories
+        self.nb_played_games = nb_played_games
+        self.sprt = sprt  # The sequential test of the match, if any
+
+
+class Observer:
+    """
+    Receives the events of the games played by a Tester.
+    Subscribe it with Tester.subscribe and override the events to follow.
+    """
+
+    def on_game_start(self, event: GameStart):
+        pass
+
+    def on_placement(self, event: Placement):
+        pass
+
+    def on_move(self, event: Move):
+        pass
+
+    def on_game_end(self, event: GameEnd):
+        pass
+
+    def on_checkpoint(self, event: Checkpoint):
+        pass
+
+    def on_match_end(self, event: MatchEnd):
+        pass
+
+
+class ConsoleLogger(Observer):
+    """
+    Prints the games, attached by the Tester when its verbose_level is above 0.
+
+    Attributes:
+        verbose_level (int): 1: Each game results, 2: Each move summary
+    """
+
+    def __init__(self, verbose_level: int = 1):
+        self.verbose_level = verbose_level
+
+    def display_message(self, message, verbose_level=1):
+        if self.verbose_level >= verbose_level:
+            print(message)
+
+    def on_game_start(self, event: GameStart):
+        self.display_message(f"Game {event.game_number}", 1)
+
+    def on_placement(self, event: Placement):
+        self.display_message(
+            f"Player '{event.player_name}' is placing pawn {event.pawn_number}", 2
+        )
+        if not event.success:
+            self.display_message(
+                f"   Pawn placed at an invalid position: {event.reason}", 1
+            )
+            self.display_message(f"   Player '{event.player_name}' loses")
+            return
+
+        self.display_message(f"   Pawn placed at position {event.position}", 2)
+        if event.board.pawns[-1].pos[0] is not None:
+            self.display_message("\nPlaying the game")
+
+    def on_move(self, event: Move):
+        self.display_message(f"Player '{event.player_name}' is moving a pawn", 2)
+        if not event.success:
+            self.display_message(
+                f"   Pawn moved at an invalid position: {event.reason}", 1
+            )
+            self.display_message(f"   Player '{event.player_name}' loses")
+            return
+
+        self.display_message(
+            f"   Pawn moved at position {event.move_position}\
+                  and built at position {event.build_position}",
+            2,
+        )
+        self.display_message(event.board, 2)
+
+    def on_game_end(self, event: GameEnd):
+        if event.winner_idx is None:
+            self.display_message("Draw")
+        elif not event.forfeit:
+            self.display_message(f"Player '{event.winner_name}' wins!")
+
+    def on_match_end(self, event: MatchEnd):
+        if event.sprt is not None and event.sprt.is_decided():
+            self.display_message(f"SPRT decided after {event.nb_played_games} games")
+
+        self.display_message("\nResults:")
+        for name in event.player_names:
+            nb_victories = event.nb_victories[name]
+            # No game may have been played if the match was interrupted
+            percentage = 0
+            if event.nb_played_games > 0:
+                percentage = round(nb_victories / event.nb_played_games * 100, 2)
+            self.display_message(
+                f"Player {name} won {nb_victories}"
+                f" time{'s' if nb_victories != 1 else ''} ({percentage}%)"
+            )
+
+        if event.sprt is not None:
+            self.display_message(event.sprt)
+
+
+class BoardWindowObserver(Observer):
+    """
+    Displays the board in a window after each placement and move, attached
+    by the Tester when display_board is True.
+
+    The board is drawn by a BoardRenderer at a bounded frame rate, so the
+    games are slowed down only by delay_between_moves, during which the
+    window stays responsive.
+
+    Attributes:
+        renderer (BoardRenderer): The renderer of the window.
+        delay_between_moves (float): The time to wait after each update.
+    """
+
+    def __init__(self, renderer: "BoardRenderer", delay_between_moves: float = 0.0):
+        self.renderer = renderer
+        self.delay_between_moves = delay_between_moves
+
+    def on_game_start(self, event: GameStart):
+        self._update(event.board)
+
+    def on_placement(self, event: Placement):
+        if event.success:
+            self._update(event.board)
+
+    def on_move(self, event: Move):
+        if event.success:
+            self._update(event.board)
+
+    def _update(self, board: Board):
+        self.renderer.submit(board)
+        if self.delay_between_moves > 0:
+            self.renderer.wait(self.delay_between_moves)
@@ -1,7 +1,37 @@
 from typing import Tuple
 
+# Positions are stored as packed cell indexes: cell = x * BOARD_SIZE + y
+BOARD_SIZE = 5
+NB_CELLS = BOARD_SIZE * BOARD_SIZE
+UNPLACED = NB_CELLS  # Cell index of a pawn that has not been placed yet
+
+# Position (x, y) of each cell index, (None, None) for an unplaced pawn
+CELL_POSITIONS = [(x, y) for x in range(BOARD_SIZE) for y in range(BOARD_SIZE)]
+CELL_POSITIONS.append((None, None))
+
+
+def position_to_cell(position: Tuple[int, int]) -> int:
+    """
+    Packs a position into a cell index
+    :param position: a position (x, y) on the board, or (None, None)
+    :return: the cell index of the position, UNPLACED for (None, None)
+    """
+    x, y = position
+    if x is None and y is None:
+        return UNPLACED
+    if (
+        not isinstance(x, int)
+        or not isinstance(y, int)
+        or not 0 <= x < BOARD_SIZE
+        or not 0 <= y < BOARD_SIZE
+    ):
+        raise ValueError(f"The position {position} is not on the board")
+    return x * BOARD_SIZE + y
+
 
 class Pawn:
+    __slots__ = ("number", "order", "player_number", "cell")
+
     def __init__(self, number: int, order: int, player_number: int):
         """
         Initialize a pawn
@@ -24,22 +54,36 @@ class Pawn:
         self.number = number  # 1 to 6 depending on the number of pawns
         self.order = order  # 1 or 2
         self.player_number = player_number  # 1, 2 or 3 depending on players number
-        self.pos = (None, None)
+        self.cell = UNPLACED  # Packed position, see position_to_cell
+
+    @property
+    def pos(self) -> Tuple[int, int]:
+        """
+        The position (x, y) of the pawn, (None, None) if it is not placed yet
+        """
+        return CELL_POSITIONS[self.cell]
+
+    @pos.setter
+    def pos(self, new_pos: Tuple[int, int]):
+        self.cell = position_to_cell(new_pos)
 
     def move(self, new_pos: Tuple[int, int]):
         """
         Move the pawn to the new position
         :param new_pos: the new position of the pawn
         """
-        self.pos = new_pos
+        self.cell = position_to_cell(new_pos)
 
     def copy(self) -> "Pawn":
         """
         Return a copy of the pawn
         :return: a copy of the pawn
         """
-        new_pawn = Pawn(self.number, self.order, self.player_number)
-        new_pawn.pos = self.pos
+        new_pawn = Pawn.__new__(Pawn)
+        new_pawn.number = self.number
+        new_pawn.order = self.order
+        new_pawn.player_number = self.player_number
+        new_pawn.cell = self.cell
         return new_pawn
 
     def __repr__(self):
@@ -0,0 +1,192 @@
+import argparse
+import time
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from santorinai.board import Board
+
+# Performance test of the move generation, as done for chess engines: count
+# the positions reached after a given number of plies. The counts only depend
+# on the rules, so any Board backend must give the same numbers, and the time
+# taken gives the number of generated positions per second.
+#
+# A ply is a pawn placement during the placement phase, then a move and a
+# build. A game won before the requested depth is not expanded further and
+# its position is not counted, like a mate in chess perft.
+#
+# Only the public methods of Board are used, so that the counts can be checked
+# against any object with the same interface as Board.
+
+# Known counts of the opening positions, by depth
+KNOWN_PERFT = {
+    "empty board, 2 players": {1: 25, 2: 600, 3: 13800, 4: 303600},
+    "empty board, 3 players": {1: 25, 2: 600, 3: 13800, 4: 303600},
+    "corners, 2 players": {1: 36, 2: 1296, 3: 70232, 4: 3705946},
+    "centre cross, 2 players": {1: 68, 2: 5156, 3: 350208, 4: 24545388},
+}
+
+
+def opening_board(name: str, board_class=Board) -> Board:
+    """
+    Creates one of the opening positions of KNOWN_PERFT.
+
+    Args:
+        name (str): The name of the position.
+        board_class (type): The Board backend to use.
+
+    Returns:
+        Board: The position, the next ply is the one of player 1.
+    """
+    positions = {
+        "empty board, 2 players": (2, []),
+        "empty board, 3 players": (3, []),
+        "corners, 2 players": (2, [(0, 0), (4, 4), (0, 4), (4, 0)]),
+        "centre cross, 2 players": (2, [(2, 1), (1, 2), (2, 3), (3, 2)]),
+    }
+    nb_players, pawn_positions = positions[name]
+
+    board = board_class(nb_players)
+    for position in pawn_positions:
+        board.place_pawn(position)
+    return board
+
+
+def legal_actions(board: Board) -> List[Tuple]:
+    """
+    Lists the plies of the playing player.
+
+    Returns:
+        list: (position,) for a placement, or (pawn order, move_position,
+        build_position) for a move.
+    """
+    pawn = board.get_first_unplaced_player_pawn(board.player_turn)
+    if pawn is not None:
+        return [(position,) for position in board.get_possible_movement_positions(pawn)]
+
+    actions = []
+    for pawn in board.get_player_pawns(board.player_turn):
+        for move, build in board.get_possible_movement_and_building_positions(pawn):
+            actions.append((pawn.order, move, build))
+    return actions
+
+
+def play_action(board: Board, action: Tuple) -> Board:
+    """
+    Plays a ply of legal_actions on a copy of the board.
+
+    Returns:
+        Board: The new position.
+    """
+    child = board.copy()
+    if len(action) == 1:
+        success, reason = child.place_pawn(action[0])
+    else:
+        success, reason = child.play_move(*action)
+
+    if not success:
+        raise ValueError(f"The legal action {action} was refused: {reason}")
+    return child
+
+
+def position_key(board: Board) -> Hashable:
+    """
+    The part of a position the following plies depend on.
+    """
+    return (
+        tuple(tuple(column) for column in board.board),
+        tuple(tuple(pawn.pos) for pawn in board.pawns),
+        board.player_turn,
+    )
+
+
+def perft(board: Board, depth: int, table: Optional[Dict] = None) -> int:
+    """
+    Counts the positions reached after depth plies.
+
+    Args:
+        board (Board): The position to start from, it is not modified.
+        depth (int): The number of plies.
+        table (dict): If given, the counts of the visited positions are
+            stored in it and reused when a position is reached again by
+            another order of plies.
+
+    Returns:
+        int: The number of positions.
+    """
+    if depth == 0:
+        return 1
+    if board.is_game_over():
+        return 0
+
+    if table is not None:
+        key = (position_key(board), depth)
+        if key in table:
+            return table[key]
+
+    actions = legal_actions(board)
+    if depth == 1:
+        # The leaves don't need to be played
+        count = len(actions)
+    else:
+        count = 0
+        for action in actions:
+            count += perft(play_action(board, action), depth - 1, table)
+
+    if table is not None:
+        table[key] = count
+    return count
+
+
+def divide(board: Board, depth: int, table: Optional[Dict] = None) -> Dict:
+    """
+    Counts the positions reached after depth plies, for each first ply.
+    Comparing the divides of two backends points to the first diverging ply.
+
+    Args:
+        board (Board): The position to start from, it is not modified.
+        depth (int): The number of plies, at least 1.
+        table (dict): See perft.
+
+    Returns:
+        dict: The number of positions for each ply of legal_actions.
+    """
+    if depth < 1:
+        raise ValueError("The depth of a divide should be at least 1")
+
+    return {
+        action: perft(play_action(board, action), depth - 1, table)
+        for action in legal_actions(board)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perft of the opening positions")
+    parser.add_argument("depth", type=int, help="the number of plies")
+    parser.add_argument(
+        "--position", default="centre cross, 2 players", choices=sorted(KNOWN_PERFT)
+    )
+    parser.add_argument("--divide", action="store_true", help="count per first ply")
+    parser.add_argument("--hash", action="store_true", help="reuse repeated positions")
+    args = parser.parse_args()
+
+    board = opening_board(args.position)
+    table = {} if args.hash else None
+
+    start = time.perf_counter()
+    if args.divide:
+        counts = divide(board, args.depth, table)
+        for action, count in counts.items():
+            print(f"{action}: {count}")
+        total = sum(counts.values())
+    else:
+        total = perft(board, args.depth, table)
+    elapsed = time.perf_counter() - start
+
+    print(f"\nPositions: {total}")
+    print(f"Time: {elapsed:.2f}s ({total / elapsed:.0f} positions/s)")
+    expected = KNOWN_PERFT[args.position].get(args.depth)
+    if expected is not None and expected != total:
+        print(f"Mismatch: expected {expected} positions")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@ from abc import abstractmethod
 
 from santorinai.board import Board
 from santorinai.pawn import Pawn
-from typing import Tuple
+from typing import Dict, List, Optional, Tuple
 
 
 class Player:
@@ -10,6 +10,10 @@ class Player:
     A player of Santorini, has a name and can play a move given a board
     """
 
+    # If True, a Tester with trusted_referee plays the moves of this player
+    # without validating them: only for players known to answer legal moves
+    trusted = False
+
     def __init__(self, player_number: int, log_level=0) -> None:
         self.log_level = log_level
         self.player_number = player_number
@@ -49,3 +53,83 @@ class Player:
         pawn at center of the board and build a tower one tile above
         """
         pass
+
+    def new_game(self):
+        """
+        Called by the tester before each game, to reset what the player keeps
+        between the moves of a game
+
+        Only the drivers playing one game at a time with the player call it:
+        play_1v1, play_1v1_parallel and play_1v1_cached (in each worker) and the
+        self-play pipeline. play_1v1_batched and AsyncTester share the player
+        between several running games and never call it, a player relying on
+        it should not be used with them
+        """
+        pass
+
+    def search_statistics(self) -> Optional[Dict]:
+        """
+        The statistics of the search behind the last decision, recorded by
+        the self-play pipeline as training targets
+        :return: a dict mapping the considered answers, in the format of
+            place_pawn or play_move, to non-negative weights (visit counts,
+            win rates...), or None if the player does not search
+        """
+        return None
+
+
+class AsyncPlayer(Player):
+    """
+    A player whose decisions are coroutines, for players waiting on I/O
+    (remote services, inference servers...). Played by AsyncTester.
+    """
+
+    @abstractmethod
+    async def place_pawn(self, board: Board, pawn: Pawn) -> Tuple[int, int]:
+        """
+        Place a pawn given a board, see Player.place_pawn
+        """
+        pass
+
+    @abstractmethod
+    async def play_move(
+        self, board: Board
+    ) -> Tuple[int, Tuple[int, int], Tuple[int, int]]:
+        """
+        Choose a pawn and play a move given a board, see Player.play_move
+        """
+        pass
+
+
+class BatchedPlayer(Player):
+    """
+    A player taking the decisions of many games at once, for players whose
+    evaluation is much faster in batches (neural networks...).
+    Tester.play_1v1_batched gathers the pending decisions of the games it
+    plays in lockstep into a single call.
+    """
+
+    @abstractmethod
+    def play_moves(
+        self, boards: List[Board]
+    ) -> List[Tuple[int, Tuple[int, int], Tuple[int, int]]]:
+        """
+        Choose a pawn and play a move for each of the given boards
+        :param boards: the boards of the games waiting for a move
+        :return: a list with one move per board, see Player.play_move
+        """
+        pass
+
+    def place_pawns(
+        self, boards: List[Board], pawns: List[Pawn]
+    ) -> List[Tuple[int, int]]:
+        """
+        Place a pawn for each of the given boards
+        :param boards: the boards of the games waiting for a placement
+        :param pawns: the pawn to place on each board
+        :return: a list with one position per board, see Player.place_pawn
+        """
+        return [self.place_pawn(board, pawn) for board, pawn in zip(boards, pawns)]
+
+    def play_move(self, board: Board) -> Tuple[int, Tuple[int, int], Tuple[int, int]]:
+        return self.play_moves([board])[0]
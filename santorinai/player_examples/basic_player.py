@@ -40,9 +40,8 @@ class BasicPlayer(Player):
         return pawns
 
     def get_winning_moves(self, board: Board, pawn):
-        available_positions = board.get_possible_movement_positions(pawn)
         winning_moves = []
-        for pos in available_positions:
+        for pos in board.iter_moves(pawn):
             if board.board[pos[0]][pos[1]] == 3:
                 winning_moves.append(pos)
 
@@ -103,9 +102,12 @@ class BasicPlayer(Player):
                     best_spot_level = pos_level
 
             # Check if we can prevent the opponent from winning
-            enemy_pawns = self.get_enemy_pawns(board, pawn)
-            for enemy_pawn in enemy_pawns:
-                winning_moves = self.get_winning_moves(board, enemy_pawn)
+            enemy_player_numbers = {
+                enemy_pawn.player_number
+                for enemy_pawn in self.get_enemy_pawns(board, pawn)
+            }
+            for enemy_player_number in sorted(enemy_player_numbers):
+                winning_moves = sorted(board.winning_threats(enemy_player_number))
                 for winning_move in winning_moves:
                     for available_pos in available_positions:
                         if board.is_position_adjacent(winning_move, available_pos):
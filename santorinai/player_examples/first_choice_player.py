@@ -15,8 +15,8 @@ class FirstChoicePlayer(Player):
         return "Firsty First"
 
     def place_pawn(self, board: Board, pawn: Pawn):
-        available_positions = board.get_possible_movement_positions(pawn)
-        my_choice = available_positions[0]
+        # Stop at the first available position
+        my_choice = next(board.iter_moves(pawn))
         return my_choice
 
     def play_move(self, board: Board):
@@ -24,24 +24,14 @@ class FirstChoicePlayer(Player):
         l_pawns = board.get_player_pawns(self.player_number)
         pawn = l_pawns[0]
 
-        # Get movement positions
-        available_move_positions = board.get_possible_movement_positions(pawn)
-        if len(available_move_positions) == 0:
+        # Get the first movement position and the first construction position
+        # from there, without listing the other ones
+        first_move_and_build = next(board.iter_move_builds(pawn), None)
+        if first_move_and_build is None:
             # The pawn cannot move
             return pawn.order, None, None
 
-        my_move_choice = available_move_positions[0]
-
-        # Simulate the move (Need to use pawn copy since returned pawn will be moved)
-        pawn.move(my_move_choice)
-
-        # Get construction positions
-        available_build_positions = board.get_possible_building_positions(pawn)
-        if len(available_build_positions) == 0:
-            # The pawn cannot build
-            raise Exception("Pawn cannot build")
-
-        # Their is always at least one position available
-        my_build_choice = available_build_positions[0]
+        # Their is always at least one position available to build
+        my_move_choice, my_build_choice = first_move_and_build
 
         return pawn.order, my_move_choice, my_build_choice
@@ -1,4 +1,5 @@
 from santorinai import Player, Board, Pawn
+import random
 from random import choice
 
 
@@ -19,15 +20,9 @@ class RandomPlayer(Player):
         return my_choice
 
     def play_move(self, board: Board):
-        # List all possible moves
-        all_possible_pawns_moves = []
-        for pawn in board.get_player_pawns(self.player_number):
-            pawn_moves = board.get_possible_movement_and_building_positions(pawn)
-            # Add the pawn number to the possible moves
-            all_possible_pawns_moves += [
-                (pawn.order, move, build) for move, build in pawn_moves
-            ]
-
-        my_move_choice = choice(all_possible_pawns_moves)
+        # Draw one of all the possible moves, without listing them
+        my_move_choice = board.sample_random_action(random)
+        if my_move_choice is None:
+            return 1, None, None
 
         return my_move_choice
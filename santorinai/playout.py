@@ -0,0 +1,59 @@
+import random
+from typing import Optional
+
+from santorinai.board import Board
+from santorinai.pawn import BOARD_SIZE
+
+# Random games played to the end, as used by Monte-Carlo players to evaluate
+# a position. The moves are drawn with Board.sample_random_action and applied
+# without validation on a scratch copy of the board.
+
+
+def fast_playout(board: Board, rng=random) -> Optional[int]:
+    """
+    Plays uniformly random legal actions from a position until the game ends.
+
+    The rules are the ones of Board.place_pawn and Board.play_move: a pawn
+    reaching the third level wins, and a player wins when the next player
+    can't move any more. The given board is not modified.
+
+    Args:
+        board (Board): The position to play from.
+        rng: The random generator, random.Random or the random module.
+
+    Returns:
+        int: The number of the winning player.
+    """
+    if board.winner_player_number is not None:
+        return board.winner_player_number
+
+    board = board.copy()
+    cells = board.cells
+
+    while True:
+        action = board.sample_random_action(rng)
+        player_number = board.player_turn
+
+        if action is None:
+            # Only possible from the given position: the playing player is
+            # stuck, the previous player blocked it
+            return (player_number - 2) % board.nb_players + 1
+
+        order, (move_x, move_y), build = action
+        pawn = board.get_player_pawn(player_number, order)
+        pawn.cell = move_x * BOARD_SIZE + move_y
+
+        if build is None:
+            # Placement of the pawn
+            board.next_turn()
+            continue
+
+        if cells[pawn.cell] == 3:
+            return player_number
+
+        cells[build[0] * BOARD_SIZE + build[1]] += 1
+        board.next_turn()
+
+        # A player wins when the next player is stuck
+        if not board.has_any_move(board.player_turn):
+            return player_number
@@ -0,0 +1,303 @@
+from math import log, sqrt
+from typing import Dict, List, Optional, Tuple
+
+# Bradley-Terry ratings of players from accumulated game results
+# Ratings are expressed on the Elo scale and refined incrementally from the
+# previous estimate each time new results are added.
+
+ELO_PER_NATURAL_UNIT = 400 / log(10)
+
+
+class RatingTable:
+    """
+    Bradley-Terry ratings, on the Elo scale, of players from their game results.
+
+    Each player is also given prior_games virtual draws against a virtual player
+    rated 0, which keeps the ratings finite when a player won or lost all its
+    games and anchors the scale.
+
+    Attributes:
+        prior_games (float): The number of virtual draws of each player.
+        z (float): The normal quantile used for the confidence intervals.
+        tolerance (float): The largest Elo change accepted as convergence.
+    """
+
+    def __init__(self, prior_games: float = 2.0, z: float = 1.96, tolerance=0.01):
+        if prior_games <= 0:
+            raise ValueError("prior_games should be positive")
+
+        self.prior_games = prior_games
+        self.z = z
+        self.tolerance = tolerance
+
+        # Strength of each player, its Elo rating is 400 * log10(strength)
+        self.strengths: Dict[str, float] = {}
+        # Score (wins + half draws) of each player
+        self.scores: Dict[str, float] = {}
+        # Number of games played between each pair of players
+        self.nb_games: Dict[str, Dict[str, float]] = {}
+
+        self._converged = True
+
+    def add_player(self, name: str):
+        """
+        Adds a player to the table, rated 0 until it plays.
+
+        Args:
+            name (str): The name of the player.
+        """
+        if name in self.strengths:
+            return
+        self.strengths[name] = 1.0
+        self.scores[name] = 0.0
+        self.nb_games[name] = {}
+
+    def add_result(self, winner: str, loser: str, count: float = 1):
+        """
+        Registers games won by a player against another one.
+
+        Args:
+            winner (str): The name of the winning player.
+            loser (str): The name of the losing player.
+            count (float): The number of such games.
+        """
+        self._add_games(winner, loser, count)
+        self.scores[winner] += count
+        self._refine_players(winner, loser)
+
+    def add_draw(self, player1: str, player2: str, count: float = 1):
+        """
+        Registers games without winner between two players.
+
+        Args:
+            player1 (str): The name of the first player.
+            player2 (str): The name of the second player.
+            count (float): The number of such games.
+        """
+        self._add_games(player1, player2, count)
+        self.scores[player1] += count / 2
+        self.scores[player2] += count / 2
+        self._refine_players(player1, player2)
+
+    def add_match(self, nb_victories: Dict[str, int], nb_games: Optional[int] = None):
+        """
+        Registers the results returned by Tester.play_1v1.
+
+        Args:
+            nb_victories (dict): The number of victories of each of the two players.
+            nb_games (int): The number of played games, the games without
+                victory are counted as draws. Defaults to the number of victories.
+        """
+        (name1, wins1), (name2, wins2) = nb_victories.items()
+        if wins1:
+            self.add_result(name1, name2, wins1)
+        if wins2:
+            self.add_result(name2, name1, wins2)
+
+        nb_draws = 0 if nb_games is None else nb_games - wins1 - wins2
+        if nb_draws > 0:
+            self.add_draw(name1, name2, nb_draws)
+
+        # Make sure both players are known even if no game was counted
+        self.add_player(name1)
+        self.add_player(name2)
+
+    def rating(self, name: str) -> float:
+        """
+        Gets the Elo rating of a player.
+
+        Args:
+            name (str): The name of the player.
+
+        Returns:
+            float: The rating of the player.
+        """
+        self.refine()
+        return ELO_PER_NATURAL_UNIT * log(self.strengths[name])
+
+    def standard_error(self, name: str) -> float:
+        """
+        Gets the standard error of the Elo rating of a player.
+
+        Args:
+            name (str): The name of the player.
+
+        Returns:
+            float: The standard error of the rating.
+        """
+        self.refine()
+        return ELO_PER_NATURAL_UNIT / sqrt(self._information(name))
+
+    def interval(self, name: str) -> Tuple[float, float]:
+        """
+        Gets the confidence interval of the Elo rating of a player.
+
+        Args:
+            name (str): The name of the player.
+
+        Returns:
+            tuple: The lower and upper bounds of the rating.
+        """
+        rating = self.rating(name)
+        margin = self.z * self.standard_error(name)
+        return rating - margin, rating + margin
+
+    def expected_score(self, player1: str, player2: str) -> float:
+        """
+        Gets the expected score of player1 against player2.
+
+        Returns:
+            float: The probability that player1 wins, between 0 and 1.
+        """
+        self.refine()
+        strength1 = self.strengths[player1]
+        return strength1 / (strength1 + self.strengths[player2])
+
+    def ratings(self) -> List[Tuple[str, float, float, float]]:
+        """
+        Gets the ratings of all the players, best first.
+
+        Returns:
+            list: (name, rating, lower bound, upper bound) for each player.
+        """
+        table = []
+        for name in self.strengths:
+            low, high = self.interval(name)
+            table.append((name, self.rating(name), low, high))
+
+        return sorted(table, key=lambda row: row[1], reverse=True)
+
+    def refine(self, max_iterations: int = 1000):
+        """
+        Iterates the minorization-maximization updates from the current
+        ratings until they stop changing.
+
+        Args:
+            max_iterations (int): The maximum number of passes over all players.
+        """
+        if self._converged:
+            return
+
+        for _ in range(max_iterations):
+            largest_change = 0
+            for name in self.strengths:
+                largest_change = max(largest_change, self._update_player(name))
+            if largest_change < self.tolerance:
+                break
+
+        self._converged = True
+
+    def __repr__(self) -> str:
+        output = ""
+        for name, rating, low, high in self.ratings():
+            output += f"{name}: {rating:.0f} [{low:.0f}, {high:.0f}]\n"
+        return output
+
+    def _add_games(self, player1: str, player2: str, count: float):
+        if player1 == player2:
+            raise ValueError("A player can't play against itself")
+        if count <= 0:
+            raise ValueError("The number of games should be positive")
+
+        self.add_player(player1)
+        self.add_player(player2)
+        self.nb_games[player1][player2] = self.nb_games[player1].get(player2, 0) + count
+        self.nb_games[player2][player1] = self.nb_games[player2].get(player1, 0) + count
+
+    def _refine_players(self, player1: str, player2: str):
+        """
+        Updates the two players of a new result, the other players are only
+        updated on the next query, starting from their current ratings.
+        """
+        self._update_player(player1)
+        self._update_player(player2)
+        self._converged = False
+
+    def _update_player(self, name: str) -> float:
+        """
+        Applies the minorization-maximization update to a player.
+
+        Returns:
+            float: The absolute change of the Elo rating of the player.
+        """
+        strength = self.strengths[name]
+
+        # The virtual draws against the player of strength 1
+        score = self.scores[name] + self.prior_games / 2
+        denominator = self.prior_games / (strength + 1)
+
+        for opponent, nb_games in self.nb_games[name].items():
+            denominator += nb_games / (strength + self.strengths[opponent])
+
+        new_strength = score / denominator
+        self.strengths[name] = new_strength
+
+        return ELO_PER_NATURAL_UNIT * abs(log(new_strength / strength))
+
+    def _information(self, name: str) -> float:
+        """
+        The Fisher information of the natural log strength of a player.
+        """
+        strength = self.strengths[name]
+        p = strength / (strength + 1)
+        information = self.prior_games * p * (1 - p)
+
+        for opponent, nb_games in self.nb_games[name].items():
+            p = strength / (strength + self.strengths[opponent])
+            information += nb_games * p * (1 - p)
+
+        return information
+
+
+class MatchScheduler:
+    """
+    Chooses the next pairing to play so that games are spent where the
+    ratings are the most uncertain.
+
+    The value of a pairing is the expected reduction of the variance of the
+    ratings of both players if one more game is played between them.
+    """
+
+    def __init__(self, table: RatingTable, players: List[str]):
+        if len(players) < 2:
+            raise ValueError("The scheduler needs at least two players")
+
+        self.table = table
+        self.players = list(players)
+        for name in self.players:
+            self.table.add_player(name)
+
+    def pairing_value(self, player1: str, player2: str) -> float:
+        """
+        Gets the expected variance reduction of one more game between two players.
+
+        Returns:
+            float: The sum of the variance reductions, in squared Elo.
+        """
+        p = self.table.expected_score(player1, player2)
+        game_information = p * (1 - p)
+
+        value = 0
+        for name in (player1, player2):
+            information = self.table._information(name)
+            value += 1 / information - 1 / (information + game_information)
+
+        return value * ELO_PER_NATURAL_UNIT**2
+
+    def next_pairing(self) -> Tuple[str, str]:
+        """
+        Gets the most informative pairing.
+
+        Returns:
+            tuple: The names of the two players of the pairing.
+        """
+        best_pairing = None
+        best_value = -1
+        for i, player1 in enumerate(self.players):
+            for player2 in self.players[i + 1 :]:
+                value = self.pairing_value(player1, player2)
+                if value > best_value:
+                    best_value = value
+                    best_pairing = (player1, player2)
+
+        return best_pairing
@@ -0,0 +1,79 @@
+from enum import Enum
+from typing import Union
+
+# The reasons returned by the board with the result of each placement and
+# move, and by the Tester with the result of each game.
+#
+# The members are created once: checking a move allocates no string, and the
+# statistics of the games are counted by member. A member is a str equal to
+# its message, so it can be compared to, printed and saved as the message.
+# Its name is a short code, which does not change with the message.
+
+
+class Reason(str, Enum):
+    # Placements
+    PAWN_PLACED = "The pawn was placed."
+    ALL_PAWNS_PLACED = "All the pawns have already been placed."
+    POSITION_OCCUPIED = "The position is already occupied by another pawn."
+
+    # Moves
+    MOVE_PLAYED = "The move was played."
+    INVALID_PAWN_TYPE = "The pawn number is not an integer."
+    INVALID_PAWN_NUMBER = "The pawn number is invalid (must be 1 or 2)."
+    PAWNS_NOT_PLACED = "All the pawns have not been placed yet."
+    PAWN_STUCK = "The selected pawn is stuck."
+    MOVE_POSSIBLE = "The move is possible."
+    MOVE_FROM_OUTSIDE = "It is not possible to move from outside the board."
+    MOVE_OUTSIDE = "It is not possible to move outside the board."
+    MOVE_SAME_POSITION = "It is not possible to move to the same position."
+    MOVE_ON_TERMINATED = "It is not possible to move on a terminated tower."
+    MOVE_TOO_HIGH = "It is not possible to move two levels in one move."
+    MOVE_TOO_FAR = "It is not possible to move that far."
+    MOVE_ON_PAWN = "It is not possible to move on another pawn."
+    BUILD_POSSIBLE = "The build is possible."
+    BUILD_FROM_OUTSIDE = "It is not possible to build from outside the board."
+    BUILD_OUTSIDE = "It is not possible to build outside the board."
+    BUILD_ON_SELF = "It is not possible to build where you are standing."
+    BUILD_ON_TERMINATED = "It is not possible to build on a terminated tower."
+    BUILD_TOO_FAR = "It is not possible to build that far."
+    BUILD_ON_PAWN = "It is not possible to build on another pawn."
+
+    # Positions
+    POSITION_VALID = "The position is valid."
+    POSITION_NOT_TUPLE = "The position is not a tuple."
+    POSITION_NOT_COORDINATE = "The position is not a coordinate (x, y)."
+    POSITION_NOT_INTEGERS = "Not all the coordinates are integers."
+    POSITION_OUTSIDE = "The position is not within the board bounds."
+
+    # End of the game
+    GAME_OVER = "The game is over."
+    TOWER_TOP = "The player pawn reached the top of a tower."
+    EVERYONE_STUCK = "No one can play, the game is over."
+    NEXT_PLAYER_STUCK = "The next player is stuck, the game is over."
+
+    @property
+    def message(self) -> str:
+        return self.value
+
+    def __str__(self) -> str:
+        return self.value
+
+    def __format__(self, format_spec: str) -> str:
+        return format(self.value, format_spec)
+
+
+def reason_code(reason: Union[Reason, str]) -> str:
+    """
+    Gets the code of a reason, to store it: the name of a Reason, or the
+    reason itself if it is not one (reasons of other backends).
+    """
+    if isinstance(reason, Reason):
+        return reason.name
+    return reason
+
+
+def reason_from_code(code: str) -> Union[Reason, str]:
+    """
+    Gets back a reason from its code, see reason_code.
+    """
+    return Reason.__members__.get(code, code)
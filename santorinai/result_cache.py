@@ -0,0 +1,224 @@
+import hashlib
+import inspect
+import json
+import sqlite3
+from functools import lru_cache
+from importlib import import_module
+from typing import Dict, List, Sequence, Tuple
+
+from santorinai.reasons import reason_code, reason_from_code
+
+# Outcomes of seeded games kept in a local SQLite database, so that a match
+# is not played again while nothing that decides its games has changed.
+#
+# A match is addressed by a hash of what decides its games: the source of
+# the modules of each player class and of its base classes, the constructor
+# arguments of the players, the source of the rules, the referee settings
+# and the seed. Its games are seeded from the seed and their number, so the
+# cached games of a match are the first games of any longer match with the
+# same key: only the games after them are played, see
+# Tester.play_1v1_cached.
+
+# Modules whose source decides the result of a game, besides the players:
+# the rules, the referee and the seeding of the games (worker_pool.play_chunk)
+RULES_MODULES = (
+    "santorinai.board",
+    "santorinai.pawn",
+    "santorinai.reasons",
+    "santorinai.tester",
+    "santorinai.worker_pool",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    key TEXT PRIMARY KEY,
+    description TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS games (
+    key TEXT NOT NULL,
+    game_number INTEGER NOT NULL,
+    winner INTEGER,
+    reason TEXT, -- Name of the Reason
+    forfeit INTEGER NOT NULL,
+    board BLOB NOT NULL, -- Final board, see Board.to_bytes
+    think_time1 REAL,
+    think_time2 REAL,
+    PRIMARY KEY (key, game_number)
+) WITHOUT ROWID;
+"""
+
+
+def _module_source_hash(module_name: str, digest):
+    module = import_module(module_name)
+    try:
+        source_file = inspect.getsourcefile(module)
+        with open(source_file, "rb") as file:
+            digest.update(file.read())
+    except (TypeError, OSError):
+        raise ValueError(
+            f"The source of {module_name} is not available, its games can't be cached"
+        ) from None
+
+
+@lru_cache(maxsize=None)
+def rules_version() -> str:
+    """
+    Gets a hash of the source of the rules, see RULES_MODULES.
+    """
+    digest = hashlib.sha256()
+    for module_name in RULES_MODULES:
+        _module_source_hash(module_name, digest)
+    return digest.hexdigest()
+
+
+def player_source_hash(player_class: type) -> str:
+    """
+    Gets a hash of the source of the modules of a player class and of its
+    base classes.
+    """
+    digest = hashlib.sha256(player_class.__qualname__.encode())
+    module_names = []
+    for cls in player_class.__mro__:
+        if cls is not object and cls.__module__ not in module_names:
+            module_names.append(cls.__module__)
+    for module_name in module_names:
+        _module_source_hash(module_name, digest)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    The outcomes of seeded games, addressed by what decides them, see the top
+    of this module.
+
+    Usage:
+
+        with ResultCache("results_cache.db") as cache:
+            tester.seed = 0
+            tester.play_1v1_cached(cache, MyPlayer, RandomPlayer, nb_games=1000)
+
+    Attributes:
+        path (str): The database file, ":memory:" for a temporary cache.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(SCHEMA)
+
+    def match_key(
+        self,
+        specs: Sequence[Tuple[type, Dict]],
+        seed,
+        settings: Dict,
+    ) -> str:
+        """
+        Gets the key of a match.
+
+        Args:
+            specs (list): The (Player class, constructor arguments) of each
+                player, in playing order.
+            seed: The seed of the games, see Tester.seed.
+            settings (dict): The referee settings of the Tester.
+
+        Returns:
+            str: The key, a hexadecimal hash.
+        """
+        description = {
+            "players": [
+                {
+                    "class": f"{player_class.__module__}.{player_class.__qualname__}",
+                    "source": player_source_hash(player_class),
+                    "config": kwargs,
+                }
+                for player_class, kwargs in specs
+            ],
+            "rules": rules_version(),
+            "settings": settings,
+            "seed": repr(seed),
+        }
+        text = json.dumps(description, sort_keys=True, default=repr)
+        key = hashlib.sha256(text.encode()).hexdigest()
+
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO matches VALUES (?, ?)", (key, text)
+            )
+        return key
+
+    def games(self, key: str, nb_games: int) -> List[Tuple]:
+        """
+        Gets the cached games of a match, from the first one to the first
+        missing one.
+
+        Args:
+            key (str): The key of the match.
+            nb_games (int): The maximum number of games.
+
+        Returns:
+            list: For each game, the tuple yielded by WorkerPool.play_games.
+        """
+        games = []
+        for row in self._connection.execute(
+            "SELECT * FROM games WHERE key = ? AND game_number <= ?"
+            " ORDER BY game_number",
+            (key, nb_games),
+        ):
+            _, game_number, winner, code, forfeit, board, time1, time2 = row
+            if game_number != len(games) + 1:
+                break
+            think_times = None if time1 is None else [time1, time2]
+            games.append(
+                (
+                    game_number,
+                    winner,
+                    reason_from_code(code),
+                    bool(forfeit),
+                    board,
+                    think_times,
+                )
+            )
+        return games
+
+    def add_games(self, key: str, games: Sequence[Tuple]):
+        """
+        Adds played games to a match, in one transaction.
+
+        Args:
+            key (str): The key of the match.
+            games (list): The tuples yielded by WorkerPool.play_games, recorded.
+        """
+        rows = []
+        for game_number, winner, reason, forfeit, board, think_times in games:
+            rows.append(
+                (
+                    key,
+                    game_number,
+                    winner,
+                    None if reason is None else reason_code(reason),
+                    forfeit,
+                    board,
+                    *(think_times or (None, None)),
+                )
+            )
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO games VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def nb_games(self, key: str) -> int:
+        """
+        Gets the number of cached games of a match.
+        """
+        return self._connection.execute(
+            "SELECT COUNT(*) FROM games WHERE key = ?", (key,)
+        ).fetchone()[0]
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
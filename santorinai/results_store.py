@@ -0,0 +1,383 @@
+import sqlite3
+import time
+from typing import Dict, List, Optional, Tuple
+
+from santorinai.observers import Checkpoint, GameEnd, MatchEnd, Observer
+from santorinai.rating import RatingTable
+from santorinai.reasons import reason_code, reason_from_code
+
+# Results of the games played by a Tester, kept in a local SQLite database.
+#
+# Each finished game is a row of the games table. The rows are buffered and
+# written in batches, each batch in a single transaction which also adds its
+# games to the pairings table: the totals of each run and ordered pairing of
+# players, kept up to date so that the tables of results and the ratings are
+# read without scanning the games.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    run TEXT NOT NULL,
+    player1 TEXT NOT NULL,
+    player2 TEXT NOT NULL,
+    game_number INTEGER NOT NULL,
+    seed TEXT,
+    winner INTEGER,
+    reason TEXT NOT NULL, -- Name of the Reason
+    forfeit INTEGER NOT NULL,
+    plies INTEGER NOT NULL,
+    think_time1 REAL,
+    think_time2 REAL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_pairing ON games (run, player1, player2);
+CREATE TABLE IF NOT EXISTS pairings (
+    run TEXT NOT NULL,
+    player1 TEXT NOT NULL,
+    player2 TEXT NOT NULL,
+    nb_games INTEGER NOT NULL,
+    wins1 INTEGER NOT NULL,
+    wins2 INTEGER NOT NULL,
+    plies INTEGER NOT NULL,
+    think_time1 REAL NOT NULL,
+    think_time2 REAL NOT NULL,
+    PRIMARY KEY (run, player1, player2)
+);
+"""
+
+INSERT_GAME = """
+INSERT INTO games (
+    run, player1, player2, game_number, seed, winner, reason, forfeit, plies,
+    think_time1, think_time2, created
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# The totals of a batch are added to the ones already stored
+UPDATE_PAIRING = """
+INSERT INTO pairings (
+    run, player1, player2, nb_games, wins1, wins2, plies, think_time1, think_time2
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (run, player1, player2) DO UPDATE SET
+    nb_games = nb_games + excluded.nb_games,
+    wins1 = wins1 + excluded.wins1,
+    wins2 = wins2 + excluded.wins2,
+    plies = plies + excluded.plies,
+    think_time1 = think_time1 + excluded.think_time1,
+    think_time2 = think_time2 + excluded.think_time2
+"""
+
+# The totals of all the runs
+PAIRINGS_OF_ALL_RUNS = """
+SELECT player1, player2, SUM(nb_games), SUM(wins1), SUM(wins2), SUM(plies),
+    SUM(think_time1), SUM(think_time2)
+FROM pairings GROUP BY player1, player2
+"""
+
+# The totals of a pairing computed again from its games
+RECOUNT_PAIRING = """
+INSERT INTO pairings
+SELECT run, player1, player2, COUNT(*), SUM(winner IS 0), SUM(winner IS 1),
+    SUM(plies), TOTAL(think_time1), TOTAL(think_time2)
+FROM games WHERE run = ? AND player1 = ? AND player2 = ?
+GROUP BY run, player1, player2
+"""
+
+PAIRING_COLUMNS = (
+    "player1, player2, nb_games, wins1, wins2, plies, think_time1, think_time2"
+)
+
+
+class PairingResults:
+    """
+    The totals of the games played between two players, player1 playing first.
+
+    Attributes:
+        player1 (str): The name of the first player.
+        player2 (str): The name of the second player.
+        nb_games (int): The number of games.
+        wins1 (int): The number of victories of player1.
+        wins2 (int): The number of victories of player2.
+        plies (int): The total number of placements and moves.
+        think_time1 (float): The total time taken by player1, in seconds.
+        think_time2 (float): The total time taken by player2, in seconds.
+    """
+
+    __slots__ = (
+        "player1",
+        "player2",
+        "nb_games",
+        "wins1",
+        "wins2",
+        "plies",
+        "think_time1",
+        "think_time2",
+    )
+
+    def __init__(
+        self,
+        player1: str,
+        player2: str,
+        nb_games: int,
+        wins1: int,
+        wins2: int,
+        plies: int,
+        think_time1: float,
+        think_time2: float,
+    ):
+        self.player1 = player1
+        self.player2 = player2
+        self.nb_games = nb_games
+        self.wins1 = wins1
+        self.wins2 = wins2
+        self.plies = plies
+        self.think_time1 = think_time1
+        self.think_time2 = think_time2
+
+    @property
+    def draws(self) -> int:
+        return self.nb_games - self.wins1 - self.wins2
+
+    @property
+    def nb_victories(self) -> Dict[str, int]:
+        """
+        The number of victories of each player, as returned by Tester.play_1v1.
+        """
+        return {self.player1: self.wins1, self.player2: self.wins2}
+
+
+class ResultsStore(Observer):
+    """
+    Stores the result of each game played by a Tester in a SQLite database.
+
+    Usage:
+
+        with ResultsStore("results.db", run="evaluation") as store:
+            tester.subscribe(store)
+            tester.play_1v1(player1, player2, nb_games=100)
+            print(store.rating_table().ratings())
+
+    The games are written when batch_size of them are waiting, before each
+    checkpoint of a match, at its end and when the store is closed. Games
+    played with several processes should be stored by the process running
+    the Tester.
+
+    Attributes:
+        path (str): The database file, ":memory:" for a temporary database.
+        run (str): The label of the games stored, to tell runs apart, "" by
+            default.
+        batch_size (int): The number of games written per transaction.
+    """
+
+    def __init__(self, path: str, run: str = "", batch_size: int = 100):
+        if batch_size <= 0:
+            raise ValueError("The batch size should be positive")
+        self.path = path
+        self.run = run
+        self.batch_size = batch_size
+        self._pending = []
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(SCHEMA)
+
+    # Observer
+
+    def on_game_end(self, event: GameEnd):
+        if len(event.player_names) != 2:
+            raise ValueError("Only the games between two players can be stored")
+
+        think_times = event.think_times or (None, None)
+        self._pending.append(
+            (
+                self.run,
+                *event.player_names,
+                event.game_number,
+                event.seed,
+                event.winner_idx,
+                reason_code(event.reason),
+                event.forfeit,
+                event.nb_plies,
+                *think_times,
+                time.time(),
+            )
+        )
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def on_checkpoint(self, event: Checkpoint):
+        # The games counted by the checkpoint are kept if the process dies
+        self.flush()
+
+    def on_match_end(self, event: MatchEnd):
+        self.flush()
+
+    # Writing
+
+    def flush(self):
+        """
+        Writes the waiting games and updates the pairings, in one transaction.
+        """
+        if not self._pending:
+            return
+
+        pairings = {}
+        for game in self._pending:
+            run, player1, player2, _, _, winner, _, _, plies, time1, time2, _ = game
+            totals = pairings.setdefault(
+                (run, player1, player2), [0, 0, 0, 0, 0.0, 0.0]
+            )
+            totals[0] += 1
+            totals[1] += winner == 0
+            totals[2] += winner == 1
+            totals[3] += plies
+            totals[4] += time1 or 0.0
+            totals[5] += time2 or 0.0
+
+        with self._connection:
+            self._connection.executemany(INSERT_GAME, self._pending)
+            self._connection.executemany(
+                UPDATE_PAIRING,
+                [(*pairing, *totals) for pairing, totals in pairings.items()],
+            )
+        self._pending = []
+
+    def truncate_pairing(self, player1: str, player2: str, nb_kept_games: int = 0):
+        """
+        Deletes the games of player1 against player2 of the run after the
+        first nb_kept_games ones, for instance the games played after the last
+        checkpoint of an interrupted match, which are played again when it is
+        resumed.
+
+        Raises:
+            ValueError: If some of the first nb_kept_games games are missing,
+                nothing is deleted then.
+        """
+        self.flush()
+        pairing = (self.run, player1, player2)
+        nb_stored_games = self._connection.execute(
+            "SELECT COUNT(DISTINCT game_number) FROM games"
+            " WHERE run = ? AND player1 = ? AND player2 = ?"
+            " AND game_number BETWEEN 1 AND ?",
+            (*pairing, nb_kept_games),
+        ).fetchone()[0]
+        if nb_stored_games < nb_kept_games:
+            raise ValueError(
+                f"Only {nb_stored_games} of the first {nb_kept_games} games of"
+                f" {player1} against {player2} are stored"
+            )
+        with self._connection:
+            self._connection.execute(
+                "DELETE FROM games WHERE run = ? AND player1 = ? AND player2 = ?"
+                " AND game_number > ?",
+                (*pairing, nb_kept_games),
+            )
+            self._connection.execute(
+                "DELETE FROM pairings WHERE run = ? AND player1 = ? AND player2 = ?",
+                pairing,
+            )
+            self._connection.execute(RECOUNT_PAIRING, pairing)
+
+    def close(self):
+        """
+        Writes the waiting games and closes the database.
+        """
+        self.flush()
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    # Queries
+
+    def pairings(self, run: Optional[str] = None) -> List[PairingResults]:
+        """
+        Gets the totals of each pairing of players.
+
+        Args:
+            run (str): If given, only the games of this run are counted, else
+                all the games of the database.
+
+        Returns:
+            list: The PairingResults, by names of players.
+        """
+        self.flush()
+        if run is None:
+            rows = self._connection.execute(
+                PAIRINGS_OF_ALL_RUNS + " ORDER BY player1, player2"
+            )
+        else:
+            rows = self._connection.execute(
+                f"SELECT {PAIRING_COLUMNS} FROM pairings WHERE run = ?"
+                " ORDER BY player1, player2",
+                (run,),
+            )
+        return [PairingResults(*row) for row in rows]
+
+    def pairing(
+        self, player1: str, player2: str, run: Optional[str] = None
+    ) -> PairingResults:
+        """
+        Gets the totals of the games of player1 against player2, player1
+        playing first.
+
+        Args:
+            run (str): If given, only the games of this run are counted.
+        """
+        self.flush()
+        if run is None:
+            row = self._connection.execute(
+                f"SELECT * FROM ({PAIRINGS_OF_ALL_RUNS})"
+                " WHERE player1 = ? AND player2 = ?",
+                (player1, player2),
+            ).fetchone()
+        else:
+            row = self._connection.execute(
+                f"SELECT {PAIRING_COLUMNS} FROM pairings"
+                " WHERE run = ? AND player1 = ? AND player2 = ?",
+                (run, player1, player2),
+            ).fetchone()
+        if row is None:
+            return PairingResults(player1, player2, 0, 0, 0, 0, 0.0, 0.0)
+        return PairingResults(*row)
+
+    def win_lose_types(
+        self, player1: str, player2: str, run: Optional[str] = None
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Counts the reasons of the games of player1 against player2, in the
+        format of the dic_win_lose_type of Tester.play_1v1: the reason of a
+        victory is counted for the winner, or for the loser if they failed.
+        """
+        self.flush()
+        query = (
+            "SELECT winner, forfeit, reason, COUNT(*) FROM games"
+            " WHERE player1 = ? AND player2 = ? AND winner IS NOT NULL"
+        )
+        parameters: Tuple = (player1, player2)
+        if run is not None:
+            query += " AND run = ?"
+            parameters += (run,)
+        query += " GROUP BY winner, forfeit, reason ORDER BY MIN(id)"
+
+        player_names = (player1, player2)
+        win_lose_types = {player1: {}, player2: {}}
+        for winner, forfeit, code, count in self._connection.execute(query, parameters):
+            player_name = player_names[1 - winner if forfeit else winner]
+            counts = win_lose_types[player_name]
+            reason = reason_from_code(code)
+            counts[reason] = counts.get(reason, 0) + count
+        return win_lose_types
+
+    def rating_table(self, run: Optional[str] = None, **kwargs) -> RatingTable:
+        """
+        Computes the ratings of the players from the stored games.
+
+        Args:
+            run (str): If given, only the games of this run are counted.
+            kwargs: The arguments of the RatingTable.
+        """
+        table = RatingTable(**kwargs)
+        for pairing in self.pairings(run):
+            table.add_match(pairing.nb_victories, pairing.nb_games)
+        return table
@@ -0,0 +1,385 @@
+import mmap
+import random
+import struct
+import time
+from multiprocessing import get_context
+from queue import Empty
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from santorinai.board import Board
+from santorinai.env import (
+    NB_ACTIONS,
+    encode_action,
+    encode_observation,
+    observation_size,
+)
+from santorinai.player import Player
+from santorinai.tester import Tester
+
+# Self-play data generation: games are played in worker processes, and every
+# position is recorded with the search statistics of the player to move and
+# the result of the game, in a ring buffer that trainers sample from.
+#
+# The ring buffer is a memory-mapped file:
+#   - a header of HEADER_SIZE bytes: magic, number of players, record size,
+#     capacity and number of records written since the creation,
+#   - capacity slots of a sequence number followed by a record:
+#     the observation planes of env.py, the policy as NB_ACTIONS float32 and
+#     the value of the position for the player to move as an int8.
+# There is a single writer. The sequence number of a slot is odd while the
+# slot is written, so readers in other processes retry torn reads (seqlock).
+# A slot left odd by a writer which died while writing it is reported after
+# read_timeout seconds instead of being retried forever.
+
+MAGIC = b"SANTRB01"
+HEADER = struct.Struct("<8sIIIQ")
+HEADER_SIZE = 64
+NB_WRITTEN_OFFSET = 20
+SEQUENCE = struct.Struct("<I")
+
+
+def record_struct(nb_players: int) -> struct.Struct:
+    """
+    The layout of a record: observation, policy and value.
+    """
+    return struct.Struct(f"<{observation_size(nb_players)}s{NB_ACTIONS}fb")
+
+
+class ReplayBuffer:
+    """
+    A fixed-capacity ring buffer of training positions in a memory-mapped
+    file, the oldest positions are overwritten when it is full.
+
+    It can be opened by several processes: one writer, any number of readers.
+
+    Attributes:
+        path (str): The file of the buffer.
+        nb_players (int): The number of players of the recorded games.
+        capacity (int): The maximum number of positions kept.
+        read_timeout (float): The maximum number of seconds to wait for a
+            slot being written.
+    """
+
+    read_timeout = 1.0
+
+    def __init__(self, path: str, capacity: Optional[int] = None, nb_players=2):
+        """
+        Args:
+            path (str): The file of the buffer.
+            capacity (int): If given, a new empty buffer is created, else the
+                existing file is opened.
+            nb_players (int): The number of players of a new buffer.
+        """
+        self.path = path
+
+        if capacity is not None:
+            if capacity <= 0:
+                raise ValueError("The capacity should be positive")
+            self.nb_players = nb_players
+            self.capacity = capacity
+            self._set_layout()
+            with open(path, "wb") as file:
+                file.truncate(HEADER_SIZE + capacity * self.slot_size)
+                file.write(
+                    HEADER.pack(MAGIC, nb_players, self.record.size, capacity, 0)
+                )
+
+        with open(path, "r+b") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0)
+
+        magic, self.nb_players, record_size, self.capacity, _ = HEADER.unpack_from(
+            self._mmap, 0
+        )
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a replay buffer")
+        self._set_layout()
+        if record_size != self.record.size:
+            self._mmap.close()
+            raise ValueError(f"{path} has records of {record_size} bytes")
+
+    def _set_layout(self):
+        self.record = record_struct(self.nb_players)
+        # Slots are aligned on 8 bytes
+        self.slot_size = (SEQUENCE.size + self.record.size + 7) // 8 * 8
+
+    @property
+    def nb_written(self) -> int:
+        """
+        The number of positions written since the creation of the buffer.
+        """
+        return struct.unpack_from("<Q", self._mmap, NB_WRITTEN_OFFSET)[0]
+
+    def __len__(self) -> int:
+        return min(self.nb_written, self.capacity)
+
+    def append(self, observation: bytes, policy: Sequence[float], value: int):
+        """
+        Writes a position, overwriting the oldest one if the buffer is full.
+
+        Args:
+            observation (bytes): The observation planes, see env.py.
+            policy (list): The NB_ACTIONS probabilities of the actions.
+            value (int): 1 if the player to move won, -1 if it lost, else 0.
+        """
+        self.append_packed(self.record.pack(bytes(observation), *policy, value))
+
+    def append_packed(self, packed_record: bytes):
+        """
+        Writes a position packed with record_struct.
+        """
+        nb_written = self.nb_written
+        offset = HEADER_SIZE + nb_written % self.capacity * self.slot_size
+        sequence = SEQUENCE.unpack_from(self._mmap, offset)[0]
+
+        SEQUENCE.pack_into(self._mmap, offset, sequence + 1)
+        start = offset + SEQUENCE.size
+        self._mmap[start : start + self.record.size] = packed_record
+        SEQUENCE.pack_into(self._mmap, offset, sequence + 2)
+
+        struct.pack_into("<Q", self._mmap, NB_WRITTEN_OFFSET, nb_written + 1)
+
+    def read(self, index: int) -> Tuple[bytes, Tuple[float, ...], int]:
+        """
+        Reads the position of a slot, retrying while it is being written.
+
+        Raises:
+            RuntimeError: If the slot is still being written after
+                read_timeout seconds, its writer probably died.
+
+        Args:
+            index (int): The slot, between 0 and len(self) - 1.
+
+        Returns:
+            bytes: The observation.
+            tuple: The policy.
+            int: The value.
+        """
+        if not 0 <= index < len(self):
+            raise IndexError(f"No position in the slot {index}")
+
+        offset = HEADER_SIZE + index * self.slot_size
+        start = offset + SEQUENCE.size
+        deadline = None
+        while True:
+            sequence = SEQUENCE.unpack_from(self._mmap, offset)[0]
+            if not sequence & 1:
+                data = self._mmap[start : start + self.record.size]
+                if SEQUENCE.unpack_from(self._mmap, offset)[0] == sequence:
+                    break
+
+            # Let the writer finish the slot
+            if deadline is None:
+                deadline = time.perf_counter() + self.read_timeout
+            elif time.perf_counter() > deadline:
+                raise RuntimeError(
+                    f"The slot {index} is still being written after"
+                    f" {self.read_timeout} seconds, its writer may have died"
+                )
+            time.sleep(0)
+
+        observation, *policy, value = self.record.unpack(data)
+        return observation, tuple(policy), value
+
+    def sample(self, batch_size: int, rng=random) -> List[Tuple]:
+        """
+        Draws positions uniformly, with replacement.
+
+        Args:
+            batch_size (int): The number of positions.
+            rng: The random generator, random.Random or the random module.
+
+        Returns:
+            list: (observation, policy, value) for each position.
+        """
+        nb_positions = len(self)
+        if nb_positions == 0:
+            raise ValueError("The replay buffer is empty")
+        return [self.read(int(rng.random() * nb_positions)) for _ in range(batch_size)]
+
+    def close(self):
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+def policy_target(board: Board, answer, statistics: Optional[Dict]) -> List[float]:
+    """
+    The probabilities of the actions to learn from a decision: the search
+    statistics of the player if it exposes them, else the played answer.
+
+    Args:
+        board (Board): The position of the decision.
+        answer: The answer of the player.
+        statistics (dict): See Player.search_statistics.
+
+    Returns:
+        list: NB_ACTIONS probabilities, all 0 if nothing could be encoded.
+    """
+    policy = [0.0] * NB_ACTIONS
+    weights = statistics.items() if statistics else [(answer, 1.0)]
+
+    for ply, weight in weights:
+        try:
+            policy[encode_action(board, ply)] += weight
+        except (KeyError, TypeError, ValueError, IndexError):
+            # Not a legal answer
+            continue
+
+    total = sum(policy)
+    if total > 0:
+        policy = [probability / total for probability in policy]
+    return policy
+
+
+class SelfPlayTester(Tester):
+    """
+    Plays games and records their positions as training data.
+    """
+
+    verbose_level = 0
+
+    def record_game(self, players: List[Player]) -> List[bytes]:
+        """
+        Plays a game and records each decision.
+
+        Args:
+            players (list): The players, in playing order.
+
+        Returns:
+            list: The positions, packed with record_struct.
+        """
+        record = record_struct(len(players))
+        positions = []
+
+        game = self._game_steps(players)
+        try:
+            player_idx, decision, args = next(game)
+            while True:
+                # The players may modify the board they are given
+                board = args[0].copy()
+                player = players[player_idx]
+                answer = getattr(player, decision)(*args)
+
+                positions.append(
+                    (
+                        player_idx,
+                        encode_observation(board, board.player_turn),
+                        policy_target(board, answer, player.search_statistics()),
+                    )
+                )
+                player_idx, decision, args = game.send(answer)
+        except StopIteration as game_over:
+            winner_idx = game_over.value[0]
+
+        packed_records = []
+        for player_idx, observation, policy in positions:
+            if winner_idx is None:
+                value = 0
+            else:
+                value = 1 if player_idx == winner_idx else -1
+            packed_records.append(record.pack(bytes(observation), *policy, value))
+        return packed_records
+
+
+def _make_players(players) -> List[Player]:
+    made_players = []
+    for number, player in enumerate(players, 1):
+        if isinstance(player, tuple):
+            player_class, kwargs = player
+        else:
+            player_class, kwargs = player, {}
+        made_players.append(player_class(number, **kwargs))
+    return made_players
+
+
+def _selfplay_worker(players, seeds, records_queue):
+    """
+    Plays the games of some seeds in a worker process. Putting the records in
+    the bounded queue blocks while the writer is behind.
+    """
+    players = _make_players(players)
+    tester = SelfPlayTester()
+    for seed in seeds:
+        random.seed(seed)
+        records_queue.put(tester.record_game(players))
+    records_queue.put(None)
+
+
+def generate(
+    buffer: ReplayBuffer,
+    players: Sequence,
+    nb_games: int,
+    nb_workers: int = 2,
+    first_seed: int = 0,
+    max_pending_games: int = 16,
+) -> int:
+    """
+    Plays self-play games in worker processes and writes their positions in
+    a replay buffer.
+
+    At most max_pending_games finished games wait to be written: the workers
+    are paused while the buffer writer is behind, so the memory used does not
+    grow with the number of games.
+
+    Args:
+        buffer (ReplayBuffer): The buffer to write to.
+        players (list): The Player class of each player, or
+            (Player class, constructor arguments) tuples.
+        nb_games (int): The number of games to play.
+        nb_workers (int): The number of worker processes.
+        first_seed (int): The random module is seeded with first_seed + game
+            number before each game.
+        max_pending_games (int): The size of the queue of finished games.
+
+    Returns:
+        int: The number of written positions.
+    """
+    if len(players) != buffer.nb_players:
+        raise ValueError(
+            f"{len(players)} players for a buffer of {buffer.nb_players} players"
+        )
+
+    context = get_context()
+    records_queue = context.Queue(max_pending_games)
+    seeds = range(first_seed, first_seed + nb_games)
+    processes = [
+        context.Process(
+            target=_selfplay_worker,
+            args=(list(players), seeds[worker_nb::nb_workers], records_queue),
+            daemon=True,
+        )
+        for worker_nb in range(min(nb_workers, nb_games))
+    ]
+    for process in processes:
+        process.start()
+
+    nb_positions = 0
+    nb_finished_workers = 0
+    try:
+        while nb_finished_workers < len(processes):
+            try:
+                packed_records = records_queue.get(timeout=1)
+            except Empty:
+                if any(process.exitcode not in (None, 0) for process in processes):
+                    raise RuntimeError("A self-play worker died")
+                continue
+
+            if packed_records is None:
+                nb_finished_workers += 1
+                continue
+
+            for packed_record in packed_records:
+                buffer.append_packed(packed_record)
+            nb_positions += len(packed_records)
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+
+    return nb_positions
@@ -0,0 +1,269 @@
+from multiprocessing import parent_process, resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Optional
+
+from santorinai.board import PAWN_IDENTITIES, Board
+from santorinai.pawn import BOARD_SIZE, NB_CELLS, Pawn
+
+# Boards shared between processes without serialization.
+#
+# A BoardSlotPool is a block of shared memory holding a fixed number of board
+# slots, as a struct-of-arrays: each field of the boards is an array over the
+# slots. The referee writes a board in a slot after each move, and sends the
+# slot number to the process that should play, which reads the board in
+# place through a SharedBoardView.
+#
+# Layout, for nb_slots slots:
+#   - the turn numbers, uint16,
+#   - the levels, NB_CELLS bytes per slot,
+#   - the pawn cells, MAX_PAWNS bytes per slot,
+#   - the numbers of players, the player turns and the winners (0 if none),
+#     a byte per slot each.
+
+MAX_PAWNS = 6
+
+
+def attach_shared_memory(name: str) -> SharedMemory:
+    """
+    Opens a shared memory block created by another process, which is in
+    charge of unlinking it.
+    """
+    try:
+        return SharedMemory(name, track=False)
+    except TypeError:  # Python < 3.13
+        memory = SharedMemory(name)
+        # The resource tracker of a process started by multiprocessing is the
+        # one of its parent. Any other process has its own, which would unlink
+        # the block at exit while the process that created it still uses it
+        if parent_process() is None:
+            resource_tracker.unregister(memory._name, "shared_memory")
+        return memory
+
+
+class SharedPawnView(Pawn):
+    """
+    A pawn whose cell is read and written in a BoardSlotPool.
+    """
+
+    __slots__ = ("_pawn_cells", "_index")
+
+    @property
+    def cell(self) -> int:
+        return self._pawn_cells[self._index]
+
+    @cell.setter
+    def cell(self, cell: int):
+        self._pawn_cells[self._index] = cell
+
+
+class SharedBoardView(Board):
+    """
+    A board read and written in place in a slot of a BoardSlotPool.
+
+    It can be given to players like any board: its copies are regular boards,
+    and the moves played on it are written in the slot.
+    """
+
+    __slots__ = ("_pool", "_slot")
+
+    def __init__(self, pool: "BoardSlotPool", slot: int):
+        self._pool = pool
+        self._slot = slot
+
+        self.nb_players = pool.nb_players[slot]
+        if self.nb_players not in PAWN_IDENTITIES:
+            raise ValueError(f"No board was written in the slot {slot}")
+        self.nb_pawns = self.nb_players * 2
+        self.board_size = BOARD_SIZE
+        self.cells = pool.levels[slot * NB_CELLS : (slot + 1) * NB_CELLS]
+        self._grid = None
+
+        self.pawns = []
+        for index, (number, order, player_number) in enumerate(
+            PAWN_IDENTITIES[self.nb_players], slot * MAX_PAWNS
+        ):
+            pawn = SharedPawnView.__new__(SharedPawnView)
+            pawn.number = number
+            pawn.order = order
+            pawn.player_number = player_number
+            pawn._pawn_cells = pool.pawn_cells
+            pawn._index = index
+            self.pawns.append(pawn)
+
+        self._pawn_threats = None
+        self._player_threats = None
+        self._threats_key = None
+
+    @property
+    def player_turn(self) -> int:
+        return self._pool.player_turns[self._slot]
+
+    @player_turn.setter
+    def player_turn(self, player_turn: int):
+        self._pool.player_turns[self._slot] = player_turn
+
+    @property
+    def turn_number(self) -> int:
+        return self._pool.turn_numbers[self._slot]
+
+    @turn_number.setter
+    def turn_number(self, turn_number: int):
+        self._pool.turn_numbers[self._slot] = turn_number
+
+    @property
+    def winner_player_number(self) -> Optional[int]:
+        return self._pool.winners[self._slot] or None
+
+    @winner_player_number.setter
+    def winner_player_number(self, winner_player_number: Optional[int]):
+        self._pool.winners[self._slot] = winner_player_number or 0
+
+    def release(self):
+        """
+        Releases the views on the shared memory, the board can't be used
+        anymore.
+        """
+        if self._grid is not None:
+            for column in self._grid:
+                column.release()
+            self._grid = None
+        self.cells.release()
+
+    def __reduce__(self):
+        # Sent to another process as a regular board
+        return Board.from_bytes, (self.to_bytes(),)
+
+
+class BoardSlotPool:
+    """
+    Boards in shared memory, written by a referee and read in place by
+    worker processes.
+
+    In the referee:
+
+        pool = BoardSlotPool(nb_slots=8)
+        pool.write(slot, board)  # After each move
+        connection.send(slot)  # Signals the worker
+
+    In the worker, given pool.name and nb_slots:
+
+        pool = BoardSlotPool(nb_slots, name)
+        board = pool.view(connection.recv())  # No copy, no parsing
+
+    Attributes:
+        name (str): The name of the shared memory block.
+        nb_slots (int): The number of boards.
+    """
+
+    def __init__(self, nb_slots: int, name: Optional[str] = None):
+        """
+        Args:
+            nb_slots (int): The number of boards.
+            name (str): If given, the pool created by another process with
+                this name is opened, else a new pool is created.
+        """
+        if nb_slots <= 0:
+            raise ValueError("The number of slots should be positive")
+        self.nb_slots = nb_slots
+
+        size = nb_slots * (2 + NB_CELLS + MAX_PAWNS + 3)
+        if name is None:
+            self._memory = SharedMemory(create=True, size=size)
+            self._owner = True
+        else:
+            self._memory = attach_shared_memory(name)
+            self._owner = False
+            if self._memory.size < size:
+                self._memory.close()
+                raise ValueError(f"The pool {name} has less than {nb_slots} slots")
+        self.name = self._memory.name
+
+        buffer = self._memory.buf
+        offset = 2 * nb_slots
+        self.turn_numbers = buffer[:offset].cast("H")
+        self.levels = buffer[offset : offset + nb_slots * NB_CELLS]
+        offset += nb_slots * NB_CELLS
+        self.pawn_cells = buffer[offset : offset + nb_slots * MAX_PAWNS]
+        offset += nb_slots * MAX_PAWNS
+        self.nb_players = buffer[offset : offset + nb_slots]
+        self.player_turns = buffer[offset + nb_slots : offset + 2 * nb_slots]
+        self.winners = buffer[offset + 2 * nb_slots : offset + 3 * nb_slots]
+
+        self._views: Dict[int, SharedBoardView] = {}
+
+    def write(self, slot: int, board: Board):
+        """
+        Copies a board in a slot.
+
+        Args:
+            slot (int): The slot, from 0 to nb_slots - 1.
+            board (Board): The board.
+        """
+        if not 0 <= slot < self.nb_slots:
+            raise IndexError(f"No slot {slot}")
+
+        start = slot * NB_CELLS
+        self.levels[start : start + NB_CELLS] = board.cells
+        start = slot * MAX_PAWNS
+        self.pawn_cells[start : start + board.nb_pawns] = bytes(
+            [pawn.cell for pawn in board.pawns]
+        )
+        self.nb_players[slot] = board.nb_players
+        self.player_turns[slot] = board.player_turn
+        self.winners[slot] = board.winner_player_number or 0
+        self.turn_numbers[slot] = board.turn_number
+
+    def view(self, slot: int) -> SharedBoardView:
+        """
+        Gets the board of a slot, read in place: it follows the next writes
+        in the slot.
+
+        Args:
+            slot (int): The slot, from 0 to nb_slots - 1.
+
+        Returns:
+            SharedBoardView: The board.
+        """
+        if not 0 <= slot < self.nb_slots:
+            raise IndexError(f"No slot {slot}")
+
+        view = self._views.get(slot)
+        if view is None or view.nb_players != self.nb_players[slot]:
+            if view is not None:
+                view.release()
+            view = self._views[slot] = SharedBoardView(self, slot)
+        return view
+
+    def read(self, slot: int) -> Board:
+        """
+        Gets a copy of the board of a slot, independent of the next writes.
+        """
+        return self.view(slot).copy()
+
+    def close(self):
+        """
+        Closes the pool in this process, and destroys it if this process
+        created it. The views of the pool can't be used anymore.
+        """
+        for view in self._views.values():
+            view.release()
+        self._views = {}
+        for array in (
+            self.turn_numbers,
+            self.levels,
+            self.pawn_cells,
+            self.nb_players,
+            self.player_turns,
+            self.winners,
+        ):
+            array.release()
+
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
@@ -0,0 +1,184 @@
+from math import log, sqrt
+from typing import Optional, Tuple
+
+# Sequential testing of match results
+# Used to stop a match between two players as soon as the result is decided
+# instead of always playing a fixed number of games.
+
+H0 = "H0"  # player1 is not stronger than elo0
+H1 = "H1"  # player1 is at least elo1 stronger
+
+
+def elo_to_score(elo: float) -> float:
+    """
+    Converts an Elo difference into an expected score.
+
+    Args:
+        elo (float): The Elo difference between two players.
+
+    Returns:
+        float: The expected score (between 0 and 1) of the stronger player.
+    """
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def score_to_elo(score: float) -> float:
+    """
+    Converts an expected score into an Elo difference.
+
+    Args:
+        score (float): The expected score, between 0 and 1 excluded.
+
+    Returns:
+        float: The corresponding Elo difference.
+    """
+    return -400 * log(1 / score - 1, 10)
+
+
+def wilson_interval(wins: int, nb_games: int, z: float = 1.96) -> Tuple[float, float]:
+    """
+    Computes the Wilson score interval of a winning rate.
+
+    Args:
+        wins (int): The number of won games.
+        nb_games (int): The number of played games.
+        z (float): The quantile of the normal distribution (1.96 for 95%).
+
+    Returns:
+        tuple: The lower and upper bounds of the winning rate.
+    """
+    if nb_games == 0:
+        return 0.0, 1.0
+
+    p = wins / nb_games
+    denominator = 1 + z**2 / nb_games
+    center = (p + z**2 / (2 * nb_games)) / denominator
+    margin = z * sqrt(p * (1 - p) / nb_games + z**2 / (4 * nb_games**2))
+    margin /= denominator
+
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+class SPRT:
+    """
+    Sequential probability ratio test on the results of player1 against player2.
+
+    Tests H0: "player1 is elo0 Elo points stronger" against
+    H1: "player1 is elo1 Elo points stronger". The test stops as soon as
+    the log likelihood ratio crosses one of the bounds given by alpha and beta.
+
+    Attributes:
+        elo0 (float): The Elo difference of the null hypothesis.
+        elo1 (float): The Elo difference of the alternative hypothesis.
+        alpha (float): The probability of accepting H1 when H0 is true.
+        beta (float): The probability of accepting H0 when H1 is true.
+        z (float): The normal quantile used for the reported intervals.
+        wins (int): The number of games won by player1.
+        losses (int): The number of games lost by player1.
+        draws (int): The number of games without winner.
+    """
+
+    def __init__(
+        self,
+        elo0: float = 0.0,
+        elo1: float = 100.0,
+        alpha: float = 0.05,
+        beta: float = 0.05,
+        z: float = 1.96,
+    ):
+        if elo0 >= elo1:
+            raise ValueError("elo0 should be lower than elo1")
+        if not 0 < alpha < 1 or not 0 < beta < 1:
+            raise ValueError("alpha and beta should be between 0 and 1")
+
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.alpha = alpha
+        self.beta = beta
+        self.z = z
+
+        self.lower_bound = log(beta / (1 - alpha))
+        self.upper_bound = log((1 - beta) / alpha)
+
+        # Log likelihood ratio of one win and one loss of player1
+        p0 = elo_to_score(elo0)
+        p1 = elo_to_score(elo1)
+        self.win_llr = log(p1 / p0)
+        self.loss_llr = log((1 - p1) / (1 - p0))
+
+        self.wins = 0
+        self.losses = 0
+        self.draws = 0
+
+    @property
+    def nb_games(self) -> int:
+        return self.wins + self.losses + self.draws
+
+    @property
+    def llr(self) -> float:
+        """
+        The log likelihood ratio of the results, draws count as half a win.
+        """
+        return (self.wins + self.draws / 2) * self.win_llr + (
+            self.losses + self.draws / 2
+        ) * self.loss_llr
+
+    @property
+    def result(self) -> Optional[str]:
+        """
+        The accepted hypothesis, H0 or H1, or None if the test is not decided yet.
+        """
+        llr = self.llr
+        if llr >= self.upper_bound:
+            return H1
+        if llr <= self.lower_bound:
+            return H0
+        return None
+
+    def is_decided(self) -> bool:
+        return self.result is not None
+
+    def update(self, player1_won: Optional[bool]):
+        """
+        Registers the result of a game.
+
+        Args:
+            player1_won (bool): True if player1 won, False if player2 won,
+                None if nobody won.
+        """
+        if player1_won is None:
+            self.draws += 1
+        elif player1_won:
+            self.wins += 1
+        else:
+            self.losses += 1
+
+    def score_interval(self) -> Tuple[float, float]:
+        """
+        The Wilson interval of the score of player1.
+
+        Returns:
+            tuple: The lower and upper bounds of the score.
+        """
+        return wilson_interval(self.wins + self.draws / 2, self.nb_games, self.z)
+
+    def elo_interval(self) -> Tuple[float, float]:
+        """
+        The confidence interval of the Elo difference between player1 and player2.
+
+        Returns:
+            tuple: The lower and upper bounds, infinite for a 0% or 100% score.
+        """
+        low, high = self.score_interval()
+        low_elo = score_to_elo(low) if low > 0 else float("-inf")
+        high_elo = score_to_elo(high) if high < 1 else float("inf")
+        return low_elo, high_elo
+
+    def __repr__(self) -> str:
+        low, high = self.elo_interval()
+        return (
+            f"SPRT [{self.elo0}, {self.elo1}] after {self.nb_games} games: "
+            f"{self.result or 'undecided'}, LLR {self.llr:.2f} "
+            f"({self.lower_bound:.2f}, {self.upper_bound:.2f}), "
+            f"Elo [{low:.0f}, {high:.0f}]"
+        )
@@ -0,0 +1,504 @@
+import json
+import os
+import selectors
+import subprocess
+import sys
+import traceback
+from importlib import import_module
+from typing import Dict, List, Optional, Tuple
+
+from santorinai.board import Board
+from santorinai.pawn import Pawn
+from santorinai.player import Player
+from santorinai.shared_board import BoardSlotPool
+
+# Line based protocol to play with a player living in another process
+#
+# The referee writes one JSON request per line on the standard input of the
+# agent process, the agent answers with one JSON line on its standard output:
+#
+#   {"cmd": "init", "player": "module:Class", "player_number": 1, "kwargs": {}}
+#       -> {"result": "<player name>"}
+#   {"cmd": "place_pawn", "board": <board>, "pawn": <pawn number>}
+#       -> {"result": [x, y]}
+#   {"cmd": "play_move", "board": <board>}
+#       -> {"result": [pawn order, [x, y], [x, y]]}
+#   {"cmd": "attach", "pool": <shared memory name>, "nb_slots": <number>}
+#       -> {"result": null}
+#   {"cmd": "place_pawn", "slot": <slot>, "pawn": <pawn number>}
+#   {"cmd": "play_move", "slot": <slot>}
+#       Same as above, the board is read in place in a slot of the attached
+#       BoardSlotPool instead of being sent in the request
+#   {"cmd": "new_game"}
+#       -> {"result": null}
+#   {"cmd": "ping"}
+#       -> {"result": null}
+#   {"cmd": "quit"}
+#
+# A failing request is answered with {"error": "<traceback>"}.
+# Everything the player prints is redirected to the standard error.
+
+# Seconds given to a new agent to start and create its player, when its
+# requests have a timeout
+INIT_TIMEOUT = 30.0
+
+
+def encode_board(board: Board) -> Dict:
+    """
+    Converts a board to a JSON serializable dict.
+
+    Args:
+        board (Board): The board to convert.
+
+    Returns:
+        dict: The state of the board.
+    """
+    return {
+        "nb_players": board.nb_players,
+        "board": [list(column) for column in board.board],
+        "pawns": [pawn.pos for pawn in board.pawns],
+        "turn_number": board.turn_number,
+        "player_turn": board.player_turn,
+        "winner_player_number": board.winner_player_number,
+    }
+
+
+def decode_board(data: Dict) -> Board:
+    """
+    Creates a board from a dict made by encode_board.
+
+    Args:
+        data (dict): The state of the board.
+
+    Returns:
+        Board: The decoded board.
+    """
+    board = Board(data["nb_players"])
+    for x, column in enumerate(data["board"]):
+        for y, level in enumerate(column):
+            board.board[x][y] = level
+    for pawn, pos in zip(board.pawns, data["pawns"]):
+        pawn.move(tuple(pos))
+    board.turn_number = data["turn_number"]
+    board.player_turn = data["player_turn"]
+    board.winner_player_number = data["winner_player_number"]
+    return board
+
+
+def to_tuples(value):
+    """
+    Converts the JSON lists of an answer back to tuples, positions are tuples.
+    """
+    if isinstance(value, list):
+        return tuple(to_tuples(item) for item in value)
+    return value
+
+
+def load_player_class(player_spec: str):
+    """
+    Imports a player class.
+
+    Args:
+        player_spec (str): The class, as "package.module:ClassName".
+
+    Returns:
+        type: The player class.
+    """
+    module_name, _, class_name = player_spec.partition(":")
+    if not class_name:
+        raise ValueError(f"Invalid player '{player_spec}', use 'module:ClassName'")
+    return getattr(import_module(module_name), class_name)
+
+
+def serve(stdin=None, stdout=None):
+    """
+    Answers the requests of a referee until the input is closed or a quit
+    request is received. Runs in the agent process.
+
+    Args:
+        stdin: The stream to read the requests from, defaults to sys.stdin.
+        stdout: The stream to write the answers to, defaults to sys.stdout.
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+
+    # Keep the protocol stream clean from the prints of the player
+    sys.stdout = sys.stderr
+
+    player = None
+    board_pool = None
+    for line in stdin:
+        request = json.loads(line)
+        cmd = request["cmd"]
+        if cmd == "quit":
+            break
+
+        try:
+            if cmd in ("place_pawn", "play_move"):
+                if "slot" in request:
+                    board = board_pool.view(request["slot"])
+                else:
+                    board = decode_board(request["board"])
+
+            if cmd == "init":
+                player_class = load_player_class(request["player"])
+                player = player_class(
+                    request["player_number"], **request.get("kwargs", {})
+                )
+                result = player.name()
+            elif cmd == "attach":
+                if board_pool is not None:
+                    board_pool.close()
+                board_pool = BoardSlotPool(request["nb_slots"], request["pool"])
+                result = None
+            elif cmd == "place_pawn":
+                pawn = board.pawns[request["pawn"] - 1]
+                result = player.place_pawn(board, pawn)
+            elif cmd == "play_move":
+                result = player.play_move(board)
+            elif cmd == "new_game":
+                result = player.new_game()
+            elif cmd == "ping":
+                result = None
+            else:
+                raise ValueError(f"Unknown command '{cmd}'")
+            answer = {"result": result}
+        except Exception:
+            answer = {"error": traceback.format_exc()}
+
+        stdout.write(json.dumps(answer) + "\n")
+        stdout.flush()
+
+    if board_pool is not None:
+        board_pool.close()
+
+
+class AgentProcess:
+    """
+    A process running a player behind the stdio protocol.
+
+    Attributes:
+        player_spec (str): The class of the player, as "module:ClassName".
+        player_number (int): The number of the player.
+        kwargs (dict): The other arguments of the player constructor.
+        name (str): The name of the player, as returned by the agent.
+        timeout (float): The maximum number of seconds to wait for an answer,
+            None to wait forever. An agent which takes longer is killed.
+    """
+
+    def __init__(
+        self,
+        player_spec: str,
+        player_number: int,
+        kwargs=None,
+        timeout: Optional[float] = None,
+    ):
+        self.player_spec = player_spec
+        self.player_number = player_number
+        self.kwargs = kwargs or {}
+        self.timeout = timeout
+        self.name = None
+        self.process = None
+        self.start()
+
+    def start(self):
+        """
+        Starts the agent process and initializes its player.
+        """
+        # Make sure the agent can import santorinai even if it is not installed
+        env = os.environ.copy()
+        package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env["PYTHONPATH"] = os.pathsep.join(
+            filter(None, [package_root, env.get("PYTHONPATH")])
+        )
+
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "santorinai.subprocess_player"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            env=env,
+            text=True,
+            bufsize=1,
+        )
+        init_timeout = None
+        if self.timeout is not None:
+            init_timeout = max(self.timeout, INIT_TIMEOUT)
+        self.name = self.request(
+            {
+                "cmd": "init",
+                "player": self.player_spec,
+                "player_number": self.player_number,
+                "kwargs": self.kwargs,
+            },
+            init_timeout,
+        )
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def request(self, request: Dict, timeout: Optional[float] = None):
+        """
+        Sends a request to the agent and waits for its answer.
+
+        Args:
+            request (dict): The request, see the protocol.
+            timeout (float): The maximum number of seconds to wait for the
+                answer, the timeout of the agent by default.
+
+        Returns:
+            The result of the request.
+
+        Raises:
+            RuntimeError: If the agent died, failed to answer or did not answer
+                in time, in which case it is killed.
+        """
+        if timeout is None:
+            timeout = self.timeout
+        try:
+            self.process.stdin.write(json.dumps(request) + "\n")
+            self.process.stdin.flush()
+            if timeout is not None and not self._wait_answer(timeout):
+                self.kill()
+                raise RuntimeError(
+                    f"The agent {self.player_spec} did not answer within"
+                    f" {timeout} seconds"
+                )
+            line = self.process.stdout.readline()
+        except (BrokenPipeError, OSError) as error:
+            self.kill()
+            raise RuntimeError(f"The agent {self.player_spec} died") from error
+
+        if not line:
+            self.kill()
+            raise RuntimeError(f"The agent {self.player_spec} died")
+
+        answer = json.loads(line)
+        if "error" in answer:
+            raise RuntimeError(
+                f"The agent {self.player_spec} failed:\n{answer['error']}"
+            )
+        return answer["result"]
+
+    def _wait_answer(self, timeout: float) -> bool:
+        """
+        Waits until the answer of the agent can be read.
+
+        Returns:
+            bool: False if the agent did not start to answer in time.
+        """
+        # Each request gets a single line, so nothing is left buffered in the
+        # pipe reader between two requests
+        with selectors.DefaultSelector() as selector:
+            selector.register(self.process.stdout, selectors.EVENT_READ)
+            return bool(selector.select(timeout))
+
+    def close(self):
+        """
+        Stops the agent process.
+        """
+        if self.is_alive():
+            try:
+                self.process.stdin.write(json.dumps({"cmd": "quit"}) + "\n")
+                self.process.stdin.flush()
+                self.process.wait(timeout=5)
+            except (BrokenPipeError, OSError, subprocess.TimeoutExpired):
+                pass
+        self.kill()
+
+    def kill(self):
+        """
+        Kills the agent process if it is still running and releases its pipes.
+        """
+        if self.process is None:
+            return
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+        for pipe in (self.process.stdin, self.process.stdout):
+            try:
+                pipe.close()
+            except OSError:
+                pass
+        self.process = None
+
+
+class AgentProcessPool:
+    """
+    Keeps agent processes alive between matches, so that the process startup
+    and the player initialisation are only paid once per process.
+    Processes are reused for the same player class, number and arguments.
+    """
+
+    def __init__(self):
+        self.idle_processes: Dict[Tuple, List[AgentProcess]] = {}
+
+    @staticmethod
+    def _key(player_spec: str, player_number: int, kwargs: Optional[Dict]):
+        return player_spec, player_number, json.dumps(kwargs or {}, sort_keys=True)
+
+    def acquire(
+        self,
+        player_spec: str,
+        player_number: int,
+        kwargs=None,
+        timeout: Optional[float] = None,
+    ) -> AgentProcess:
+        """
+        Gets an idle agent process, or starts a new one.
+
+        Args:
+            timeout (float): The timeout of the requests, see AgentProcess.
+
+        Returns:
+            AgentProcess: A running agent process.
+        """
+        idle_processes = self.idle_processes.get(
+            self._key(player_spec, player_number, kwargs), []
+        )
+        while idle_processes:
+            agent = idle_processes.pop()
+            if agent.is_alive():
+                agent.timeout = timeout
+                return agent
+
+        return AgentProcess(player_spec, player_number, kwargs, timeout)
+
+    def release(self, agent: AgentProcess):
+        """
+        Gives back an agent process to the pool, dead processes are dropped.
+        """
+        if not agent.is_alive():
+            return
+        key = self._key(agent.player_spec, agent.player_number, agent.kwargs)
+        self.idle_processes.setdefault(key, []).append(agent)
+
+    def close(self):
+        """
+        Stops all the idle agent processes.
+        """
+        for agents in self.idle_processes.values():
+            for agent in agents:
+                agent.close()
+        self.idle_processes = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+class SubprocessPlayer(Player):
+    """
+    A player running in its own process, speaking the stdio protocol.
+
+    A crash, a leak or a global state mutation of the player can't affect the
+    tester or the other players. If the agent process dies, or hangs longer
+    than the timeout, the current decision is answered with an invalid move,
+    so the player loses the game, and the process is restarted for the next
+    decision.
+    """
+
+    def __init__(
+        self,
+        player_spec: str,
+        player_number: int,
+        log_level=0,
+        kwargs=None,
+        pool: AgentProcessPool = None,
+        shared_board: bool = False,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Args:
+            player_spec (str): The class of the player, as "module:ClassName".
+            player_number (int): The number of the player.
+            log_level (int): Passed to the player constructor.
+            kwargs (dict): The other arguments of the player constructor.
+            pool (AgentProcessPool): The pool to take the agent process from.
+            shared_board (bool): If True, the boards are written in shared
+                memory and read in place by the agent, instead of being sent
+                as JSON.
+            timeout (float): The maximum number of seconds to wait for each
+                decision of the player, None to wait forever.
+        """
+        super().__init__(player_number, log_level)
+        self.kwargs = dict(kwargs or {})
+        self.kwargs["log_level"] = log_level
+        self.player_spec = player_spec
+        self.pool = pool
+
+        if pool is None:
+            self.agent = AgentProcess(player_spec, player_number, self.kwargs, timeout)
+        else:
+            self.agent = pool.acquire(player_spec, player_number, self.kwargs, timeout)
+        self._name = self.agent.name
+
+        self.board_pool = BoardSlotPool(1) if shared_board else None
+        self._attached_process = None  # The agent process using board_pool
+
+    def name(self):
+        return self._name
+
+    def place_pawn(self, board: Board, pawn: Pawn) -> Tuple[int, int]:
+        return self._request(self._board_request("place_pawn", board, pawn.number))
+
+    def play_move(self, board: Board) -> Tuple[int, Tuple[int, int], Tuple[int, int]]:
+        answer = self._request(self._board_request("play_move", board))
+        if answer is None:
+            return None, None, None
+        return answer
+
+    def new_game(self):
+        self._request({"cmd": "new_game"})
+
+    def _board_request(self, cmd: str, board: Board, pawn_number=None) -> Dict:
+        if self.board_pool is None:
+            request = {"cmd": cmd, "board": encode_board(board)}
+        else:
+            self.board_pool.write(0, board)
+            request = {"cmd": cmd, "slot": 0}
+        if pawn_number is not None:
+            request["pawn"] = pawn_number
+        return request
+
+    def _request(self, request: Dict):
+        try:
+            if not self.agent.is_alive():
+                self.agent.start()
+            if (
+                self.board_pool is not None
+                and self.agent.process is not self._attached_process
+            ):
+                self.agent.request(
+                    {"cmd": "attach", "pool": self.board_pool.name, "nb_slots": 1}
+                )
+                self._attached_process = self.agent.process
+            return to_tuples(self.agent.request(request))
+        except RuntimeError as error:
+            if self.log_level:
+                print(error, file=sys.stderr)
+            # An invalid answer, the player loses the game
+            return None
+
+    def close(self):
+        """
+        Stops the agent process, or gives it back to its pool.
+        """
+        if self.pool is None:
+            self.agent.close()
+        else:
+            self.pool.release(self.agent)
+        if self.board_pool is not None:
+            self.board_pool.close()
+            self.board_pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+if __name__ == "__main__":
+    serve()
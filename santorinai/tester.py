@@ -1,11 +1,33 @@
-from santorinai.player import Player
+from santorinai.player import AsyncPlayer, BatchedPlayer, Player
+import random
+from time import perf_counter
+
 from santorinai.board import Board
-from santorinai.board_displayer.board_displayer import (
-    init_window,
-    update_board,
-    close_window,
+from santorinai.checkpoint import InterruptGuard, MatchCheckpoint
+from santorinai.board_displayer.board_displayer import DEFAULT_FPS, BoardRenderer
+from santorinai.observers import (
+    BoardWindowObserver,
+    Checkpoint,
+    ConsoleLogger,
+    GameEnd,
+    GameStart,
+    MatchEnd,
+    Move,
+    Observer,
+    Placement,
+)
+from santorinai.result_cache import ResultCache
+from santorinai.sprt import SPRT
+from santorinai.worker_pool import (
+    REFEREE_SETTINGS,
+    WorkerPool,
+    play_chunk,
+    player_spec,
 )
-from time import sleep
+
+# Decisions asked to the players during a game
+PLACE_PAWN = "place_pawn"
+PLAY_MOVE = "play_move"
 
 
 class Tester:
@@ -16,16 +38,64 @@ class Tester:
     verbose_level = 2
     delay_between_moves = 0.0
     display_board = False
+    display_fps = DEFAULT_FPS
+    # If not None, the random module is seeded before each game of play_1v1
+    # from this seed and the game number, so that each game can be replayed
+    seed = None
+    # Number of games between two checkpoints of play_1v1, or two writes to
+    # the cache of play_1v1_cached
+    checkpoint_interval = 10
+    # If True, the moves of the players flagged as trusted (Player.trusted)
+    # are played without validation, see Board.play_move_trusted
+    trusted_referee = False
+    # Fraction of the trusted moves validated anyway, an invalid one loses
+    trusted_sample_rate = 0.05
+    # If True, each game with trusted moves is replayed with validation when
+    # it ends, and its result is corrected if a trusted move was invalid. It
+    # costs about a validated game: use it to audit players before trusting
+    verify_trusted_games = False
+
+    def __init__(self):
+        self.observers = []
+        self.interrupted = False  # True if the last match was stopped by Ctrl-C
+        # Number of games whose result was corrected by the replay
+        self.nb_corrected_games = 0
+        # Draws the trusted moves to validate, apart from the random module so
+        # that the games do not depend on the sample
+        self.sample_random = random.Random()
+
+    def subscribe(self, observer: Observer):
+        """
+        Send the events of the next games to an observer
+
+        Args:
+            observer (Observer): the observer to add
+        """
+        self.observers.append(observer)
 
-    def display_message(self, message, verbose_level=1):
+    def unsubscribe(self, observer: Observer):
         """
-        Display a message if verbose is True
+        Stop sending the events of the games to an observer
 
         Args:
-            message (str): the message to display
+            observer (Observer): the observer to remove
         """
-        if self.verbose_level >= verbose_level:
-            print(message)
+        self.observers.remove(observer)
+
+    def _match_observers(self, renderer=None):
+        """
+        Get the observers of a match: the subscribed ones, a console logger if
+        verbose_level is above 0 and the board window if it is displayed
+
+        Returns:
+            list: the observers, empty if nobody listens
+        """
+        observers = list(self.observers)
+        if self.verbose_level > 0:
+            observers.append(ConsoleLogger(self.verbose_level))
+        if renderer is not None:
+            observers.append(BoardWindowObserver(renderer, self.delay_between_moves))
+        return observers
 
     def play_1v1(
         self,
@@ -33,20 +103,506 @@ class Tester:
         player2: Player,
         nb_games: int = 1,
         dic_win_lose_type=None,
+        sprt: SPRT = None,
+        checkpoint: str = None,
+        resume: bool = False,
     ):
         """
         Play a 1v1 game between player1 and player2
 
+        A Ctrl-C stops the match after the last finished game: the results of
+        the finished games are returned, and interrupted is set to True.
+
         Args:
             player1 (Player): the first player
             player2 (Player): the second player
+            nb_games (int): the maximum number of games to play
+            dic_win_lose_type (dict): the winning and loosing conditions to update
+            sprt (SPRT): if given, the match stops as soon as the sequential test
+                on the results of player1 is decided. The test is updated in place
+                and reports the confidence interval of the Elo difference.
+            checkpoint (str): if given, the progress of the match is saved in
+                this file every checkpoint_interval games, at the end of the
+                match and when it is interrupted
+            resume (bool): if True and the checkpoint file exists, the match
+                continues where it stopped instead of starting again
 
         Returns:
             dict: the number of victories for each player
             dict: the different types of winning and loosing conditions
         """
-        NB_PLAYERS = 2
+        player_names = self._validate_players(player1, player2)
+
+        for player in (player1, player2):
+            if isinstance(player, AsyncPlayer):
+                raise TypeError(
+                    f"{player.name()} is an AsyncPlayer, use AsyncTester to play it"
+                )
+
+        # Initialize the number of victories
+        nb_victories = {
+            player1.name(): 0,
+            player2.name(): 0,
+        }
+
+        # Initialize empty dic_win_lose_type in not passed
+        if not dic_win_lose_type:
+            dic_win_lose_type = {player1.name(): {}, player2.name(): {}}
+
+        players = [player1, player2]
+
+        # Continue an interrupted match
+        progress = None
+        nb_played_games = 0
+        if checkpoint is not None:
+            progress = self._open_checkpoint(checkpoint, player_names, resume)
+            if progress.nb_played_games:
+                progress.restore(nb_victories, dic_win_lose_type, sprt)
+                nb_played_games = progress.nb_played_games
+
+        # Initialize the window, drawn at most display_fps times per second
+        renderer = None
+        if self.display_board:
+            renderer = BoardRenderer([player1.name(), player2.name()], self.display_fps)
+            renderer.start()
+        observers = self._match_observers(renderer)
+
+        # Play the games
+        self.interrupted = False
+        try:
+            with InterruptGuard() as guard:
+                for game_nb in range(nb_played_games + 1, nb_games + 1):
+                    # Stop the match as soon as the result is statistically decided
+                    if sprt is not None and sprt.is_decided():
+                        break
+
+                    game_seed = None
+                    if self.seed is not None:
+                        game_seed = f"{self.seed}:{game_nb}"
+                        random.seed(game_seed)
+                    winner_idx, reason, forfeit = self._play_game(
+                        players, observers, game_nb, game_seed
+                    )
+
+                    # A Ctrl-C during the bookkeeping of a game is deferred to its
+                    # end, so that the counts, the SPRT and the checkpoint agree
+                    with guard.deferred():
+                        nb_played_games += 1
+                        self._register_result(
+                            player_names,
+                            nb_victories,
+                            dic_win_lose_type,
+                            winner_idx,
+                            reason,
+                            forfeit,
+                        )
+                        if sprt is not None:
+                            sprt.update(None if winner_idx is None else winner_idx == 0)
+
+                        if progress is not None:
+                            progress.record(
+                                nb_played_games, nb_victories, dic_win_lose_type, sprt
+                            )
+                            if nb_played_games % self.checkpoint_interval == 0:
+                                self._save_checkpoint(observers, progress)
+        except KeyboardInterrupt:
+            # The statistics only count the finished games
+            self.interrupted = True
+
+        if progress is not None:
+            self._save_checkpoint(observers, progress)
+
+        self._end_match(observers, player_names, nb_victories, nb_played_games, sprt)
+
+        # Close the window
+        if renderer is not None:
+            renderer.close()
+
+        return nb_victories, dic_win_lose_type
+
+    def play_1v1_parallel(
+        self,
+        pool: WorkerPool,
+        player1,
+        player2,
+        nb_games: int = 1,
+        dic_win_lose_type=None,
+        sprt: SPRT = None,
+        checkpoint: str = None,
+        resume: bool = False,
+    ):
+        """
+        Play a 1v1 match between player1 and player2 in the worker processes of
+        a pool, which can be reused for the next matches
+
+        The results are counted in the order of the games, so that a seeded
+        match gives the same results as play_1v1. The observers only get the
+        GameEnd and MatchEnd events.
+
+        Args:
+            pool (WorkerPool): the workers playing the games
+            player1: the class of the first player, or (class, constructor
+                arguments), the player number excluded
+            player2: the class of the second player, or (class, constructor
+                arguments)
+            nb_games (int): the maximum number of games to play
+            dic_win_lose_type (dict): the winning and loosing conditions to update
+            sprt (SPRT): if given, the match stops as soon as the sequential test
+                on the results of player1 is decided, see play_1v1
+            checkpoint (str): if given, the progress of the match is saved in
+                this file, see play_1v1
+            resume (bool): if True and the checkpoint file exists, the match
+                continues where it stopped instead of starting again
+
+        Returns:
+            dict: the number of victories for each player
+            dict: the different types of winning and loosing conditions
+        """
+        if self.display_board:
+            raise ValueError("The board can't be displayed with parallel games")
+
+        specs = [player_spec(player1), player_spec(player2)]
+        player_names = pool.player_names(specs)
+        if player_names[0] == player_names[1]:
+            raise ValueError("The players should have different names")
+
+        nb_victories = {name: 0 for name in player_names}
+        if not dic_win_lose_type:
+            dic_win_lose_type = {name: {} for name in player_names}
+
+        # Continue an interrupted match, the games are seeded in the workers
+        progress = None
+        nb_played_games = 0
+        if checkpoint is not None:
+            progress = self._open_checkpoint(checkpoint, player_names, resume)
+            if progress.nb_played_games:
+                progress.restore(
+                    nb_victories, dic_win_lose_type, sprt, restore_random_state=False
+                )
+                nb_played_games = progress.nb_played_games
+
+        observers = self._match_observers()
+        settings = {name: getattr(self, name) for name in REFEREE_SETTINGS}
+        games = pool.play_games(
+            specs,
+            nb_played_games + 1,
+            nb_games,
+            settings,
+            self.seed,
+            record=bool(observers),
+        )
+
+        self.interrupted = False
+        try:
+            with InterruptGuard() as guard:
+                for game_nb, winner_idx, reason, forfeit, board, think_times in games:
+                    if sprt is not None and sprt.is_decided():
+                        break
+
+                    # A Ctrl-C during the bookkeeping of a game is deferred to its
+                    # end, so that the counts, the SPRT and the checkpoint agree
+                    with guard.deferred():
+                        nb_played_games += 1
+                        self._register_result(
+                            player_names,
+                            nb_victories,
+                            dic_win_lose_type,
+                            winner_idx,
+                            reason,
+                            forfeit,
+                        )
+                        if sprt is not None:
+                            sprt.update(None if winner_idx is None else winner_idx == 0)
+
+                        if observers:
+                            seed = (
+                                None if self.seed is None else f"{self.seed}:{game_nb}"
+                            )
+                            event = GameEnd(
+                                game_nb,
+                                player_names,
+                                winner_idx,
+                                reason,
+                                forfeit,
+                                Board.from_bytes(board),
+                                think_times,
+                                seed,
+                            )
+                            for observer in observers:
+                                observer.on_game_end(event)
+
+                        if progress is not None:
+                            progress.record(
+                                nb_played_games, nb_victories, dic_win_lose_type, sprt
+                            )
+                            if nb_played_games % self.checkpoint_interval == 0:
+                                self._save_checkpoint(observers, progress)
+        except KeyboardInterrupt:
+            self.interrupted = True
+        finally:
+            games.close()
+
+        if progress is not None:
+            self._save_checkpoint(observers, progress)
+
+        self._end_match(observers, player_names, nb_victories, nb_played_games, sprt)
+
+        return nb_victories, dic_win_lose_type
+
+    def play_1v1_cached(
+        self,
+        cache: ResultCache,
+        player1,
+        player2,
+        nb_games: int = 1,
+        dic_win_lose_type=None,
+        sprt: SPRT = None,
+        pool: WorkerPool = None,
+    ):
+        """
+        Play a seeded 1v1 match between player1 and player2, reusing the games
+        of the cache: only the games which are not cached yet are played, and
+        added to the cache as they end
+
+        The match is addressed by the source of the players, their constructor
+        arguments, the rules, the referee settings and the seed, see
+        result_cache.py. The observers get the GameEnd events of all the games,
+        cached or not, and the MatchEnd event.
+
+        Args:
+            cache (ResultCache): the outcomes of the games already played
+            player1: the class of the first player, or (class, constructor
+                arguments), the player number excluded
+            player2: the class of the second player, or (class, constructor
+                arguments)
+            nb_games (int): the maximum number of games to play
+            dic_win_lose_type (dict): the winning and loosing conditions to update
+            sprt (SPRT): if given, the match stops as soon as the sequential test
+                on the results of player1 is decided, see play_1v1
+            pool (WorkerPool): if given, the missing games are played by its
+                workers, else in this process
+
+        Returns:
+            dict: the number of victories for each player
+            dict: the different types of winning and loosing conditions
+        """
+        if self.seed is None:
+            raise ValueError("Only seeded games can be cached, set the seed")
+        if self.display_board:
+            raise ValueError("The board can't be displayed with cached games")
+
+        specs = [player_spec(player1), player_spec(player2)]
+        settings = {name: getattr(self, name) for name in REFEREE_SETTINGS}
+        key = cache.match_key(specs, self.seed, settings)
+
+        players = None
+        if pool is None:
+            players = [
+                player_class(number, **kwargs)
+                for number, (player_class, kwargs) in enumerate(specs, 1)
+            ]
+            player_names = self._validate_players(*players)
+        else:
+            player_names = pool.player_names(specs)
+            if player_names[0] == player_names[1]:
+                raise ValueError("The players should have different names")
+
+        nb_victories = {name: 0 for name in player_names}
+        if not dic_win_lose_type:
+            dic_win_lose_type = {name: {} for name in player_names}
+
+        observers = self._match_observers()
+        cached_games = cache.games(key, nb_games)
+        new_games = []
+
+        def match_games():
+            yield from cached_games
+            first_game = len(cached_games) + 1
+            if pool is not None:
+                games = pool.play_games(
+                    specs, first_game, nb_games, settings, self.seed, record=True
+                )
+                try:
+                    for game in games:
+                        new_games.append(game)
+                        yield game
+                finally:
+                    games.close()
+                return
+
+            for game_nb in range(first_game, nb_games + 1):
+                game = play_chunk(self, players, [game_nb], self.seed, True)[0]
+                new_games.append(game)
+                yield game
+
+        nb_played_games = 0
+        games = match_games()
+        self.interrupted = False
+        try:
+            with InterruptGuard() as guard:
+                for game_nb, winner_idx, reason, forfeit, board, think_times in games:
+                    if sprt is not None and sprt.is_decided():
+                        break
+
+                    # A Ctrl-C during the bookkeeping of a game is deferred to its
+                    # end, so that the counts, the SPRT and the checkpoint agree
+                    with guard.deferred():
+                        nb_played_games += 1
+                        self._register_result(
+                            player_names,
+                            nb_victories,
+                            dic_win_lose_type,
+                            winner_idx,
+                            reason,
+                            forfeit,
+                        )
+                        if sprt is not None:
+                            sprt.update(None if winner_idx is None else winner_idx == 0)
+
+                        if observers:
+                            event = GameEnd(
+                                game_nb,
+                                player_names,
+                                winner_idx,
+                                reason,
+                                forfeit,
+                                Board.from_bytes(board),
+                                think_times,
+                                f"{self.seed}:{game_nb}",
+                            )
+                            for observer in observers:
+                                observer.on_game_end(event)
+
+                        if len(new_games) >= self.checkpoint_interval:
+                            cache.add_games(key, new_games)
+                            new_games.clear()
+        except KeyboardInterrupt:
+            self.interrupted = True
+        finally:
+            games.close()
+            cache.add_games(key, new_games)
+
+        self._end_match(observers, player_names, nb_victories, nb_played_games, sprt)
+
+        return nb_victories, dic_win_lose_type
+
+    def play_1v1_batched(
+        self,
+        player1: Player,
+        player2: Player,
+        nb_games: int = 1,
+        dic_win_lose_type=None,
+        nb_parallel_games: int = 64,
+    ):
+        """
+        Play a 1v1 match between player1 and player2, advancing several games
+        in lockstep. The pending decisions of a BatchedPlayer in all the games
+        are gathered into a single play_moves or place_pawns call, the other
+        players are asked game by game.
+
+        The players are shared by the running games, so Player.new_game is not
+        called: they should not keep the state of a game between its moves.
+
+        Args:
+            player1 (Player): the first player
+            player2 (Player): the second player
+            nb_games (int): the number of games to play
+            dic_win_lose_type (dict): the winning and loosing conditions to update
+            nb_parallel_games (int): the number of games played together
+
+        Returns:
+            dict: the number of victories for each player
+            dict: the different types of winning and loosing conditions
+        """
+        player_names = self._validate_players(player1, player2)
+
+        if self.display_board:
+            raise ValueError("The board can't be displayed with batched games")
+
+        # Initialize the number of victories
+        nb_victories = {
+            player1.name(): 0,
+            player2.name(): 0,
+        }
+
+        # Initialize empty dic_win_lose_type in not passed
+        if not dic_win_lose_type:
+            dic_win_lose_type = {player1.name(): {}, player2.name(): {}}
+
+        players = [player1, player2]
+        observers = self._match_observers()
+
+        # Pending decision of each running game
+        pending = {}
+        nb_started_games = 0
+
+        while nb_started_games < nb_games or pending:
+            # Start new games to keep the batch full
+            while nb_started_games < nb_games and len(pending) < nb_parallel_games:
+                nb_started_games += 1
+                game = self._game_steps(
+                    players, observers, nb_started_games, reset_players=False
+                )
+                pending[game] = next(game)
+
+            # Group the decisions by player and kind of decision
+            groups = {}
+            for game, (player_idx, decision, args) in pending.items():
+                groups.setdefault((player_idx, decision), []).append((game, args))
+
+            for (player_idx, decision), requests in groups.items():
+                answers = self._ask_batch(players[player_idx], decision, requests)
+
+                for (game, _), answer in zip(requests, answers):
+                    try:
+                        pending[game] = game.send(answer)
+                    except StopIteration as game_over:
+                        del pending[game]
+                        self._register_result(
+                            player_names,
+                            nb_victories,
+                            dic_win_lose_type,
+                            *game_over.value,
+                        )
+
+        self._end_match(observers, player_names, nb_victories, nb_games)
+
+        return nb_victories, dic_win_lose_type
+
+    def _open_checkpoint(self, path, player_names, resume):
+        """
+        Get the checkpoint of a match: the saved one to resume it, else a new one
+
+        Returns:
+            MatchCheckpoint: the progress of the match
+        """
+        if resume:
+            progress = MatchCheckpoint.load(path)
+            if progress is not None:
+                if progress.player_names != player_names:
+                    raise ValueError(
+                        f"{path} is the checkpoint of a match between"
+                        f" {' and '.join(progress.player_names)}"
+                    )
+                return progress
+        return MatchCheckpoint(path, player_names)
+
+    def _ask_batch(self, player: Player, decision, requests):
+        """
+        Ask a player to take the same kind of decision in several games
+
+        Returns:
+            list: the answer of the player for each request
+        """
+        return ask_batch(player, decision, [args for _, args in requests])
+
+    def _validate_players(self, player1: Player, player2: Player):
+        """
+        Check that the two players can play against each other
 
+        Returns:
+            list: the names of the players
+        """
         # Check if the players are objects of the Player class
         if player1 is None or not isinstance(player1, Player):
             raise TypeError("player1 should be an object of the Player class")
@@ -65,160 +621,362 @@ class Tester:
         if player_names[0] == player_names[1]:
             raise ValueError("The players should have different names")
 
-        # Initialize the number of victories
-        nb_victories = {
-            player1.name(): 0,
-            player2.name(): 0,
-        }
+        return player_names
 
-        # Initialize empty dic_win_lose_type in not passed
-        if not dic_win_lose_type:
-            dic_win_lose_type = {player1.name(): {}, player2.name(): {}}
+    def _register_result(
+        self,
+        player_names,
+        nb_victories,
+        dic_win_lose_type,
+        winner_idx,
+        reason,
+        forfeit,
+    ):
+        """
+        Count the result of a game in the match statistics
+        """
+        if winner_idx is None:
+            return
+
+        winner_player_name = player_names[winner_idx]
+        if forfeit:
+            # The reason is registered for the player who failed
+            loser_player_name = player_names[1 - winner_idx]
+            dic_win_lose_type[loser_player_name] = register_new_victory_type(
+                dic_win_lose_type[loser_player_name], reason
+            )
+        else:
+            dic_win_lose_type[winner_player_name] = register_new_victory_type(
+                dic_win_lose_type[winner_player_name], reason
+            )
+
+        nb_victories[winner_player_name] += 1
+
+    def _save_checkpoint(self, observers, progress):
+        """
+        Save the progress of a match, after telling the observers so that they
+        write the games it counts first
+        """
+        if observers:
+            event = Checkpoint(
+                progress.path, progress.player_names, progress.nb_played_games
+            )
+            for observer in observers:
+                observer.on_checkpoint(event)
+        progress.save()
+
+    def _end_match(
+        self, observers, player_names, nb_victories, nb_played_games, sprt=None
+    ):
+        """
+        Send the results of a match to the observers
+        """
+        if observers:
+            event = MatchEnd(player_names, nb_victories, nb_played_games, sprt)
+            for observer in observers:
+                observer.on_match_end(event)
 
-        players = [player1, player2]
+    def _play_game(self, players, observers=(), game_number=1, seed=None):
+        """
+        Play a single game between the given players
 
-        # Initialize the window
-        window = None
-        if self.display_board:
-            window = init_window([player1.name(), player2.name()])
+        Args:
+            players (list): the players, in playing order
+            observers (list): the observers of the game, if any the time taken
+                by each player is measured
+            game_number (int): the number of the game in the match
+            seed (str): the seed of the random module for the game, if any
 
-        # Play the games
-        for game_nb in range(1, nb_games + 1):
-            self.display_message(f"Game {game_nb}", 1)
-
-            # Initialize the board
-            board = Board(NB_PLAYERS)
-
-            # Placement the pawns
-            for pawn_nb, current_pawn in enumerate(board.pawns):
-                board_copy = board.copy()
-                # If pawn_nb == 1, the player_nb is 0, if pawn_nb == 2, the
-                # player_nb is 1, if pawn_nb == 3, the player_nb is 0, etc.
-                player_nb = (pawn_nb) % NB_PLAYERS
-                player = players[player_nb]
-
-                # Ask the player where to place the pawn
-                self.display_message(
-                    f"Player '{player.name()}' is placing pawn {pawn_nb + 1}", 2
-                )
-                position_choice = player.place_pawn(board_copy, current_pawn)
+        Returns:
+            int: the index of the winning player, None if nobody won
+            Reason: the reason of the victory
+            bool: True if the game was won because the other player failed
+        """
+        if not observers:
+            game = self._game_steps(players, observers, game_number, seed=seed)
+            try:
+                player_idx, decision, args = next(game)
+                while True:
+                    answer = getattr(players[player_idx], decision)(*args)
+                    player_idx, decision, args = game.send(answer)
+            except StopIteration as game_over:
+                return game_over.value
+
+        think_times = [0.0] * len(players)
+        game = self._game_steps(players, observers, game_number, think_times, seed)
+        try:
+            player_idx, decision, args = next(game)
+            while True:
+                start = perf_counter()
+                answer = getattr(players[player_idx], decision)(*args)
+                think_times[player_idx] += perf_counter() - start
+                player_idx, decision, args = game.send(answer)
+        except StopIteration as game_over:
+            return game_over.value
+
+    def _game_steps(
+        self,
+        players,
+        observers=(),
+        game_number=1,
+        think_times=None,
+        seed=None,
+        reset_players=True,
+    ):
+        """
+        Referee a single game between the given players.
 
-                # Place the pawn
-                success, reason = board.place_pawn(position_choice)
+        This is a generator: each time a player has to take a decision, it yields
+        (player index, PLACE_PAWN or PLAY_MOVE, arguments of the player method)
+        and expects the answer of the player to be sent back. It lets the same
+        rules be driven synchronously, asynchronously or in batches.
 
-                if not success:
-                    self.display_message(
-                        f"   Pawn placed at an invalid position: {reason}", 1
+        Args:
+            players (list): the players, in playing order
+            observers (list): the observers of the game, the events are only
+                created if there is at least one
+            game_number (int): the number of the game in the match
+            think_times (list): the time taken by each player, measured by the
+                driver of the game, if any
+            seed (str): the seed of the random module for the game, if any
+            reset_players (bool): if True, Player.new_game is called before the
+                game. The drivers playing several games at once with the same
+                players set it to False, so that a new game does not reset the
+                state of the games still running
+
+        Returns:
+            int: the index of the winning player, None if nobody won
+            Reason: the reason of the victory
+            bool: True if the game was won because the other player failed
+        """
+        nb_players = len(players)
+
+        # Initialize the board
+        board = Board(nb_players)
+
+        # Let the players forget the previous game
+        if reset_players:
+            for player in players:
+                player.new_game()
+
+        if observers:
+            player_names = [player.name() for player in players]
+            event = GameStart(game_number, player_names, board)
+            for observer in observers:
+                observer.on_game_start(event)
+
+        trusted = [
+            self.trusted_referee and getattr(player, "trusted", False)
+            for player in players
+        ]
+        answers = [] if any(trusted) and self.verify_trusted_games else None
+
+        result = yield from self._referee(
+            players, board, observers, trusted, answers, game_number
+        )
+
+        if answers is not None:
+            replayed_board, replayed_result = self._replay(nb_players, answers)
+            if (
+                replayed_result != result
+                or replayed_board.position_key() != board.position_key()
+            ):
+                self.nb_corrected_games += 1
+                board, result = replayed_board, replayed_result
+
+        if observers:
+            event = GameEnd(
+                game_number, player_names, *result, board, think_times, seed
+            )
+            for observer in observers:
+                observer.on_game_end(event)
+
+        return result
+
+    def _referee(
+        self, players, board, observers, trusted=None, answers=None, game_number=1
+    ):
+        """
+        Apply the rules to the answers of the players, see _game_steps
+
+        Args:
+            trusted (list): for each player, True if its moves are played
+                without validation, except a sample of trusted_sample_rate
+            answers (list): if given, the answers of the players are appended
+                to it, to replay the game with _replay
+            game_number (int): the number of the game in the match, sent with
+                the events
+
+        Returns:
+            int: the index of the winning player, None if nobody won
+            Reason: the reason of the victory
+            bool: True if the game was won because the other player failed
+        """
+        nb_players = len(players)
+
+        # Placement the pawns
+        for pawn_nb, current_pawn in enumerate(board.pawns):
+            board_copy = board.copy()
+            # If pawn_nb == 1, the player_nb is 0, if pawn_nb == 2, the
+            # player_nb is 1, if pawn_nb == 3, the player_nb is 0, etc.
+            player_nb = (pawn_nb) % nb_players
+            player = players[player_nb]
+
+            # Ask the player where to place the pawn
+            position_choice = yield player_nb, PLACE_PAWN, (board_copy, current_pawn)
+            if answers is not None:
+                answers.append(position_choice)
+
+            # Place the pawn
+            success, reason = board.place_pawn(position_choice)
+
+            if observers:
+                event = Placement(
+                    game_number,
+                    player.name(),
+                    pawn_nb + 1,
+                    position_choice,
+                    success,
+                    reason,
+                    board,
+                )
+                for observer in observers:
+                    observer.on_placement(event)
+
+            if not success:
+                return (player_nb + 1) % nb_players, reason, True
+
+        # Play the game
+        reason = None
+        first_move_turn = board.turn_number
+        while not board.is_game_over():
+            player_nb = board.player_turn - 1
+            current_player = players[player_nb]
+            board_copy = board.copy()
+
+            # Ask the player where to move the pawn
+            pawn_nb, move_choice, build_choice = (
+                yield player_nb,
+                PLAY_MOVE,
+                (board_copy,),
+            )
+
+            if answers is not None:
+                answers.append((pawn_nb, move_choice, build_choice))
+
+            # Move the pawn. The first move is always validated: it is the only
+            # one a player can be asked while stuck, the next players are
+            # checked by the previous move
+            if (
+                trusted
+                and trusted[player_nb]
+                and board.turn_number > first_move_turn
+                and self.sample_random.random() >= self.trusted_sample_rate
+            ):
+                try:
+                    success, reason = board.play_move_trusted(
+                        pawn_nb, move_choice, build_choice
                     )
-                    self.display_message(f"   Player '{player.name()}' loses")
-                    dic_win_lose_type[player.name()] = register_new_victory_type(
-                        dic_win_lose_type[player.name()],
-                        f"Pawn placed at an invalid position: {reason}",
+                except Exception:
+                    if answers is not None:
+                        # The board may have been broken by an earlier invalid
+                        # trusted move, which is found by the replay
+                        return None, None, False
+                    # The answer raised before changing the board, it is
+                    # validated to forfeit the player
+                    success, reason = board.play_move(
+                        pawn_nb, move_choice, build_choice
                     )
-                    nb_victories[player_names[(player_nb + 1) % NB_PLAYERS]] += 1
-                    break
-
-                self.display_message(f"   Pawn placed at position {position_choice}", 2)
-                if self.display_board and window is not None:
-                    update_board(window, board)
-                sleep(self.delay_between_moves)
-
-            # Play the game
-            self.display_message("\nPlaying the game")
-            while not board.is_game_over():
-                current_player = players[board.player_turn - 1]
-                # current_pawn = board.get_playing_pawn()
-                # self.display_message(f"   Current pawn: {current_pawn}", 2)
-
-                # Check if the player can move
-                # if len(board.get_possible_movement_positions(current_pawn)) == 0:
-                #     self.display_message("   The pawn cannot move", 2)
-                #     board.next_turn()
-                #     # We don't ask the player to move, we just skip his turn
-                #     continue
-
-                board_copy = board.copy()
-                # current_pawn_copy = board_copy.get_playing_pawn()
-
-                # Ask the player where to move the pawn
-                # player = players[current_pawn.player_number - 1]
-                self.display_message(
-                    f"Player '{current_player.name()}' is moving a pawn", 2
-                )
-                pawn_nb, move_choice, build_choice = current_player.play_move(
-                    board_copy
+            else:
+                success, reason = board.play_move(pawn_nb, move_choice, build_choice)
+
+            if observers:
+                event = Move(
+                    game_number,
+                    current_player.name(),
+                    pawn_nb,
+                    move_choice,
+                    build_choice,
+                    success,
+                    reason,
+                    board,
                 )
+                for observer in observers:
+                    observer.on_move(event)
 
-                # Move the pawn
-                success, reason = board.play_move(pawn_nb, move_choice, build_choice)
+            if not success:
+                return board.player_turn % nb_players, reason, True
 
-                if not success:
-                    self.display_message(
-                        f"   Pawn moved at an invalid position: {reason}", 1
-                    )
-                    self.display_message(f"   Player '{current_player.name()}' loses")
-                    dic_win_lose_type[current_player.name()] = (
-                        register_new_victory_type(
-                            dic_win_lose_type[current_player.name()], reason
-                        )
-                    )
+        # Game is over
+        winner_number = board.winner_player_number
+        if winner_number is None:
+            return None, reason, False
+        return winner_number - 1, reason, False
 
-                    other_player_name_id = (board.player_turn - 1) % NB_PLAYERS
-                    other_player_name = player_names[other_player_name_id]
-                    nb_victories[other_player_name] += 1
+    def _replay(self, nb_players, answers):
+        """
+        Replay a game from the answers of its players, validating all of them
 
-                    break
+        Args:
+            nb_players (int): the number of players
+            answers (list): the answers recorded by _referee
 
-                # Log the move details
-                self.display_message(
-                    f"   Pawn moved at position {move_choice}\
-                      and built at position {build_choice}",
-                    2,
-                )
-                self.display_message(board, 2)
+        Returns:
+            Board: the board at the end of the replay
+            tuple: the result of the game, see _game_steps
+        """
+        board = Board(nb_players)
+        nb_pawns = len(board.pawns)
 
-                # Update the board display
-                if window and self.display_board:
-                    update_board(window, board)
+        for answer_nb, answer in enumerate(answers):
+            if answer_nb < nb_pawns:
+                success, reason = board.place_pawn(answer)
+                if not success:
+                    return board, ((answer_nb + 1) % nb_players, reason, True)
+                continue
 
-                    # Sleep between moves
-                    if self.delay_between_moves > 0:
-                        sleep(self.delay_between_moves)
+            success, reason = board.play_move(*answer)
+            if not success:
+                return board, (board.player_turn % nb_players, reason, True)
+            if board.is_game_over():
+                break
 
-            # Game is over
-            winner_number = board.winner_player_number
-            if winner_number is None:
-                self.display_message("Draw")
-            else:
-                winner_player_name = players[winner_number - 1].name()
-                self.display_message(f"Player '{winner_player_name}' wins!")
-                dic_win_lose_type[winner_player_name] = register_new_victory_type(
-                    dic_win_lose_type[winner_player_name],
-                    reason,
-                )
+        if not board.is_game_over():
+            raise RuntimeError("A trusted move failed, but all the moves are valid")
 
-                nb_victories[winner_player_name] += 1
+        return board, (board.winner_player_number - 1, reason, False)
 
-        # Display the results
-        print("\nResults:")
-        print(
-            f"Player {players[0].name()} won {nb_victories[players[0].name()]}\
- time{'s' if nb_victories[players[0].name()] != 1 else ''} ("
-            + str(round(nb_victories[players[0].name()] / nb_games * 100, 2))
-            + "%)"
-        )
-        print(
-            f"Player {players[1].name()} won {nb_victories[players[1].name()]}\
- time{'s' if nb_victories[players[1].name()] != 1 else ''} ("
-            + str(round(nb_victories[players[1].name()] / nb_games * 100, 2))
-            + "%)"
+
+def ask_batch(player: Player, decision, args_list):
+    """
+    Ask a player to take the same kind of decision on several boards, in a
+    single call if it is a BatchedPlayer
+
+    Args:
+        player (Player): the player to ask
+        decision (str): PLACE_PAWN or PLAY_MOVE
+        args_list (list): the arguments of the player method for each board
+
+    Returns:
+        list: the answer of the player for each board
+    """
+    if not isinstance(player, BatchedPlayer):
+        return [getattr(player, decision)(*args) for args in args_list]
+
+    if decision == PLAY_MOVE:
+        answers = player.play_moves([args[0] for args in args_list])
+    else:
+        answers = player.place_pawns(
+            [args[0] for args in args_list], [args[1] for args in args_list]
         )
 
-        # Close the window
-        if self.display_board:
-            close_window(window)
+    if len(answers) != len(args_list):
+        raise ValueError(
+            f"{player.name()} answered {len(answers)} times"
+            f" to {len(args_list)} boards"
+        )
 
-        return nb_victories, dic_win_lose_type
+    return answers
 
 
 def register_new_victory_type(dic_win_lose_types, s_msg):
@@ -227,8 +985,8 @@ def register_new_victory_type(dic_win_lose_types, s_msg):
     and keeps track on a counter for each type of already registered
     type
     Args:
-        dic_win_lose_types:
-        s_msg:
+        dic_win_lose_types: the counters, keyed by reason
+        s_msg: the reason, a Reason of the board
 
     Returns:
 
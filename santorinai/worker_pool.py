@@ -0,0 +1,353 @@
+import itertools
+import os
+import pickle
+import random
+import signal
+import traceback
+from multiprocessing import get_all_start_methods, get_context
+from queue import Empty
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from santorinai.observers import GameEnd, Observer
+from santorinai.player import Player
+
+# A pool of worker processes playing the games of Tester.play_1v1_parallel.
+#
+# The workers are started once and kept across matches: the interpreter
+# startup, the imports and the creation of the players are paid once per
+# worker, not once per match. Each worker keeps the players it created, by
+# class, constructor arguments and player number.
+#
+# The games of a match are sent in chunks to a single task queue, from which
+# each worker takes the next chunk as soon as it is done with its own: a
+# worker stuck in long games takes fewer chunks. The chunks get smaller as
+# the match ends, so that the workers finish together. Only a few chunks per
+# worker are queued at a time, so that a match stopped early (SPRT, Ctrl-C)
+# wastes little work.
+
+# Modules imported by the fork server, inherited by all the workers
+PRELOADED_MODULES = ["santorinai.tester"]
+
+# Settings of the Tester applied by the workers
+REFEREE_SETTINGS = ("trusted_referee", "trusted_sample_rate", "verify_trusted_games")
+
+
+def player_spec(player) -> Tuple[type, Dict]:
+    """
+    Gets the (Player class, constructor arguments) of a player given as a
+    class or as such a tuple, the player number excluded.
+    """
+    if isinstance(player, Player):
+        raise TypeError(
+            f"{player.name()} is a Player instance, give its class, or"
+            " (class, constructor arguments), to create it in the workers"
+        )
+    if isinstance(player, tuple):
+        player_class, kwargs = player
+    else:
+        player_class, kwargs = player, {}
+    if not (isinstance(player_class, type) and issubclass(player_class, Player)):
+        raise TypeError(f"{player_class} is not a Player class")
+    return player_class, dict(kwargs)
+
+
+class _GameEndRecorder(Observer):
+    """
+    Keeps the last GameEnd event of a worker, to send it to the main process.
+    """
+
+    def __init__(self):
+        self.event = None
+
+    def on_game_end(self, event: GameEnd):
+        self.event = event
+
+
+def _worker_player(players, spec, number) -> Player:
+    player_class, kwargs = spec
+    key = (player_class, number, pickle.dumps(sorted(kwargs.items())))
+    player = players.get(key)
+    if player is None:
+        player = players[key] = player_class(number, **kwargs)
+    return player
+
+
+def play_chunk(tester, players, game_numbers, seed=None, record=False) -> List[Tuple]:
+    """
+    Plays games with the referee of a Tester, without observers.
+
+    Args:
+        tester (Tester): The referee.
+        players (list): The players, in playing order.
+        game_numbers (list): The numbers of the games.
+        seed: If not None, the random module is seeded before each game from
+            this seed and the game number, like in Tester.play_1v1.
+        record (bool): If True, the final board and the time taken by each
+            player are returned too.
+
+    Returns:
+        list: For each game, the tuple yielded by WorkerPool.play_games.
+    """
+    games = []
+    for game_number in game_numbers:
+        game_seed = None
+        if seed is not None:
+            game_seed = f"{seed}:{game_number}"
+            random.seed(game_seed)
+
+        if not record:
+            result = tester._play_game(players, (), game_number, game_seed)
+            games.append((game_number, *result, None, None))
+            continue
+
+        recorder = _GameEndRecorder()
+        result = tester._play_game(players, [recorder], game_number, game_seed)
+        event = recorder.event
+        games.append((game_number, *result, event.board.to_bytes(), event.think_times))
+    return games
+
+
+def _pool_worker(tasks, results, first_live_match):
+    """
+    Plays the chunks of games of the task queue until it gets None.
+    """
+    # Ctrl-C is handled by the main process, which stops its match
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    from santorinai.tester import Tester
+
+    tester = Tester()
+    tester.verbose_level = 0
+    players = {}
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+
+        match_id, specs, game_numbers, settings, seed, record = task
+        if match_id < first_live_match.value:
+            # The match was stopped, its remaining chunks are skipped
+            results.put((match_id, None))
+            continue
+
+        try:
+            match_players = [
+                _worker_player(players, spec, number)
+                for number, spec in enumerate(specs, 1)
+            ]
+            if game_numbers is None:
+                answer = [player.name() for player in match_players]
+            else:
+                for name, value in settings.items():
+                    setattr(tester, name, value)
+                answer = play_chunk(tester, match_players, game_numbers, seed, record)
+        except Exception:
+            answer = traceback.format_exc()
+        results.put((match_id, answer))
+
+
+class WorkerPool:
+    """
+    Long-lived worker processes playing the games of the matches of
+    Tester.play_1v1_parallel, see the top of this module.
+
+    Usage:
+
+        with WorkerPool(nb_workers=8, preload=["my_players"]) as pool:
+            for player2 in opponents:
+                tester.play_1v1_parallel(pool, MyPlayer, player2, nb_games=1000)
+
+    The players are given by class, or as (class, constructor arguments)
+    tuples: they are created in the workers, which must be able to import
+    their module.
+
+    Attributes:
+        nb_workers (int): The number of worker processes.
+        max_chunk_size (int): The maximum number of games sent at once to a
+            worker.
+        pids (list): The process ids of the workers.
+    """
+
+    def __init__(
+        self,
+        nb_workers: Optional[int] = None,
+        preload: Sequence[str] = (),
+        start_method: Optional[str] = None,
+        max_chunk_size: int = 16,
+    ):
+        """
+        Args:
+            nb_workers (int): The number of worker processes, the number of
+                CPUs by default.
+            preload (list): Modules imported once by the fork server, before
+                the workers are forked from it: the modules of the players and
+                of what they load (models, opening books...).
+            start_method (str): The multiprocessing start method, "forkserver"
+                by default if the platform has it, else "spawn".
+            max_chunk_size (int): The maximum number of games sent at once to
+                a worker.
+        """
+        if max_chunk_size <= 0:
+            raise ValueError("The chunk size should be positive")
+        self.nb_workers = nb_workers or os.cpu_count() or 1
+        self.max_chunk_size = max_chunk_size
+
+        if start_method is None:
+            if "forkserver" in get_all_start_methods():
+                start_method = "forkserver"
+            else:
+                start_method = "spawn"
+        context = get_context(start_method)
+        if start_method == "forkserver":
+            context.set_forkserver_preload(PRELOADED_MODULES + list(preload))
+
+        self._tasks = context.Queue()
+        self._results = context.Queue()
+        # Matches before this one were stopped, their chunks are skipped
+        self._first_live_match = context.Value("q", 0)
+        self._match_ids = itertools.count()
+        self._processes = [
+            context.Process(
+                target=_pool_worker,
+                args=(self._tasks, self._results, self._first_live_match),
+                daemon=True,
+            )
+            for _ in range(self.nb_workers)
+        ]
+        for process in self._processes:
+            process.start()
+        self.pids = [process.pid for process in self._processes]
+
+    def player_names(self, specs: Sequence[Tuple[type, Dict]]) -> List[str]:
+        """
+        Gets the names of the players of a match, created by a worker which
+        keeps them for the games.
+
+        Args:
+            specs (list): The (Player class, constructor arguments) of each
+                player, see player_spec.
+        """
+        match_id = self._start_match()
+        try:
+            self._tasks.put((match_id, list(specs), None, None, None, False))
+            while True:
+                result_match_id, names = self._get_result()
+                if result_match_id == match_id:
+                    return names
+        finally:
+            self._stop_match(match_id)
+
+    def play_games(
+        self,
+        specs: Sequence[Tuple[type, Dict]],
+        first_game: int,
+        last_game: int,
+        settings: Optional[Dict] = None,
+        seed=None,
+        record: bool = False,
+    ) -> Iterator[Tuple]:
+        """
+        Plays games in the workers. The results are yielded by game number;
+        closing the generator stops the match.
+
+        Args:
+            specs (list): The (Player class, constructor arguments) of each
+                player, in playing order.
+            first_game (int): The number of the first game.
+            last_game (int): The number of the last game.
+            settings (dict): The referee settings of the Tester, see
+                REFEREE_SETTINGS.
+            seed: If not None, the random module is seeded before each game
+                from this seed and the game number, like in Tester.play_1v1.
+            record (bool): If True, the final board and the time taken by
+                each player are sent back too.
+
+        Yields:
+            tuple: The game number, the result of the game (winner index,
+            reason, forfeit), the final board encoded by Board.to_bytes and
+            the time taken by each player, both None if record is False.
+        """
+        specs = list(specs)
+        settings = dict(settings or {})
+        match_id = self._start_match()
+        next_game = first_game
+        expected_game = first_game
+        finished_games = {}
+        nb_queued_chunks = 0
+
+        try:
+            while expected_game <= last_game:
+                # Keep a few chunks per worker queued
+                while next_game <= last_game and nb_queued_chunks < 2 * self.nb_workers:
+                    nb_remaining_games = last_game - next_game + 1
+                    chunk_size = max(
+                        1,
+                        min(
+                            self.max_chunk_size,
+                            nb_remaining_games // (2 * self.nb_workers),
+                        ),
+                    )
+                    game_numbers = range(next_game, next_game + chunk_size)
+                    self._tasks.put(
+                        (match_id, specs, game_numbers, settings, seed, record)
+                    )
+                    next_game += chunk_size
+                    nb_queued_chunks += 1
+
+                result_match_id, games = self._get_result()
+                if result_match_id != match_id:
+                    continue  # Chunk of a stopped match
+                nb_queued_chunks -= 1
+                if isinstance(games, str):
+                    raise RuntimeError(f"A worker failed to play games:\n{games}")
+
+                for game in games:
+                    finished_games[game[0]] = game
+                while expected_game in finished_games:
+                    yield finished_games.pop(expected_game)
+                    expected_game += 1
+        finally:
+            self._stop_match(match_id)
+
+    def close(self):
+        """
+        Stops the workers.
+        """
+        if not self._processes:
+            return
+
+        self._stop_match(next(self._match_ids))
+        for _ in self._processes:
+            self._tasks.put(None)
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self._processes = []
+        self._tasks.close()
+        self._results.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def _start_match(self) -> int:
+        if not self._processes:
+            raise ValueError("The pool is closed")
+        return next(self._match_ids)
+
+    def _stop_match(self, match_id: int):
+        # The chunks left in the queue are skipped by the workers
+        self._first_live_match.value = match_id + 1
+
+    def _get_result(self):
+        while True:
+            try:
+                return self._results.get(timeout=1)
+            except Empty:
+                if any(process.exitcode is not None for process in self._processes):
+                    raise RuntimeError("A worker of the pool died")
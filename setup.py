@@ -18,4 +18,5 @@ setup(
     keywords=["santorini", "ai", "boardgame"],
     python_requires=">=3.6",
     install_requires=["pysimplegui"],
+    extras_require={"images": ["pillow"]},  # PNG and GIF offline rendering
 )
@@ -0,0 +1,79 @@
+# Test file for async_tester.py
+
+import asyncio
+import unittest
+
+from santorinai.async_tester import AsyncTester
+from santorinai.player import AsyncPlayer
+from santorinai.sprt import SPRT
+from santorinai.tester import Tester
+from santorinai.player_examples.random_player import RandomPlayer
+from santorinai.player_examples.first_choice_player import FirstChoicePlayer
+
+
+class SlowFirstChoicePlayer(AsyncPlayer):
+    """
+    A first choice player waiting before each decision, like a remote player
+    """
+
+    def __init__(self, player_number, log_level=0) -> None:
+        super().__init__(player_number, log_level)
+        self.player = FirstChoicePlayer(player_number)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def name(self):
+        return "Slow First"
+
+    async def wait(self):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+
+    async def place_pawn(self, board, pawn):
+        await self.wait()
+        return self.player.place_pawn(board, pawn)
+
+    async def play_move(self, board):
+        await self.wait()
+        return self.player.play_move(board)
+
+
+class TestAsyncTester(unittest.TestCase):
+    def test_play_1v1(self):
+        tester = AsyncTester()
+        tester.verbose_level = 0
+        tester.max_in_flight_per_player = 4
+
+        player1 = SlowFirstChoicePlayer(1)
+        player2 = RandomPlayer(2)
+        nb_victories, dic_win_lose_type = tester.play_1v1(player1, player2, nb_games=20)
+
+        self.assertEqual(sum(nb_victories.values()), 20)
+        self.assertEqual(set(dic_win_lose_type), {"Slow First", "Randy Random"})
+
+        # The games were interleaved, within the limit of the player
+        self.assertGreater(player1.max_in_flight, 1)
+        self.assertLessEqual(player1.max_in_flight, 4)
+
+    def test_async_player_in_sync_tester(self):
+        tester = Tester()
+        tester.verbose_level = 0
+        self.assertRaises(
+            TypeError, tester.play_1v1, SlowFirstChoicePlayer(1), RandomPlayer(2)
+        )
+
+    def test_unsupported_arguments(self):
+        tester = AsyncTester()
+        tester.verbose_level = 0
+        for kwargs in [{"sprt": SPRT(-100, 100)}, {"checkpoint": "a.json"}]:
+            with self.assertRaises(ValueError):
+                tester.play_1v1(SlowFirstChoicePlayer(1), RandomPlayer(2), **kwargs)
+
+    def test_no_display(self):
+        tester = AsyncTester()
+        tester.display_board = True
+        self.assertRaises(
+            ValueError, tester.play_1v1, SlowFirstChoicePlayer(1), RandomPlayer(2)
+        )
@@ -1,5 +1,7 @@
 # Test file for board.py
 
+import pickle
+import random
 import unittest
 
 from santorinai.board import Board
@@ -140,12 +142,209 @@ class TestBoardTwoPlayers(unittest.TestCase):
         board.play_move_simple(pawn_move_number, move, build)
         self.assertEqual(board.pawns[pawn_move_number].pos, move)
         self.assertEqual(board.board[build[0]][build[1]], 1)
+
+    def test_compact_representation(self):
+        board = Board(self.NB_PLAYERS)
+        self.assertFalse(hasattr(board, "__dict__"))
+        self.assertFalse(hasattr(board.pawns[0], "__dict__"))
+
+        # The grid is a view on the flat cells
+        board.board[1][2] = 3
+        board.board[1][2] += 1
+        self.assertEqual(board.cells[1 * 5 + 2], 4)
+        self.assertEqual(board.board[1][2], 4)
+
+        # Pawn positions are packed cell indexes
+        board.pawns[0].pos = (4, 1)
+        self.assertEqual(board.pawns[0].cell, 21)
+        self.assertEqual(board.pawns[0].pos, (4, 1))
+        self.assertRaises(ValueError, board.pawns[0].move, (5, 0))
+
+        # Boards can be pickled
+        board_copy = pickle.loads(pickle.dumps(board))
+        self.assertEqual(board_copy.board, board.board)
+        self.assertEqual(board_copy.pawns[0].pos, (4, 1))
+
+    def test_lazy_iterators(self):
+        board = Board(self.NB_PLAYERS)
+        for position in [(0, 0), (0, 1), (2, 2), (4, 4)]:
+            board.place_pawn(position)
+        board.board[1][1] = 1
+        board.board[1][0] = 4
+
+        for pawn in board.pawns:
+            self.assertEqual(
+                list(board.iter_moves(pawn)),
+                board.get_possible_movement_positions(pawn),
+            )
+            self.assertEqual(
+                list(board.iter_move_builds(pawn)),
+                board.get_possible_movement_and_building_positions(pawn),
+            )
+
+        actions = list(board.iter_all_actions(1))
+        self.assertEqual(actions[0][0], 1)
+        self.assertEqual(actions[-1][0], 2)
+
+        # Stopping early leaves the pawn in place
+        pawn = board.pawns[0]
+        next(board.iter_move_builds(pawn))
+        self.assertEqual(pawn.pos, (0, 0))
+
+        self.assertTrue(board.has_any_move(1))
+        board.board[1][1] = 4
+        self.assertFalse(any(True for _ in board.iter_moves(pawn)))
+        self.assertTrue(board.has_any_move(1))
+
+    def test_winning_threats(self):
+        board = Board(self.NB_PLAYERS)
+        for position in [(0, 0), (4, 4), (2, 0), (4, 0)]:
+            board.place_pawn(position)
+        self.assertEqual(board.winning_threats(1), frozenset())
+
+        # Pawn 1 stands on level 2 next to two level 3 towers
+        board.board[0][0] = 2
+        board.board[0][1] = 3
+        board.board[1][1] = 3
+        self.assertEqual(board.winning_threats(1), {(0, 1), (1, 1)})
+        self.assertEqual(board.winning_threats(2), frozenset())
+
+        # Terminating a tower removes the threat, incrementally
+        self.assertTrue(board.play_move(2, (2, 1), (1, 1))[0])
+        self.assertEqual(board.winning_threats(1), {(0, 1)})
+
+        # Moving a pawn onto the tower removes it too
+        board_copy = board.copy()
+        board_copy.play_move_simple(1, (1, 0), (2, 0))
+        board_copy.pawns[1].move((0, 1))
+        self.assertEqual(board_copy.winning_threats(1), frozenset())
+        self.assertEqual(board.winning_threats(1), {(0, 1)})
+
+    def test_position_key(self):
+        board = Board(self.NB_PLAYERS)
+        for position in [(0, 0), (4, 4), (2, 0), (4, 0)]:
+            board.place_pawn(position)
+
+        # Same position reached by two orders of moves
+        board1 = board.copy()
+        board1.play_move_simple(0, (0, 1), (1, 1))
+        board1.play_move_simple(2, (3, 1), (2, 1))
+        board2 = board.copy()
+        board2.play_move_simple(2, (3, 1), (2, 1))
+        board2.play_move_simple(0, (0, 1), (1, 1))
+        self.assertEqual(board1.position_key(), board2.position_key())
+        self.assertNotEqual(board.position_key(), board1.position_key())
+
+        board2.next_turn()
+        self.assertNotEqual(board1.position_key(), board2.position_key())
+
+    def test_sample_random_action(self):
+        rng = random.Random(0)
+        board = Board(self.NB_PLAYERS)
+
+        # Placement
+        order, position, build = board.sample_random_action(rng)
+        self.assertEqual((order, build), (1, None))
+        self.assertTrue(board.place_pawn(position)[0])
+        for position in [(4, 4), (2, 0), (4, 0)]:
+            board.place_pawn(position)
+
+        # Every legal action is drawn, and only them
+        legal_actions = set(board.iter_all_actions(1))
+        drawn_actions = {
+            board.sample_random_action(rng) for _ in range(50 * len(legal_actions))
+        }
+        self.assertEqual(drawn_actions, legal_actions)
+
+        # Few legal actions: pawn 1 is stuck, pawn 2 can only go to (3, 0)
+        for x in range(5):
+            for y in range(5):
+                board.board[x][y] = 4
+        board.board[2][0] = 0
+        board.board[3][0] = 0
+        self.assertEqual(board.sample_random_action(rng), (2, (3, 0), (2, 0)))
+
+        # Nothing to play
+        board.board[3][0] = 4
+        self.assertIsNone(board.sample_random_action(rng))
+
+    def test_notation(self):
+        board = Board(self.NB_PLAYERS)
+        self.assertEqual(
+            board.to_notation(), "00000/00000/00000/00000/00000 --,--,--,-- 1 1 -"
+        )
+
+        board.place_pawn((1, 2))
+        board.board[4][0] = 3
+        self.assertEqual(
+            board.to_notation(), "00000/00000/00000/00000/30000 12,--,--,-- 2 2 -"
+        )
+
+        # Parsed back, with the same possible moves
+        for position in [(0, 0), (2, 2), (3, 0)]:
+            board.place_pawn(position)
+        board.play_move(1, (2, 1), (3, 1))
+        parsed_board = Board.from_notation(board.to_notation())
+        self.assertEqual(parsed_board.to_notation(), board.to_notation())
+        self.assertEqual(parsed_board.position_key(), board.position_key())
+        self.assertEqual(parsed_board.board, board.board)
+        self.assertEqual(
+            set(parsed_board.iter_all_actions(2)), set(board.iter_all_actions(2))
+        )
+
+        for notation in [
+            "",
+            "00000/00000/00000/00000/0000 --,--,--,-- 1 1 -",
+            "00000/00000/00000/00000/50000 --,--,--,-- 1 1 -",
+            "00000/00000/00000/00000/00000 11,11,--,-- 1 1 -",
+            "00000/00000/00000/00000/00000 55,--,--,-- 1 1 -",
+            "00000/00000/00000/00000/00000 --,--,-- 1 1 -",
+            "00000/00000/00000/00000/00000 --,--,--,-- 3 1 -",
+            "00000/00000/00000/00000/00000 --,--,--,-- 1 1 x",
+        ]:
+            with self.assertRaises(ValueError):
+                Board.from_notation(notation)
+
+    def test_bytes(self):
+        board = Board(self.NB_PLAYERS)
+        for position in [(0, 0), (4, 4), (2, 0), (4, 0)]:
+            board.place_pawn(position)
+        board.play_move(1, (0, 1), (1, 1))
+        board.board[3][3] = 4
+
+        data = board.to_bytes()
+        self.assertEqual(len(data), 16)
+        decoded_board = Board.from_bytes(data)
+        self.assertEqual(decoded_board.to_notation(), board.to_notation())
+
+        # A winner is kept
+        board.board[4][4] = 2
+        board.board[3][4] = 3
+        board.play_move(1, (3, 4), (2, 4))
+        self.assertEqual(board.winner_player_number, 2)
+        self.assertEqual(Board.from_bytes(board.to_bytes()).winner_player_number, 2)
+
+        with self.assertRaises(ValueError):
+            Board.from_bytes(data[:-1])
+
+
 class TestBoardThreePlayers(unittest.TestCase):
     NB_PLAYERS = 3
 
     def setUp(self):
         self.board = Board(self.NB_PLAYERS)
 
+    def test_notation_and_bytes(self):
+        board = self.board
+        for position in [(0, 0), (4, 4), (2, 0), (4, 0), (1, 3), (3, 1)]:
+            board.place_pawn(position)
+        board.play_move(1, (0, 1), (1, 1))
+
+        notation = board.to_notation()
+        self.assertEqual(notation.split(" ")[1:], ["01,44,20,40,13,31", "2", "8", "-"])
+        self.assertEqual(Board.from_notation(notation).to_notation(), notation)
+        self.assertEqual(Board.from_bytes(board.to_bytes()).to_notation(), notation)
+
     def test_init(self):
         # Test if the board is initialized correctly
         self.assertEqual(self.board.board_size, 5)
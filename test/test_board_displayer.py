@@ -0,0 +1,207 @@
+# Test file for board_displayer.py and geometry.py
+
+import unittest
+
+import PySimpleGUI as sg
+
+from santorinai.board import Board
+from santorinai.board_displayer.board_displayer import BoardRenderer, BoardView
+from santorinai.board_displayer.geometry import (
+    DRAWING_ORDER,
+    cell_shapes,
+    cells_to_redraw,
+    changed_cells,
+    front_cells,
+    pawn_shapes,
+    snapshot,
+)
+
+
+class RecordingGraph:
+    """
+    A graph recording the figures drawn on it, in stacking order.
+    """
+
+    def __init__(self):
+        self.figures = []
+        self.nb_drawn = 0
+        self.next_id = 1
+
+    def _draw(self, shape):
+        figure = self.next_id
+        self.next_id += 1
+        self.nb_drawn += 1
+        self.figures.append((figure, shape))
+        return figure
+
+    def erase(self):
+        self.figures = []
+
+    def draw_polygon(self, points, **kwargs):
+        return self._draw(("polygon", tuple(points)))
+
+    def draw_oval(self, top_left, bottom_right, **kwargs):
+        return self._draw(("oval", top_left, bottom_right))
+
+    def draw_text(self, text, location, **kwargs):
+        return self._draw(("text", text, location))
+
+    def delete_figure(self, figure):
+        self.figures = [drawn for drawn in self.figures if drawn[0] != figure]
+
+    def bring_figure_to_front(self, figure):
+        drawn = next(drawn for drawn in self.figures if drawn[0] == figure)
+        self.figures.remove(drawn)
+        self.figures.append(drawn)
+
+    def shapes(self):
+        return [shape for _, shape in self.figures]
+
+
+class FakeWindow:
+    """
+    A window holding a RecordingGraph, closed by the user after some reads.
+    """
+
+    def __init__(self, nb_reads_before_closing=None):
+        self.graph = RecordingGraph()
+        self.nb_reads = 0
+        self.nb_reads_before_closing = nb_reads_before_closing
+        self.closed = False
+
+    def __getitem__(self, key):
+        return self.graph
+
+    def read(self, timeout=None):
+        self.nb_reads += 1
+        if self.nb_reads == self.nb_reads_before_closing:
+            return sg.WIN_CLOSED, None
+        return "__TIMEOUT__", None
+
+    def close(self):
+        self.closed = True
+
+
+def start_fake_renderer(renderer, window):
+    # Like BoardRenderer.start, without a display
+    renderer._window = window
+    renderer._view = BoardView(window.graph)
+
+
+class TestBoardDisplayer(unittest.TestCase):
+    def test_cell_shapes(self):
+        # A cube of 3 faces for the floor and each level, up to the dome
+        self.assertEqual(len(cell_shapes(2, 2, 0)), 3)
+        self.assertEqual(len(cell_shapes(2, 2, 3)), 12)
+        self.assertEqual(len(cell_shapes(2, 2, 4)), 15)
+
+        # The floor does not depend on the tower
+        self.assertEqual(cell_shapes(1, 3, 2)[:3], cell_shapes(1, 3, 0))
+
+        # The shapes are computed once
+        self.assertIs(cell_shapes(1, 3, 2), cell_shapes(1, 3, 2))
+
+        # A pawn is higher on a tower
+        shadow = pawn_shapes(1, 3, 0, 1, 1)[0]
+        raised_shadow = pawn_shapes(1, 3, 2, 1, 1)[0]
+        self.assertGreater(raised_shadow[1][1], shadow[1][1])
+
+    def test_front_cells(self):
+        self.assertEqual(front_cells(0, 0), [])
+        self.assertEqual(front_cells(1, 1), [(1, 0), (0, 1), (0, 0)])
+        # The cells in front are drawn after
+        for i, j in DRAWING_ORDER:
+            index = DRAWING_ORDER.index((i, j))
+            for cell in front_cells(i, j):
+                self.assertGreater(DRAWING_ORDER.index(cell), index)
+
+    def test_changed_cells(self):
+        board = Board(2)
+        empty = snapshot(board)
+        board.place_pawn((1, 1))
+        board.board[3][2] = 2
+        frame = snapshot(board)
+
+        self.assertEqual(changed_cells(empty, empty), set())
+        self.assertEqual(changed_cells(empty, frame), {(1, 1), (3, 2)})
+        self.assertEqual(cells_to_redraw({(1, 1)}), {(1, 1), (1, 0), (0, 1), (0, 0)})
+
+        # Snapshots are not modified by the next moves
+        board.board[3][2] = 3
+        self.assertEqual(changed_cells(frame, snapshot(board)), {(3, 2)})
+
+    def test_board_view_draws_changed_cells(self):
+        board = Board(2)
+        board.place_pawn((2, 2))
+        board.place_pawn((3, 3))
+
+        graph = RecordingGraph()
+        view = BoardView(graph)
+        view.draw(snapshot(board))
+        nb_first_drawn = graph.nb_drawn
+
+        board.board[4][4] = 1
+        board.board[2][1] = 2
+        view.draw(snapshot(board))
+
+        # Only the 2 changed cells are drawn again
+        self.assertEqual(
+            graph.nb_drawn - nb_first_drawn,
+            len(cell_shapes(4, 4, 1)) + len(cell_shapes(2, 1, 2)),
+        )
+
+        # The result stacks like a full drawing of the board
+        full_graph = RecordingGraph()
+        BoardView(full_graph).draw(snapshot(board))
+        self.assertEqual(graph.shapes(), full_graph.shapes())
+
+    def test_renderer_drops_old_frames(self):
+        board = Board(2)
+        renderer = BoardRenderer(["Player 1", "Player 2"])
+
+        for position in [(0, 0), (1, 1), (2, 2), (3, 3)]:
+            board.place_pawn(position)
+            renderer.submit(board)
+
+        # Only the last snapshot is kept to be drawn
+        self.assertEqual(renderer.nb_dropped_frames, 3)
+        self.assertEqual(renderer._pending_frame, snapshot(board))
+
+    def test_renderer_frame_rate(self):
+        board = Board(2)
+        renderer = BoardRenderer(["Player 1", "Player 2"], fps=0.01)
+        window = FakeWindow()
+        start_fake_renderer(renderer, window)
+
+        # The first snapshot is drawn, the next ones wait for the next frame
+        for position in [(0, 0), (1, 1), (2, 2), (3, 3)]:
+            board.place_pawn(position)
+            renderer.submit(board)
+        self.assertEqual(renderer.nb_drawn_frames, 1)
+        self.assertEqual(window.nb_reads, 1)
+
+        # Only the last one is drawn when the window is closed
+        renderer.close()
+        self.assertEqual(renderer.nb_drawn_frames, 2)
+        self.assertEqual(renderer.nb_dropped_frames, 2)
+        self.assertTrue(window.closed)
+
+    def test_renderer_window_closed(self):
+        board = Board(2)
+        renderer = BoardRenderer(["Player 1", "Player 2"], fps=1000)
+        window = FakeWindow(nb_reads_before_closing=2)
+        start_fake_renderer(renderer, window)
+
+        renderer.submit(board)
+        renderer.wait(0.01)
+        self.assertTrue(renderer.closed)
+        self.assertTrue(window.closed)
+
+        # The next snapshots are ignored
+        renderer.submit(board)
+        renderer.close()
+        self.assertEqual(window.nb_reads, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
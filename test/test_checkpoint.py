@@ -0,0 +1,223 @@
+# Test file for checkpoint.py
+
+import json
+import os
+import random
+import signal
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from santorinai.checkpoint import InterruptGuard, MatchCheckpoint
+from santorinai.player_examples.first_choice_player import FirstChoicePlayer
+from santorinai.player_examples.random_player import RandomPlayer
+from santorinai.sprt import SPRT
+from santorinai.tester import Tester
+
+
+class InterruptedRandomPlayer(RandomPlayer):
+    """
+    A random player pressing Ctrl-C at its given move
+    """
+
+    def __init__(self, player_number, interrupted_move):
+        super().__init__(player_number)
+        self.nb_moves = 0
+        self.interrupted_move = interrupted_move
+
+    def play_move(self, board):
+        self.nb_moves += 1
+        if self.nb_moves == self.interrupted_move:
+            raise KeyboardInterrupt
+        return super().play_move(board)
+
+
+class InterruptingSPRT(SPRT):
+    """
+    A sequential test receiving a Ctrl-C while it counts its given game
+    """
+
+    def __init__(self, interrupted_game):
+        super().__init__(-20, 20)
+        self.interrupted_game = interrupted_game
+
+    def update(self, player1_won):
+        if self.nb_games + 1 == self.interrupted_game:
+            os.kill(os.getpid(), signal.SIGINT)
+        super().update(player1_won)
+
+
+def make_tester():
+    tester = Tester()
+    tester.verbose_level = 0
+    tester.checkpoint_interval = 4
+    return tester
+
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "match.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def play_interrupted_match(self, tester, nb_games, sprt=None):
+        # Interrupted in the middle of a game, then resumed
+        nb_victories, _ = tester.play_1v1(
+            InterruptedRandomPlayer(1, 60),
+            FirstChoicePlayer(2),
+            nb_games=nb_games,
+            sprt=sprt,
+            checkpoint=self.path,
+        )
+        self.assertTrue(tester.interrupted)
+        nb_finished_games = sum(nb_victories.values())
+        self.assertGreater(nb_finished_games, 0)
+        self.assertLess(nb_finished_games, nb_games)
+        self.assertEqual(
+            MatchCheckpoint.load(self.path).nb_played_games, nb_finished_games
+        )
+
+        results = tester.play_1v1(
+            RandomPlayer(1),
+            FirstChoicePlayer(2),
+            nb_games=nb_games,
+            sprt=sprt,
+            checkpoint=self.path,
+            resume=True,
+        )
+        self.assertFalse(tester.interrupted)
+        return results
+
+    def test_resume_seeded_match(self):
+        tester = make_tester()
+        tester.seed = 7
+        expected_results = tester.play_1v1(
+            RandomPlayer(1), FirstChoicePlayer(2), nb_games=30
+        )
+
+        self.assertEqual(self.play_interrupted_match(tester, 30), expected_results)
+
+    def test_resume_restores_random_state(self):
+        tester = make_tester()
+        random.seed(3)
+        expected_results = tester.play_1v1(
+            RandomPlayer(1), FirstChoicePlayer(2), nb_games=30
+        )
+
+        random.seed(3)
+        self.assertEqual(self.play_interrupted_match(tester, 30), expected_results)
+
+    def test_resume_sprt(self):
+        tester = make_tester()
+        tester.seed = 0
+        expected_sprt = SPRT(-20, 20)
+        tester.play_1v1(
+            RandomPlayer(1), FirstChoicePlayer(2), nb_games=200, sprt=expected_sprt
+        )
+
+        sprt = SPRT(-20, 20)
+        self.play_interrupted_match(tester, 200, sprt)
+        self.assertEqual(
+            (sprt.wins, sprt.losses, sprt.draws),
+            (expected_sprt.wins, expected_sprt.losses, expected_sprt.draws),
+        )
+
+        # A finished match is not played again
+        sprt = SPRT(-20, 20)
+        tester.play_1v1(
+            RandomPlayer(1),
+            FirstChoicePlayer(2),
+            nb_games=200,
+            sprt=sprt,
+            checkpoint=self.path,
+            resume=True,
+        )
+        self.assertEqual(sprt.nb_games, expected_sprt.nb_games)
+
+    def test_checkpoint_file(self):
+        tester = make_tester()
+        tester.play_1v1(
+            RandomPlayer(1), FirstChoicePlayer(2), nb_games=6, checkpoint=self.path
+        )
+
+        # Only the complete checkpoint is left
+        self.assertEqual(os.listdir(self.directory.name), ["match.json"])
+        with open(self.path) as file:
+            data = json.load(file)
+        self.assertEqual(data["nb_played_games"], 6)
+        self.assertEqual(sum(data["nb_victories"].values()), 6)
+
+        # Without resume, the match starts again
+        nb_victories, _ = tester.play_1v1(
+            RandomPlayer(1), FirstChoicePlayer(2), nb_games=2, checkpoint=self.path
+        )
+        self.assertEqual(sum(nb_victories.values()), 2)
+        self.assertEqual(MatchCheckpoint.load(self.path).nb_played_games, 2)
+
+        # Another match can't be resumed from it
+        with self.assertRaises(ValueError):
+            tester.play_1v1(
+                FirstChoicePlayer(1),
+                RandomPlayer(2),
+                checkpoint=self.path,
+                resume=True,
+            )
+
+    def test_interrupted_bookkeeping(self):
+        # Ctrl-C between the update of the victories and the one of the SPRT
+        tester = make_tester()
+        sprt = InterruptingSPRT(6)
+        nb_victories, _ = tester.play_1v1(
+            RandomPlayer(1),
+            FirstChoicePlayer(2),
+            nb_games=20,
+            sprt=sprt,
+            checkpoint=self.path,
+        )
+
+        # The game is fully counted, then the match stops
+        self.assertTrue(tester.interrupted)
+        self.assertEqual(sprt.nb_games, 6)
+        self.assertEqual(sprt.wins + sprt.losses, sum(nb_victories.values()))
+        progress = MatchCheckpoint.load(self.path)
+        self.assertEqual(progress.nb_played_games, 6)
+        self.assertEqual(progress.nb_victories, nb_victories)
+
+    def test_interrupted_first_game(self):
+        # The results are printed without any game played
+        tester = make_tester()
+        tester.verbose_level = 1
+        output = StringIO()
+        with redirect_stdout(output):
+            nb_victories, _ = tester.play_1v1(
+                InterruptedRandomPlayer(1, 1), FirstChoicePlayer(2), nb_games=5
+            )
+
+        self.assertTrue(tester.interrupted)
+        self.assertEqual(sum(nb_victories.values()), 0)
+        self.assertIn("won 0 times (0%)", output.getvalue())
+
+    def test_interrupt_guard(self):
+        guard = InterruptGuard()
+        with guard:
+            with self.assertRaises(KeyboardInterrupt):
+                os.kill(os.getpid(), signal.SIGINT)
+
+            steps = []
+            with self.assertRaises(KeyboardInterrupt):
+                with guard.deferred():
+                    os.kill(os.getpid(), signal.SIGINT)
+                    steps.append("after the signal")
+            self.assertEqual(steps, ["after the signal"])
+
+        self.assertIs(signal.getsignal(signal.SIGINT), signal.default_int_handler)
+
+    def test_load_missing_checkpoint(self):
+        self.assertIsNone(MatchCheckpoint.load(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+# Test file for env.py
+
+import random
+import unittest
+
+from santorinai.board import Board
+from santorinai.env import (
+    BATCHED,
+    NB_ACTIONS,
+    SUBPROCESS,
+    SantoriniEnv,
+    VecEnv,
+    decode_action,
+    encode_action,
+    encode_legal_mask,
+    observation_size,
+)
+from santorinai.player import Player
+from santorinai.player_examples.first_choice_player import FirstChoicePlayer
+from santorinai.player_examples.random_player import RandomPlayer
+from test.test_tester import BatchedFirstChoicePlayer
+
+
+class InvalidPlayer(Player):
+    """
+    A player placing its pawns outside of the board
+    """
+
+    def name(self):
+        return "Invalid"
+
+    def place_pawn(self, board, pawn):
+        return (5, 5)
+
+    def play_move(self, board):
+        return 1, (5, 5), (5, 5)
+
+
+def legal_actions(mask, env_nb=0):
+    return [
+        action for action in range(NB_ACTIONS) if mask[env_nb * NB_ACTIONS + action]
+    ]
+
+
+class TestActions(unittest.TestCase):
+    def test_encode_decode(self):
+        board = Board(2)
+        for position in [(0, 0), (4, 4), (2, 2), (4, 0)]:
+            self.assertEqual(
+                decode_action(board, encode_action(board, position)), position
+            )
+            board.place_pawn(position)
+
+        actions = set()
+        for ply in board.iter_all_actions(1):
+            action = encode_action(board, ply)
+            self.assertEqual(decode_action(board, action), ply)
+            actions.add(action)
+
+        # The legal mask has the actions of the legal plies
+        mask = encode_legal_mask(board)
+        self.assertEqual(set(legal_actions(mask)), actions)
+
+    def test_decode_off_board(self):
+        board = Board(2)
+        for position in [(0, 0), (4, 4), (2, 2), (4, 0)]:
+            board.place_pawn(position)
+        # Pawn 1 in the corner (0, 0), moving to (-1, -1)
+        self.assertEqual(decode_action(board, 0), (1, None, None))
+
+
+class TestSantoriniEnv(unittest.TestCase):
+    def test_random_games(self):
+        env = SantoriniEnv([RandomPlayer])
+        rng = random.Random(0)
+        rewards = set()
+        for seed in range(20):
+            observation, mask = env.reset(seed)
+            self.assertEqual(len(observation), observation_size(2))
+            done = False
+            while not done:
+                observation, reward, done, mask = env.step(
+                    rng.choice(legal_actions(mask))
+                )
+                if not done:
+                    self.assertEqual(reward, 0)
+            rewards.add(reward)
+            self.assertEqual(legal_actions(mask), [])
+
+        self.assertEqual(rewards, {-1.0, 1.0})
+        with self.assertRaises(RuntimeError):
+            env.step(0)
+
+    def test_observation(self):
+        env = SantoriniEnv([FirstChoicePlayer], agent_number=2)
+        observation, mask = env.reset()
+
+        # The opponent placed its first pawn in (0, 0)
+        self.assertEqual(sum(observation[:25]), 25)
+        self.assertEqual(observation[5 * 25 : 7 * 25].index(1), 25)
+        self.assertEqual(sum(observation[5 * 25 :]), 1)
+        self.assertEqual(len(legal_actions(mask)), 24)
+
+        observation, _, _, _ = env.step(24)
+        self.assertEqual(observation[5 * 25 + 24], 1)
+
+    def test_illegal_action_loses(self):
+        env = SantoriniEnv([RandomPlayer])
+        env.reset()
+        env.step(0)
+        _, reward, done, _ = env.step(0)
+        self.assertTrue(done)
+        self.assertEqual(reward, -1)
+
+    def test_invalid_opponent_loses(self):
+        env = SantoriniEnv([InvalidPlayer])
+        env.reset()
+        _, reward, done, _ = env.step(0)
+        self.assertTrue(done)
+        self.assertEqual(reward, 1)
+
+    def test_three_players(self):
+        env = SantoriniEnv([RandomPlayer, FirstChoicePlayer], agent_number=2)
+        observation, mask = env.reset(1)
+        self.assertEqual(len(observation), observation_size(3))
+        self.assertEqual(env.board.player_turn, 2)
+        self.assertIsInstance(env.opponents[3], FirstChoicePlayer)
+
+
+class TestVecEnv(unittest.TestCase):
+    def play(self, vec_env, nb_steps=40):
+        rng = random.Random(0)
+        observations, masks = vec_env.reset(0)
+        nb_games = 0
+        for _ in range(nb_steps):
+            actions = [
+                rng.choice(legal_actions(masks, env_nb))
+                for env_nb in range(vec_env.nb_envs)
+            ]
+            observations, rewards, dones, masks = vec_env.step(actions)
+            self.assertEqual(len(rewards), vec_env.nb_envs)
+            nb_games += sum(dones)
+        self.assertEqual(len(observations), vec_env.nb_envs * vec_env.observation_size)
+        return nb_games
+
+    def test_sequential(self):
+        vec_env = VecEnv(4, [RandomPlayer])
+        self.assertGreater(self.play(vec_env), 0)
+
+    def test_batched(self):
+        vec_env = VecEnv(8, [BatchedFirstChoicePlayer], mode=BATCHED)
+        self.assertGreater(self.play(vec_env), 0)
+
+        opponent = vec_env.group.envs[0].opponents[2]
+        self.assertIn(8, opponent.batch_sizes)
+
+    def test_subprocess(self):
+        with VecEnv(6, [RandomPlayer], mode=SUBPROCESS, nb_workers=2) as vec_env:
+            self.assertGreater(self.play(vec_env), 0)
+
+    def test_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            VecEnv(2, [RandomPlayer], mode="threads")
+        with self.assertRaises(ValueError):
+            VecEnv(2, [RandomPlayer]).step([0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+# Test file for evaluation_cache.py
+
+import unittest
+
+from santorinai.board import Board
+from santorinai.evaluation_cache import GAME, MOVE, RUN, EvaluationCache
+from santorinai.player_examples.first_choice_player import FirstChoicePlayer
+from santorinai.player_examples.random_player import RandomPlayer
+from santorinai.tester import Tester
+
+
+class CachedFirstChoicePlayer(FirstChoicePlayer):
+    """
+    A first choice player evaluating the positions it is given
+    """
+
+    def __init__(self, player_number, log_level=0, persistence=GAME):
+        super().__init__(player_number, log_level)
+        self.cache = EvaluationCache(capacity=1000, persistence=persistence)
+        self.nb_games = 0
+
+    def new_game(self):
+        self.nb_games += 1
+        self.cache.start_game()
+
+    def play_move(self, board):
+        self.cache.start_move()
+        self.cache.get_or_compute(board, lambda board: board.turn_number)
+        return super().play_move(board)
+
+
+def placed_board():
+    board = Board(2)
+    for position in [(0, 0), (4, 4), (2, 2), (4, 0)]:
+        board.place_pawn(position)
+    return board
+
+
+class TestEvaluationCache(unittest.TestCase):
+    def test_hits_and_misses(self):
+        cache = EvaluationCache()
+        board = placed_board()
+
+        self.assertIsNone(cache.get(board))
+        self.assertEqual(cache.get(board, 0), 0)
+        cache.put(board, 1.5)
+        self.assertEqual(cache.get(board), 1.5)
+        self.assertIn(board, cache)
+
+        # The same position reached by another board
+        self.assertEqual(cache.get_or_compute(placed_board(), len), 1.5)
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+        self.assertEqual(cache.hit_rate, 0.5)
+
+        # Another player to play is another position
+        board.next_turn()
+        self.assertNotIn(board, cache)
+
+    def test_lru_eviction(self):
+        cache = EvaluationCache(capacity=2)
+        boards = [placed_board() for _ in range(3)]
+        for level, board in enumerate(boards):
+            board.board[1][1] = level
+
+        cache.put(boards[0], 0)
+        cache.put(boards[1], 1)
+        cache.get(boards[0])  # boards[1] is now the least recently used
+        cache.put(boards[2], 2)
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 1)
+        self.assertIn(boards[0], cache)
+        self.assertNotIn(boards[1], cache)
+
+        cache.clear()
+        self.assertEqual((len(cache), cache.hits, cache.evictions), (0, 0, 0))
+
+    def test_persistence(self):
+        board = placed_board()
+        for persistence, kept_after_move, kept_after_game in [
+            (MOVE, False, False),
+            (GAME, True, False),
+            (RUN, True, True),
+        ]:
+            cache = EvaluationCache(persistence=persistence)
+            cache.put(board, 0)
+            cache.start_move()
+            self.assertEqual(board in cache, kept_after_move)
+            cache.put(board, 0)
+            cache.start_game()
+            self.assertEqual(board in cache, kept_after_game)
+
+        with self.assertRaises(ValueError):
+            EvaluationCache(persistence="forever")
+
+    def test_tester_starts_games(self):
+        tester = Tester()
+        tester.verbose_level = 0
+        for persistence in (GAME, RUN):
+            player = CachedFirstChoicePlayer(1, persistence=persistence)
+            tester.play_1v1(player, RandomPlayer(2), nb_games=5)
+
+            self.assertEqual(player.nb_games, 5)
+            if persistence == GAME:
+                # Only the positions of the last game are kept
+                self.assertLess(len(player.cache), player.cache.misses)
+            else:
+                self.assertEqual(len(player.cache), player.cache.misses)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+# Test file for fuzz.py
+
+import unittest
+
+from santorinai.board import Board
+from santorinai.fuzz import fuzz, load_backend, play_game, replay
+
+
+class NoCornerBoard(Board):
+    # A backend forgetting a placement position
+    def get_possible_movement_positions(self, pawn):
+        positions = super().get_possible_movement_positions(pawn)
+        return [position for position in positions if position != (0, 0)]
+
+
+class QuietWinBoard(Board):
+    # A backend answering another reason when a pawn reaches the top of a tower
+    def play_move(self, pawn_number, move_position, build_position):
+        success, reason = super().play_move(pawn_number, move_position, build_position)
+        if reason == "The player pawn reached the top of a tower.":
+            reason = "Victory."
+        return success, reason
+
+
+class TestFuzz(unittest.TestCase):
+    def test_same_backends_agree(self):
+        divergences, nb_plies = fuzz([Board, Board], nb_games=20, processes=1)
+        self.assertEqual(divergences, [])
+        self.assertGreater(nb_plies, 20 * 4)
+
+    def test_legal_plies_divergence(self):
+        divergence, _ = play_game([Board, NoCornerBoard], seed=0)
+        self.assertIsNotNone(divergence)
+        self.assertEqual(divergence.plies, [])
+        self.assertIn("legal plies", divergence.description)
+        self.assertIn("(0, 0)", divergence.description)
+
+    def test_shrink_answer_divergence(self):
+        divergences, _ = fuzz([Board, QuietWinBoard], nb_games=2, processes=1)
+        self.assertEqual(len(divergences), 2)
+        divergence = divergences[1]
+        self.assertIn("Victory.", divergence.description)
+
+        # Shrunk to a minimal reproducer: no ply can be removed
+        backends = [Board, QuietWinBoard]
+        self.assertIsNotNone(replay(backends, divergence.nb_players, divergence.plies))
+        for ply_nb in range(len(divergence.plies)):
+            plies = divergence.plies[:ply_nb] + divergence.plies[ply_nb + 1 :]
+            self.assertIsNone(replay(backends, divergence.nb_players, plies))
+
+        # The reproducer is shorter than the original game
+        original, _ = play_game(backends, divergence.seed)
+        self.assertLess(len(divergence.plies), len(original.plies))
+
+    def test_parallel_fuzz(self):
+        divergences, nb_plies = fuzz(
+            [Board, NoCornerBoard], nb_games=4, processes=2, games_per_task=1
+        )
+        self.assertEqual([divergence.seed for divergence in divergences], [0, 1, 2, 3])
+
+    def test_load_backend(self):
+        self.assertIs(load_backend("santorinai.board:Board"), Board)
+        with self.assertRaises(ValueError):
+            load_backend("santorinai.board")
+
+
+if __name__ == "__main__":
+    unittest.main()
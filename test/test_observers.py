@@ -0,0 +1,141 @@
+# Test file for observers.py
+
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from santorinai.async_tester import AsyncTester
+from santorinai.observers import ConsoleLogger, Observer
+from santorinai.player_examples.first_choice_player import FirstChoicePlayer
+from santorinai.player_examples.random_player import RandomPlayer
+from santorinai.tester import Tester
+
+
+class RecordingObserver(Observer):
+    """
+    An observer recording the names of the events it receives
+    """
+
+    def __init__(self):
+        self.events = []
+
+    def on_game_start(self, event):
+        self.events.append(("game_start", event.game_number))
+
+    def on_placement(self, event):
+        self.events.append(("placement", event.pawn_number))
+
+    def on_move(self, event):
+        self.events.append(("move", event.player_name))
+
+    def on_game_end(self, event):
+        self.events.append(("game_end", event.winner_name))
+
+    def on_match_end(self, event):
+        self.events.append(("match_end", event.nb_played_games))
+
+
+class PliesByGameObserver(Observer):
+    """
+    An observer recording the turn number after each placement and valid move,
+    by game
+    """
+
+    def __init__(self):
+        self.turn_numbers = {}
+
+    def on_placement(self, event):
+        self.turn_numbers.setdefault(event.game_number, []).append(
+            event.board.turn_number
+        )
+
+    def on_move(self, event):
+        if event.success:
+            self.turn_numbers.setdefault(event.game_number, []).append(
+                event.board.turn_number
+            )
+
+
+class TestObservers(unittest.TestCase):
+    def test_events(self):
+        tester = Tester()
+        tester.verbose_level = 0
+        observer = RecordingObserver()
+        tester.subscribe(observer)
+
+        nb_victories, _ = tester.play_1v1(
+            FirstChoicePlayer(1), RandomPlayer(2), nb_games=3
+        )
+
+        names = [name for name, _ in observer.events]
+        self.assertEqual(names.count("game_start"), 3)
+        self.assertEqual(names.count("placement"), 12)
+        self.assertEqual(names.count("game_end"), 3)
+        self.assertEqual(observer.events[0], ("game_start", 1))
+        self.assertEqual(observer.events[1:5], [("placement", n) for n in range(1, 5)])
+        self.assertEqual(observer.events[-1], ("match_end", 3))
+
+        winners = [winner for name, winner in observer.events if name == "game_end"]
+        for player_name, nb_wins in nb_victories.items():
+            self.assertEqual(winners.count(player_name), nb_wins)
+
+        tester.unsubscribe(observer)
+        tester.play_1v1(FirstChoicePlayer(1), RandomPlayer(2))
+        self.assertEqual(len(names), len(observer.events))
+
+    def test_silent_run(self):
+        tester = Tester()
+        tester.verbose_level = 0
+        output = io.StringIO()
+        with redirect_stdout(output):
+            tester.play_1v1(FirstChoicePlayer(1), RandomPlayer(2), nb_games=2)
+        self.assertEqual(output.getvalue(), "")
+
+    def test_console_logger(self):
+        tester = Tester()
+        tester.verbose_level = 1
+        output = io.StringIO()
+        with redirect_stdout(output):
+            tester.play_1v1(FirstChoicePlayer(1), RandomPlayer(2), nb_games=2)
+
+        lines = output.getvalue().splitlines()
+        self.assertIn("Game 2", lines)
+        self.assertIn("Results:", lines)
+        self.assertNotIn("Player 'Firsty First' is moving a pawn", lines)
+
+        # Each move at verbose level 2
+        output = io.StringIO()
+        with redirect_stdout(output):
+            tester.subscribe(ConsoleLogger(2))
+            tester.verbose_level = 0
+            tester.play_1v1(FirstChoicePlayer(1), RandomPlayer(2))
+        self.assertIn("Player 'Firsty First' is moving a pawn", output.getvalue())
+
+    def test_async_and_batched_events(self):
+        for tester, play in [
+            (AsyncTester(), AsyncTester.play_1v1),
+            (Tester(), Tester.play_1v1_batched),
+        ]:
+            tester.verbose_level = 0
+            observer = RecordingObserver()
+            plies_observer = PliesByGameObserver()
+            tester.subscribe(observer)
+            tester.subscribe(plies_observer)
+            play(tester, FirstChoicePlayer(1), RandomPlayer(2), nb_games=4)
+
+            # The plies of the interleaved games are told apart
+            self.assertEqual(sorted(plies_observer.turn_numbers), [1, 2, 3, 4])
+            for turn_numbers in plies_observer.turn_numbers.values():
+                # The winning move does not change the turn
+                expected = list(range(2, len(turn_numbers) + 1))
+                self.assertEqual(turn_numbers[:-1], expected)
+
+            game_numbers = sorted(
+                number for name, number in observer.events if name == "game_start"
+            )
+            self.assertEqual(game_numbers, [1, 2, 3, 4])
+            self.assertEqual(observer.events[-1], ("match_end", 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+# Test file for offline_renderer.py
+
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ElementTree
+
+from santorinai.board import Board
+from santorinai.board_displayer import offline_renderer
+from santorinai.board_displayer.geometry import changed_cells, snapshot
+from santorinai.board_displayer.offline_renderer import (
+    GIF,
+    HEIGHT,
+    PNG,
+    SVG,
+    WIDTH,
+    GameRecorder,
+    board_image,
+    board_svg,
+    render_games,
+    save_board,
+)
+from santorinai.player_examples.first_choice_player import FirstChoicePlayer
+from santorinai.player_examples.random_player import RandomPlayer
+from santorinai.tester import Tester
+
+SVG_NAMESPACE = "{http://www.w3.org/2000/svg}"
+
+
+def record_games(nb_games, play=Tester.play_1v1):
+    tester = Tester()
+    tester.verbose_level = 0
+    recorder = GameRecorder()
+    tester.subscribe(recorder)
+    play(tester, RandomPlayer(1), FirstChoicePlayer(2), nb_games=nb_games)
+    return recorder.games
+
+
+class TestOfflineRenderer(unittest.TestCase):
+    def test_board_svg(self):
+        board = Board(2)
+        board.place_pawn((2, 2))
+        board.board[1][3] = 4
+
+        root = ElementTree.fromstring(board_svg(snapshot(board)))
+        self.assertEqual(root.get("width"), str(WIDTH))
+        self.assertEqual(root.get("height"), str(HEIGHT))
+
+        # A sprite per used tower level and pawn, placed on each cell
+        sprites = root.find(SVG_NAMESPACE + "defs")
+        self.assertEqual(
+            sorted(sprite.get("id") for sprite in sprites),
+            ["level-0", "level-4", "pawn-0-1-1"],
+        )
+        self.assertEqual(len(root.findall(SVG_NAMESPACE + "use")), 26)
+
+    def test_game_recorder(self):
+        games = record_games(2)
+
+        self.assertEqual([game.game_number for game in games], [1, 2])
+        for game in games:
+            # The empty board, the 4 placements and the moves
+            self.assertGreater(len(game.frames), 5)
+            self.assertEqual(game.frames[0], snapshot(Board(2)))
+            self.assertIn(game.winner_name, game.player_names + [None])
+
+    def test_game_recorder_batched(self):
+        # The games are played in lockstep, their events are interleaved
+        games = record_games(4, Tester.play_1v1_batched)
+
+        self.assertEqual([game.game_number for game in games], [1, 2, 3, 4])
+        for game in games:
+            self.assertEqual(game.frames[0], snapshot(Board(2)))
+            self.assertGreater(len(game.frames), 5)
+            self.assertIn(game.winner_name, game.player_names)
+
+            # Each frame follows the previous one of its game
+            for frame, next_frame in zip(game.frames, game.frames[1:]):
+                self.assertLessEqual(len(changed_cells(frame, next_frame)), 3)
+
+    def test_render_games_svg(self):
+        games = record_games(2)
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            paths = render_games(games, output_dir, formats=(SVG,), processes=1)
+
+            self.assertEqual(len(paths), sum(len(game.frames) for game in games))
+            self.assertEqual(
+                paths[0], os.path.join(output_dir, "game_0001", "frame_000.svg")
+            )
+            for path in paths:
+                ElementTree.parse(path)
+
+    def test_unknown_format(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            with self.assertRaises(ValueError):
+                save_board(Board(2), os.path.join(output_dir, "board.bmp"))
+            with self.assertRaises(ValueError):
+                render_games(record_games(1), output_dir, formats=("bmp",), processes=1)
+
+    @unittest.skipIf(offline_renderer.Image is None, "Pillow is not installed")
+    def test_render_games_images(self):
+        games = record_games(2)
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            paths = render_games(games, output_dir, formats=(PNG, GIF), processes=2)
+
+            self.assertEqual(
+                len(paths), sum(len(game.frames) for game in games) + len(games)
+            )
+            gif_path = os.path.join(output_dir, "game_0002.gif")
+            with offline_renderer.Image.open(gif_path) as gif:
+                self.assertEqual(gif.size, (WIDTH, HEIGHT))
+                self.assertEqual(gif.n_frames, len(games[1].frames))
+
+    @unittest.skipIf(offline_renderer.Image is None, "Pillow is not installed")
+    def test_board_image_pawns(self):
+        board = Board(2)
+        empty_image = board_image(snapshot(board))
+        board.place_pawn((0, 0))
+        image = board_image(snapshot(board))
+
+        self.assertEqual(image.size, (WIDTH, HEIGHT))
+        self.assertNotEqual(image.tobytes(), empty_image.tobytes())
+
+
+if __name__ == "__main__":
+    unittest.main()
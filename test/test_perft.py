@@ -0,0 +1,65 @@
+# Test file for perft.py
+
+import unittest
+
+from santorinai.board import Board
+from santorinai.perft import KNOWN_PERFT, divide, opening_board, perft
+
+
+class TestPerft(unittest.TestCase):
+    def test_known_counts(self):
+        for name, counts in KNOWN_PERFT.items():
+            board = opening_board(name)
+            for depth, count in counts.items():
+                if count < 100000:
+                    self.assertEqual(perft(board, depth), count, (name, depth))
+
+    def test_hashing_gives_the_same_counts(self):
+        board = opening_board("corners, 2 players")
+        table = {}
+        self.assertEqual(perft(board, 3, table), KNOWN_PERFT["corners, 2 players"][3])
+        self.assertGreater(len(table), 0)
+
+    def test_divide(self):
+        board = opening_board("corners, 2 players")
+        counts = divide(board, 2)
+        self.assertEqual(len(counts), KNOWN_PERFT["corners, 2 players"][1])
+        self.assertEqual(sum(counts.values()), KNOWN_PERFT["corners, 2 players"][2])
+        self.assertIn((1, (1, 1), (0, 0)), counts)
+
+        with self.assertRaises(ValueError):
+            divide(board, 0)
+
+    def test_finished_games_are_not_expanded(self):
+        board = opening_board("corners, 2 players")
+        board.board[1][1] = 1
+        board.board[0][0] = 2
+
+        # Moving to (0, 1) at level 3 wins, the position has no following plies
+        board.board[0][1] = 3
+        winning_move = (1, (0, 1), (0, 0))
+        counts = divide(board, 2)
+        self.assertEqual(counts[winning_move], 0)
+        self.assertEqual(perft(board, 1), len(counts))
+
+    def test_board_is_not_modified(self):
+        board = opening_board("centre cross, 2 players")
+        expected = board.copy()
+        perft(board, 2)
+        self.assertEqual(board.board, expected.board)
+        self.assertEqual(
+            [pawn.pos for pawn in board.pawns], [pawn.pos for pawn in expected.pawns]
+        )
+        self.assertEqual(board.player_turn, expected.player_turn)
+
+    def test_other_backend(self):
+        # Any class with the interface of Board can be counted
+        class SubclassBoard(Board):
+            pass
+
+        board = opening_board("centre cross, 2 players", SubclassBoard)
+        self.assertEqual(perft(board, 2), KNOWN_PERFT["centre cross, 2 players"][2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+# Test file for playout.py
+
+import random
+import unittest
+
+from santorinai.board import Board
+from santorinai.playout import fast_playout
+
+
+class TestFastPlayout(unittest.TestCase):
+    def test_playout_ends_with_a_winner(self):
+        rng = random.Random(0)
+        for nb_players in (2, 3):
+            for _ in range(20):
+                board = Board(nb_players)
+                self.assertIn(fast_playout(board, rng), range(1, nb_players + 1))
+                # The board is not modified
+                self.assertEqual(board.pawns[0].pos, (None, None))
+                self.assertEqual(board.turn_number, 1)
+
+    def test_playout_is_reproducible(self):
+        winners = [
+            [fast_playout(Board(2), random.Random(seed)) for seed in range(20)]
+            for _ in range(2)
+        ]
+        self.assertEqual(winners[0], winners[1])
+
+    def test_playout_of_a_finished_game(self):
+        board = Board(2)
+        board.winner_player_number = 2
+        self.assertEqual(fast_playout(board), 2)
+
+    def test_winning_move(self):
+        board = Board(2)
+        for position in [(0, 0), (4, 4), (2, 0), (4, 0)]:
+            board.place_pawn(position)
+
+        # Player 1 can only move its pawn 1 to the top of a tower
+        for x in range(5):
+            for y in range(5):
+                board.board[x][y] = 4
+        board.board[0][0] = 2
+        board.board[0][1] = 3
+        self.assertEqual(fast_playout(board, random.Random(0)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+# Test file for rating.py
+
+import unittest
+
+from santorinai.rating import MatchScheduler, RatingTable
+
+
+class TestRatingTable(unittest.TestCase):
+    def test_empty_player(self):
+        table = RatingTable()
+        table.add_player("A")
+        self.assertAlmostEqual(table.rating("A"), 0)
+
+    def test_ratings_order(self):
+        table = RatingTable()
+        table.add_match({"A": 80, "B": 20})
+        table.add_match({"B": 70, "C": 30})
+
+        self.assertGreater(table.rating("A"), table.rating("B"))
+        self.assertGreater(table.rating("B"), table.rating("C"))
+        self.assertEqual([row[0] for row in table.ratings()], ["A", "B", "C"])
+
+        # 80% score is about 240 Elo
+        difference = table.rating("A") - table.rating("B")
+        self.assertGreater(difference, 150)
+        self.assertLess(difference, 300)
+
+    def test_incremental_matches_batch(self):
+        incremental = RatingTable()
+        for _ in range(30):
+            incremental.add_result("A", "B")
+        for _ in range(10):
+            incremental.add_result("B", "A")
+
+        batch = RatingTable()
+        batch.add_result("A", "B", 30)
+        batch.add_result("B", "A", 10)
+
+        self.assertAlmostEqual(incremental.rating("A"), batch.rating("A"), delta=0.5)
+
+    def test_perfect_score_is_finite(self):
+        table = RatingTable()
+        table.add_result("A", "B", 100)
+        low, high = table.interval("A")
+        self.assertLess(low, table.rating("A"))
+        self.assertLess(table.rating("A"), high)
+        self.assertLess(high, float("inf"))
+
+    def test_interval_shrinks(self):
+        table = RatingTable()
+        table.add_result("A", "B", 5)
+        table.add_result("B", "A", 5)
+        error = table.standard_error("A")
+        table.add_result("A", "B", 50)
+        table.add_result("B", "A", 50)
+        self.assertLess(table.standard_error("A"), error)
+
+    def test_invalid_results(self):
+        table = RatingTable()
+        self.assertRaises(ValueError, table.add_result, "A", "A")
+        self.assertRaises(ValueError, table.add_result, "A", "B", 0)
+
+
+class TestMatchScheduler(unittest.TestCase):
+    def test_next_pairing_uncertain_players(self):
+        table = RatingTable()
+        scheduler = MatchScheduler(table, ["A", "B", "C"])
+        table.add_result("A", "B", 100)
+        table.add_result("B", "A", 100)
+
+        # C has never played, it should be in the next pairing
+        self.assertIn("C", scheduler.next_pairing())
+
+    def test_not_enough_players(self):
+        self.assertRaises(ValueError, MatchScheduler, RatingTable(), ["A"])
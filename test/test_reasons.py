@@ -0,0 +1,61 @@
+# Test file for reasons.py
+
+import json
+import os
+import tempfile
+import unittest
+
+from santorinai.board import Board
+from santorinai.checkpoint import MatchCheckpoint
+from santorinai.reasons import Reason, reason_code, reason_from_code
+
+
+class TestReasons(unittest.TestCase):
+    def test_board_reasons(self):
+        board = Board(2)
+        success, reason = board.place_pawn((5, 5))
+        self.assertFalse(success)
+        self.assertIs(reason, Reason.POSITION_OUTSIDE)
+
+        # The same member for every refusal, whatever the position
+        self.assertIs(board.place_pawn((1, "a"))[1], Reason.POSITION_NOT_INTEGERS)
+        self.assertIs(board.place_pawn((1, None))[1], Reason.POSITION_NOT_INTEGERS)
+        self.assertIs(board.place_pawn((0, 0))[1], Reason.PAWN_PLACED)
+
+    def test_message(self):
+        reason = Reason.TOWER_TOP
+        message = "The player pawn reached the top of a tower."
+        self.assertEqual(reason, message)
+        self.assertEqual(reason.message, message)
+        self.assertEqual(str(reason), message)
+        self.assertEqual(f"Won: {reason}", "Won: " + message)
+        self.assertEqual({message: 1}[reason], 1)
+
+    def test_codes(self):
+        self.assertEqual(reason_code(Reason.TOWER_TOP), "TOWER_TOP")
+        self.assertIs(reason_from_code("TOWER_TOP"), Reason.TOWER_TOP)
+
+        # Reasons which are not members are kept as they are
+        self.assertEqual(reason_code("Victory."), "Victory.")
+        self.assertEqual(reason_from_code("Victory."), "Victory.")
+
+    def test_checkpoint_codes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "match.json")
+            checkpoint = MatchCheckpoint(path, ["a", "b"])
+            dic_win_lose_type = {"a": {Reason.TOWER_TOP: 2}, "b": {"Victory.": 1}}
+            checkpoint.record(3, {"a": 2, "b": 1}, dic_win_lose_type)
+            checkpoint.save()
+
+            with open(path) as file:
+                self.assertEqual(
+                    json.load(file)["dic_win_lose_type"],
+                    {"a": {"TOWER_TOP": 2}, "b": {"Victory.": 1}},
+                )
+            restored = MatchCheckpoint.load(path).dic_win_lose_type
+            self.assertEqual(restored, dic_win_lose_type)
+            self.assertIs(next(iter(restored["a"])), Reason.TOWER_TOP)
+
+
+if __name__ == "__main__":
+    unittest.main()
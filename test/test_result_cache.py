@@ -0,0 +1,167 @@
+# Test file for result_cache.py
+
+import os
+import tempfile
+import unittest
+
+from santorinai.player_examples.basic_player import BasicPlayer
+from santorinai.player_examples.first_choice_player import FirstChoicePlayer
+from santorinai.player_examples.random_player import RandomPlayer
+from santorinai.result_cache import (
+    RULES_MODULES,
+    ResultCache,
+    player_source_hash,
+    rules_version,
+)
+from santorinai.results_store import ResultsStore
+from santorinai.sprt import SPRT
+from santorinai.tester import Tester
+from santorinai.worker_pool import WorkerPool
+
+
+class CountingRandomPlayer(RandomPlayer):
+    """
+    A random player counting the games it plays
+    """
+
+    nb_games = 0
+
+    def __init__(self, player_number, log_level=0, name="Counting"):
+        super().__init__(player_number, log_level)
+        self.player_name = name
+
+    def name(self):
+        return self.player_name
+
+    def new_game(self):
+        CountingRandomPlayer.nb_games += 1
+
+
+def make_tester(seed=0):
+    tester = Tester()
+    tester.verbose_level = 0
+    tester.seed = seed
+    return tester
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ResultCache(os.path.join(self.directory.name, "cache.db"))
+
+    def tearDown(self):
+        self.cache.close()
+        self.directory.cleanup()
+
+    def test_same_results_as_play_1v1(self):
+        tester = make_tester()
+        expected = tester.play_1v1(RandomPlayer(1), BasicPlayer(2), nb_games=30)
+        results = tester.play_1v1_cached(
+            self.cache, RandomPlayer, BasicPlayer, nb_games=30
+        )
+        self.assertEqual(results, expected)
+
+        # Read from the cache
+        cached_results = tester.play_1v1_cached(
+            self.cache, RandomPlayer, BasicPlayer, nb_games=30
+        )
+        self.assertEqual(cached_results, expected)
+
+    def test_only_missing_games_are_played(self):
+        tester = make_tester()
+        CountingRandomPlayer.nb_games = 0
+        tester.play_1v1_cached(
+            self.cache, CountingRandomPlayer, FirstChoicePlayer, nb_games=10
+        )
+        self.assertEqual(CountingRandomPlayer.nb_games, 10)
+
+        CountingRandomPlayer.nb_games = 0
+        nb_victories, _ = tester.play_1v1_cached(
+            self.cache, CountingRandomPlayer, FirstChoicePlayer, nb_games=25
+        )
+        self.assertEqual(CountingRandomPlayer.nb_games, 15)
+        self.assertEqual(sum(nb_victories.values()), 25)
+
+        # A shorter match only reads the cache
+        CountingRandomPlayer.nb_games = 0
+        nb_victories, _ = tester.play_1v1_cached(
+            self.cache, CountingRandomPlayer, FirstChoicePlayer, nb_games=5
+        )
+        self.assertEqual(CountingRandomPlayer.nb_games, 0)
+        self.assertEqual(sum(nb_victories.values()), 5)
+
+        # Another configuration, seed or referee is another match
+        for tester, player1 in [
+            (make_tester(), (CountingRandomPlayer, {"name": "Other"})),
+            (make_tester(seed=1), CountingRandomPlayer),
+        ]:
+            CountingRandomPlayer.nb_games = 0
+            tester.play_1v1_cached(self.cache, player1, FirstChoicePlayer, nb_games=5)
+            self.assertEqual(CountingRandomPlayer.nb_games, 5)
+
+        tester = make_tester()
+        tester.trusted_referee = True
+        CountingRandomPlayer.nb_games = 0
+        tester.play_1v1_cached(
+            self.cache, CountingRandomPlayer, FirstChoicePlayer, nb_games=5
+        )
+        self.assertEqual(CountingRandomPlayer.nb_games, 5)
+
+    def test_sprt_and_observers(self):
+        tester = make_tester()
+        expected_sprt = SPRT(-100, 100)
+        expected = tester.play_1v1(
+            BasicPlayer(1), RandomPlayer(2), nb_games=500, sprt=expected_sprt
+        )
+
+        for _ in range(2):
+            sprt = SPRT(-100, 100)
+            with ResultsStore(":memory:") as store:
+                tester.subscribe(store)
+                results = tester.play_1v1_cached(
+                    self.cache, BasicPlayer, RandomPlayer, nb_games=500, sprt=sprt
+                )
+                tester.unsubscribe(store)
+                pairing = store.pairing("Extra BaThick!", RandomPlayer(1).name())
+
+            self.assertEqual(results, expected)
+            self.assertEqual(sprt.nb_games, expected_sprt.nb_games)
+            # The cached games are sent to the observers too
+            self.assertEqual(pairing.nb_games, expected_sprt.nb_games)
+
+    def test_pool(self):
+        tester = make_tester()
+        tester.play_1v1_cached(self.cache, RandomPlayer, FirstChoicePlayer, nb_games=10)
+
+        # The missing games are played by the workers
+        with WorkerPool(nb_workers=2) as pool:
+            results = tester.play_1v1_cached(
+                self.cache, RandomPlayer, FirstChoicePlayer, nb_games=30, pool=pool
+            )
+        self.assertEqual(
+            results,
+            tester.play_1v1(RandomPlayer(1), FirstChoicePlayer(2), nb_games=30),
+        )
+
+    def test_keys(self):
+        self.assertEqual(rules_version(), rules_version())
+        # The games are seeded by play_chunk
+        self.assertIn("santorinai.worker_pool", RULES_MODULES)
+        self.assertNotEqual(
+            player_source_hash(RandomPlayer), player_source_hash(CountingRandomPlayer)
+        )
+
+        specs = [(RandomPlayer, {}), (FirstChoicePlayer, {})]
+        key = self.cache.match_key(specs, 0, {})
+        self.assertEqual(self.cache.match_key(specs, 0, {}), key)
+        self.assertNotEqual(self.cache.match_key(specs, "0", {}), key)
+        self.assertNotEqual(self.cache.match_key(specs[::-1], 0, {}), key)
+
+        with self.assertRaises(ValueError):
+            make_tester(seed=None).play_1v1_cached(
+                self.cache, RandomPlayer, FirstChoicePlayer
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+# Test file for results_store.py
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from santorinai.checkpoint import MatchCheckpoint
+from santorinai.player_examples.first_choice_player import FirstChoicePlayer
+from santorinai.player_examples.random_player import RandomPlayer
+from santorinai.results_store import ResultsStore
+from santorinai.tester import Tester
+
+
+class CrashingRandomPlayer(RandomPlayer):
+    """
+    A random player crashing the tester at its given move
+    """
+
+    def __init__(self, player_number, crashing_move):
+        super().__init__(player_number)
+        self.nb_moves = 0
+        self.crashing_move = crashing_move
+
+    def play_move(self, board):
+        self.nb_moves += 1
+        if self.nb_moves == self.crashing_move:
+            raise RuntimeError("Crash")
+        return super().play_move(board)
+
+
+RANDOM = RandomPlayer(1).name()
+FIRST_CHOICE = FirstChoicePlayer(1).name()
+
+
+def make_tester(store):
+    tester = Tester()
+    tester.verbose_level = 0
+    tester.seed = 0
+    tester.subscribe(store)
+    return tester
+
+
+class TestResultsStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "results.db")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_match_results(self):
+        with ResultsStore(self.path, run="test", batch_size=7) as store:
+            tester = make_tester(store)
+            dic_win_lose_type = {RANDOM: {}, FIRST_CHOICE: {}}
+            nb_victories, dic_win_lose_type = tester.play_1v1(
+                RandomPlayer(1),
+                FirstChoicePlayer(2),
+                nb_games=20,
+                dic_win_lose_type=dic_win_lose_type,
+            )
+
+            pairing = store.pairing(RANDOM, FIRST_CHOICE)
+            self.assertEqual(pairing.nb_games, 20)
+            self.assertEqual(pairing.nb_victories, nb_victories)
+            self.assertGreater(pairing.plies, 20 * 4)
+            self.assertGreater(pairing.think_time1, 0)
+            self.assertEqual(
+                store.win_lose_types(RANDOM, FIRST_CHOICE),
+                dic_win_lose_type,
+            )
+
+            # The only run holds all the games
+            run_pairing = store.pairing(RANDOM, FIRST_CHOICE, "test")
+            for attribute in ("nb_games", "wins1", "wins2", "plies"):
+                self.assertEqual(
+                    getattr(run_pairing, attribute), getattr(pairing, attribute)
+                )
+            self.assertAlmostEqual(run_pairing.think_time1, pairing.think_time1)
+
+            ratings = {
+                name: rating for name, rating, *_ in store.rating_table().ratings()
+            }
+            self.assertGreater(ratings[FIRST_CHOICE], ratings[RANDOM])
+
+        # Each game is a row, with its seed
+        with sqlite3.connect(self.path) as connection:
+            rows = connection.execute(
+                "SELECT game_number, seed FROM games ORDER BY id"
+            ).fetchall()
+        self.assertEqual(rows, [(nb, f"0:{nb}") for nb in range(1, 21)])
+
+    def test_batches(self):
+        store = ResultsStore(self.path, batch_size=4)
+        tester = make_tester(store)
+        tester.play_1v1(RandomPlayer(1), FirstChoicePlayer(2), nb_games=6)
+
+        # Written at the end of the match
+        with sqlite3.connect(self.path) as connection:
+            self.assertEqual(
+                connection.execute("SELECT COUNT(*) FROM games").fetchone(), (6,)
+            )
+
+        # The pairings are accumulated across matches and runs
+        store.run = "second"
+        tester.play_1v1(RandomPlayer(1), FirstChoicePlayer(2), nb_games=5)
+        tester.play_1v1(FirstChoicePlayer(1), RandomPlayer(2), nb_games=3)
+        store.close()
+
+        store = ResultsStore(self.path)
+        self.assertEqual(
+            [(p.player1, p.nb_games) for p in store.pairings()],
+            [(FIRST_CHOICE, 3), (RANDOM, 11)],
+        )
+        self.assertEqual(
+            [(p.player1, p.nb_games) for p in store.pairings("second")],
+            [(FIRST_CHOICE, 3), (RANDOM, 5)],
+        )
+        self.assertEqual(store.pairing("Unknown", RANDOM).nb_games, 0)
+        store.close()
+
+    def test_truncate_pairing(self):
+        with ResultsStore(":memory:") as store:
+            tester = make_tester(store)
+            tester.play_1v1(RandomPlayer(1), FirstChoicePlayer(2), nb_games=4)
+            expected = store.pairing(RANDOM, FIRST_CHOICE)
+
+        with ResultsStore(":memory:") as store:
+            tester = make_tester(store)
+            tester.play_1v1(RandomPlayer(1), FirstChoicePlayer(2), nb_games=10)
+            tester.play_1v1(FirstChoicePlayer(1), RandomPlayer(2), nb_games=3)
+
+            # The seeded games are the same, the totals are counted again
+            store.truncate_pairing(RANDOM, FIRST_CHOICE, 4)
+            pairing = store.pairing(RANDOM, FIRST_CHOICE)
+            for attribute in ("nb_games", "wins1", "wins2", "plies"):
+                self.assertEqual(
+                    getattr(pairing, attribute), getattr(expected, attribute)
+                )
+            self.assertEqual(store.pairing(FIRST_CHOICE, RANDOM).nb_games, 3)
+
+            store.truncate_pairing(RANDOM, FIRST_CHOICE)
+            self.assertEqual([p.player1 for p in store.pairings()], [FIRST_CHOICE])
+
+            # Missing games can't be kept
+            with self.assertRaises(ValueError):
+                store.truncate_pairing(FIRST_CHOICE, RANDOM, 4)
+            self.assertEqual(store.pairing(FIRST_CHOICE, RANDOM).nb_games, 3)
+
+    def test_checkpoint_writes_games(self):
+        checkpoint = os.path.join(self.directory.name, "match.json")
+        store = ResultsStore(self.path, batch_size=100)
+        tester = make_tester(store)
+        tester.checkpoint_interval = 4
+        with self.assertRaises(RuntimeError):
+            tester.play_1v1(
+                CrashingRandomPlayer(1, 100),
+                FirstChoicePlayer(2),
+                nb_games=40,
+                checkpoint=checkpoint,
+            )
+
+        # The process dies with the games after the last checkpoint unwritten
+        store._pending = []
+        store.close()
+        nb_played_games = MatchCheckpoint.load(checkpoint).nb_played_games
+        self.assertGreater(nb_played_games, 0)
+        with ResultsStore(self.path) as resumed_store:
+            resumed_store.truncate_pairing(RANDOM, FIRST_CHOICE, nb_played_games)
+            pairing = resumed_store.pairing(RANDOM, FIRST_CHOICE)
+            self.assertEqual(pairing.nb_games, nb_played_games)
+
+    def test_invalid_batch_size(self):
+        with self.assertRaises(ValueError):
+            ResultsStore(":memory:", batch_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
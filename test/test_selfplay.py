@@ -0,0 +1,177 @@
+# Test file for selfplay.py
+
+import os
+import random
+import tempfile
+import unittest
+from multiprocessing import get_context
+
+from santorinai.board import Board
+from santorinai.env import NB_ACTIONS, encode_action, observation_size
+from santorinai.player import Player
+from santorinai.player_examples.first_choice_player import FirstChoicePlayer
+from santorinai.player_examples.random_player import RandomPlayer
+from santorinai.selfplay import (
+    HEADER_SIZE,
+    ReplayBuffer,
+    SelfPlayTester,
+    generate,
+    policy_target,
+)
+
+
+class CountingPlayer(Player):
+    """
+    A random player exposing the number of times it drew each move
+    """
+
+    def name(self):
+        return "Counting"
+
+    def place_pawn(self, board, pawn):
+        self.visits = None
+        return random.choice(board.get_possible_movement_positions(pawn))
+
+    def play_move(self, board):
+        self.visits = {}
+        for _ in range(10):
+            action = board.sample_random_action(random)
+            self.visits[action] = self.visits.get(action, 0) + 1
+        return max(self.visits, key=self.visits.get)
+
+    def search_statistics(self):
+        return self.visits
+
+
+def check_consistent_records(path, nb_reads, errors):
+    # Reads records written as value = first observation byte = policy[0]
+    with ReplayBuffer(path) as buffer:
+        for _ in range(nb_reads):
+            if len(buffer) == 0:
+                continue
+            observation, policy, value = buffer.sample(1)[0]
+            if set(observation) != {value} or policy[0] != value:
+                errors.put((observation[0], policy[0], value))
+    errors.put(None)
+
+
+class TestReplayBuffer(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "buffer")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def record(self, value):
+        observation = bytes([value]) * observation_size(2)
+        return observation, [float(value)] * NB_ACTIONS, value
+
+    def test_ring(self):
+        with ReplayBuffer(self.path, capacity=3) as buffer:
+            self.assertEqual(len(buffer), 0)
+            with self.assertRaises(ValueError):
+                buffer.sample(1)
+
+            for value in range(5):
+                buffer.append(*self.record(value))
+
+            self.assertEqual(len(buffer), 3)
+            self.assertEqual(buffer.nb_written, 5)
+            # The 2 oldest positions were overwritten
+            values = sorted(buffer.read(index)[2] for index in range(3))
+            self.assertEqual(values, [2, 3, 4])
+            with self.assertRaises(IndexError):
+                buffer.read(3)
+
+        # Opened again
+        with ReplayBuffer(self.path) as buffer:
+            self.assertEqual(buffer.capacity, 3)
+            self.assertEqual(buffer.nb_written, 5)
+            observation, policy, value = buffer.sample(1, random.Random(0))[0]
+            self.assertEqual(observation, self.record(value)[0])
+            self.assertEqual(len(policy), NB_ACTIONS)
+
+    def test_not_a_buffer(self):
+        with open(self.path, "wb") as file:
+            file.write(bytes(100))
+        with self.assertRaises(ValueError):
+            ReplayBuffer(self.path)
+
+    def test_concurrent_reader(self):
+        context = get_context()
+        errors = context.Queue()
+        with ReplayBuffer(self.path, capacity=8) as buffer:
+            reader = context.Process(
+                target=check_consistent_records, args=(self.path, 20000, errors)
+            )
+            reader.start()
+            value = 0
+            while reader.is_alive():
+                buffer.append(*self.record(value % 100))
+                value += 1
+            reader.join()
+
+        self.assertIsNone(errors.get(timeout=5))
+
+    def test_dead_writer(self):
+        with ReplayBuffer(self.path, capacity=2) as buffer:
+            buffer.append(*self.record(1))
+
+            # The writer died in the middle of the slot, its sequence is odd
+            reader = ReplayBuffer(self.path)
+            reader.read_timeout = 0.05
+            reader._mmap[HEADER_SIZE] |= 1
+            with self.assertRaises(RuntimeError):
+                reader.read(0)
+            reader.close()
+
+
+class TestSelfPlay(unittest.TestCase):
+    def test_policy_target(self):
+        board = Board(2)
+        for position in [(0, 0), (4, 4), (2, 2), (4, 0)]:
+            board.place_pawn(position)
+
+        ply1, ply2 = (1, (0, 1), (0, 0)), (2, (2, 3), (2, 2))
+        policy = policy_target(board, ply1, {ply1: 3, ply2: 1, "invalid": 5})
+        self.assertEqual(policy[encode_action(board, ply1)], 0.75)
+        self.assertEqual(policy[encode_action(board, ply2)], 0.25)
+        self.assertEqual(sum(policy), 1)
+
+        # Without statistics, the played answer
+        policy = policy_target(board, ply2, None)
+        self.assertEqual(policy[encode_action(board, ply2)], 1)
+
+    def test_record_game(self):
+        players = [CountingPlayer(1), FirstChoicePlayer(2)]
+        records = SelfPlayTester().record_game(players)
+        self.assertGreater(len(records), 4)
+
+    def test_generate(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "buffer")
+            with ReplayBuffer(path, capacity=10000) as buffer:
+                nb_positions = generate(
+                    buffer,
+                    [CountingPlayer, (RandomPlayer, {"log_level": 0})],
+                    nb_games=6,
+                    nb_workers=2,
+                    max_pending_games=1,
+                )
+                self.assertEqual(len(buffer), nb_positions)
+
+                values = set()
+                for index in range(len(buffer)):
+                    _, policy, value = buffer.read(index)
+                    self.assertAlmostEqual(sum(policy), 1, places=5)
+                    values.add(value)
+                self.assertEqual(values, {-1, 1})
+
+            with ReplayBuffer(path, capacity=10) as buffer:
+                with self.assertRaises(ValueError):
+                    generate(buffer, [RandomPlayer], nb_games=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
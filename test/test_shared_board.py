@@ -0,0 +1,104 @@
+# Test file for shared_board.py
+
+import pickle
+import unittest
+from multiprocessing import Pipe, Process
+
+from santorinai.board import Board
+from santorinai.shared_board import BoardSlotPool, SharedBoardView
+
+
+def read_boards(pool_name, nb_slots, connection):
+    """
+    Sends back the notation of the boards of the slots it is signaled.
+    """
+    with BoardSlotPool(nb_slots, pool_name) as pool:
+        while True:
+            slot = connection.recv()
+            if slot is None:
+                break
+            connection.send(pool.view(slot).to_notation())
+
+
+def started_board(nb_players=2):
+    board = Board(nb_players)
+    for position in [(0, 0), (4, 4), (2, 0), (4, 0), (1, 3), (3, 1)][: nb_players * 2]:
+        board.place_pawn(position)
+    return board
+
+
+class TestSharedBoard(unittest.TestCase):
+    def test_write_and_view(self):
+        board = started_board()
+        board.play_move(1, (0, 1), (1, 1))
+
+        with BoardSlotPool(3) as pool:
+            pool.write(2, board)
+            view = pool.view(2)
+            self.assertIsInstance(view, SharedBoardView)
+            self.assertEqual(view.to_notation(), board.to_notation())
+            self.assertEqual(
+                set(view.iter_all_actions(2)), set(board.iter_all_actions(2))
+            )
+
+            # The view follows the writes
+            board.play_move(1, (4, 3), (3, 3))
+            pool.write(2, board)
+            self.assertEqual(view.to_notation(), board.to_notation())
+
+            # Moves played on the view are written in the slot
+            self.assertTrue(view.play_move(1, (0, 2), (0, 3))[0])
+            self.assertEqual(pool.read(2).board[0][3], 1)
+            self.assertEqual(pool.read(2).player_turn, 2)
+
+            # Copies are independent regular boards
+            copy = view.copy()
+            self.assertIs(type(copy), Board)
+            copy.play_move(1, (4, 2), (4, 1))
+            self.assertEqual(view.board[4][1], 0)
+
+            # Pickled as regular boards
+            self.assertEqual(
+                pickle.loads(pickle.dumps(view)).to_notation(), view.to_notation()
+            )
+
+    def test_slots_are_independent(self):
+        with BoardSlotPool(2) as pool:
+            pool.write(0, started_board(2))
+            pool.write(1, started_board(3))
+            self.assertEqual(pool.view(0).nb_players, 2)
+            self.assertEqual(len(pool.view(1).pawns), 6)
+
+            # A slot can be reused for another number of players
+            pool.write(0, started_board(3))
+            self.assertEqual(pool.view(0).to_notation(), started_board(3).to_notation())
+
+            with self.assertRaises(IndexError):
+                pool.write(2, Board(2))
+
+        with BoardSlotPool(1) as pool:
+            with self.assertRaises(ValueError):
+                pool.view(0)
+
+    def test_other_process(self):
+        board = started_board()
+        connection, worker_connection = Pipe()
+
+        with BoardSlotPool(4) as pool:
+            worker = Process(target=read_boards, args=(pool.name, 4, worker_connection))
+            worker.start()
+            try:
+                for slot, move in enumerate(
+                    [((0, 1), (1, 1)), ((4, 3), (3, 3)), ((0, 2), (0, 3))]
+                ):
+                    board.play_move(1, *move)
+                    pool.write(slot, board)
+                    connection.send(slot)
+                    self.assertEqual(connection.recv(), board.to_notation())
+            finally:
+                connection.send(None)
+                worker.join()
+
+
+if __name__ == "__main__":
+    unittest.main()
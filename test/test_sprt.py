@@ -0,0 +1,45 @@
+# Test file for sprt.py
+
+import unittest
+
+from santorinai.sprt import SPRT, H0, H1, elo_to_score, score_to_elo, wilson_interval
+
+
+class TestSPRT(unittest.TestCase):
+    def test_elo_conversions(self):
+        self.assertAlmostEqual(elo_to_score(0), 0.5)
+        self.assertAlmostEqual(score_to_elo(elo_to_score(200)), 200)
+        self.assertGreater(elo_to_score(100), 0.5)
+
+    def test_wilson_interval(self):
+        self.assertEqual(wilson_interval(0, 0), (0.0, 1.0))
+        low, high = wilson_interval(50, 100)
+        self.assertLess(low, 0.5)
+        self.assertGreater(high, 0.5)
+        self.assertAlmostEqual(0.5 - low, high - 0.5)
+
+        # The interval shrinks with the number of games
+        low2, high2 = wilson_interval(500, 1000)
+        self.assertLess(high2 - low2, high - low)
+
+    def test_invalid_bounds(self):
+        self.assertRaises(ValueError, SPRT, 100, 0)
+        self.assertRaises(ValueError, SPRT, 0, 100, 0)
+
+    def test_h1_accepted(self):
+        sprt = SPRT(0, 100)
+        self.assertIsNone(sprt.result)
+        while not sprt.is_decided():
+            sprt.update(True)
+        self.assertEqual(sprt.result, H1)
+        self.assertLess(sprt.nb_games, 20)
+        self.assertEqual(sprt.elo_interval()[1], float("inf"))
+
+    def test_h0_accepted(self):
+        sprt = SPRT(0, 100)
+        while not sprt.is_decided():
+            sprt.update(False)
+            sprt.update(None)
+        self.assertEqual(sprt.result, H0)
+        self.assertEqual(sprt.wins, 0)
+        self.assertEqual(sprt.draws, sprt.losses)
@@ -0,0 +1,136 @@
+# Test file for subprocess_player.py
+
+import os
+import time
+import unittest
+
+from santorinai.board import Board
+from santorinai.player_examples.first_choice_player import FirstChoicePlayer
+from santorinai.player_examples.random_player import RandomPlayer
+from santorinai.subprocess_player import (
+    AgentProcessPool,
+    SubprocessPlayer,
+    decode_board,
+    encode_board,
+)
+from santorinai.tester import Tester
+
+FIRST_CHOICE = "santorinai.player_examples.first_choice_player:FirstChoicePlayer"
+
+
+class CrashingPlayer(FirstChoicePlayer):
+    """
+    A player whose process dies when it has to move
+    """
+
+    def name(self):
+        return "Crashy"
+
+    def play_move(self, board):
+        os._exit(1)
+
+
+class HangingPlayer(FirstChoicePlayer):
+    """
+    A player which never answers when it has to move
+    """
+
+    def name(self):
+        return "Hangy"
+
+    def play_move(self, board):
+        time.sleep(3600)
+
+
+class TestSubprocessPlayer(unittest.TestCase):
+    def test_encode_board(self):
+        board = Board(2)
+        board.place_pawn((1, 2))
+        board.board[3][4] = 2
+
+        decoded = decode_board(encode_board(board))
+        self.assertEqual(decoded.board, board.board)
+        self.assertEqual(decoded.pawns[0].pos, (1, 2))
+        self.assertEqual(decoded.pawns[1].pos, (None, None))
+        self.assertEqual(decoded.player_turn, 2)
+
+    def test_play_1v1(self):
+        tester = Tester()
+        tester.verbose_level = 0
+
+        with SubprocessPlayer(FIRST_CHOICE, 1) as player1:
+            self.assertEqual(player1.name(), "Firsty First")
+            nb_victories, _ = tester.play_1v1(player1, RandomPlayer(2), nb_games=3)
+
+        self.assertEqual(sum(nb_victories.values()), 3)
+
+    def test_shared_board(self):
+        board = Board(2)
+        for position in [(1, 1), (3, 3), (1, 3), (3, 1)]:
+            board.place_pawn(position)
+        board.play_move(1, (2, 2), (2, 3))
+
+        with SubprocessPlayer(FIRST_CHOICE, 2) as json_player:
+            with SubprocessPlayer(FIRST_CHOICE, 2, shared_board=True) as player:
+                self.assertEqual(player.play_move(board), json_player.play_move(board))
+
+                # The agent reads the boards in place, after each write
+                board.play_move(1, (3, 2), (4, 2))
+                self.assertEqual(player.play_move(board), json_player.play_move(board))
+
+                tester = Tester()
+                tester.verbose_level = 0
+                nb_victories, _ = tester.play_1v1(RandomPlayer(1), player, nb_games=3)
+                self.assertEqual(sum(nb_victories.values()), 3)
+
+    def test_pool_reuses_processes(self):
+        with AgentProcessPool() as pool:
+            player = SubprocessPlayer(FIRST_CHOICE, 1, pool=pool)
+            pid = player.agent.process.pid
+            player.close()
+
+            player = SubprocessPlayer(FIRST_CHOICE, 1, pool=pool)
+            self.assertEqual(player.agent.process.pid, pid)
+            player.close()
+
+            # Another configuration needs another process
+            player = SubprocessPlayer(FIRST_CHOICE, 2, pool=pool)
+            self.assertNotEqual(player.agent.process.pid, pid)
+            player.close()
+
+    def test_crashing_player_loses(self):
+        tester = Tester()
+        tester.verbose_level = 0
+
+        with SubprocessPlayer("test.test_subprocess_player:CrashingPlayer", 1) as p1:
+            nb_victories, dic_win_lose_type = tester.play_1v1(
+                p1, RandomPlayer(2), nb_games=2
+            )
+
+        self.assertEqual(nb_victories, {"Crashy": 0, "Randy Random": 2})
+        self.assertEqual(
+            dic_win_lose_type["Crashy"], {"The pawn number is not an integer.": 2}
+        )
+
+    def test_hanging_player_loses(self):
+        tester = Tester()
+        tester.verbose_level = 0
+
+        spec = "test.test_subprocess_player:HangingPlayer"
+        with SubprocessPlayer(spec, 1, timeout=0.5) as p1:
+            pid = p1.agent.process.pid
+            start = time.perf_counter()
+            nb_victories, dic_win_lose_type = tester.play_1v1(
+                p1, RandomPlayer(2), nb_games=2
+            )
+            self.assertLess(time.perf_counter() - start, 30)
+
+            # The hanging process was killed, a new one takes the next request
+            self.assertFalse(p1.agent.is_alive())
+            p1.new_game()
+            self.assertNotEqual(p1.agent.process.pid, pid)
+
+        self.assertEqual(nb_victories, {"Hangy": 0, "Randy Random": 2})
+        self.assertEqual(
+            dic_win_lose_type["Hangy"], {"The pawn number is not an integer.": 2}
+        )
@@ -2,9 +2,13 @@
 
 import unittest
 
+from santorinai.player import BatchedPlayer
+from santorinai.reasons import Reason
+from santorinai.sprt import SPRT
 from santorinai.tester import Tester
 from santorinai.player_examples.random_player import RandomPlayer
 from santorinai.player_examples.first_choice_player import FirstChoicePlayer
+from santorinai.player_examples.basic_player import BasicPlayer
 
 
 class TestTester(unittest.TestCase):
@@ -22,3 +26,248 @@ class TestTester(unittest.TestCase):
         player1 = RandomPlayer(2)
         player2 = FirstChoicePlayer(2)
         tester.play_1v1(player1, player2, nb_games=10)
+
+    def test_play_1v1_sprt(self):
+        tester = Tester()
+        tester.verbose_level = 0
+
+        player1 = FirstChoicePlayer(1)
+        player2 = RandomPlayer(2)
+        sprt = SPRT(-100, 100)
+        nb_victories, _ = tester.play_1v1(player1, player2, nb_games=1000, sprt=sprt)
+
+        self.assertTrue(sprt.is_decided())
+        self.assertLess(sprt.nb_games, 1000)
+        self.assertEqual(sum(nb_victories.values()), sprt.nb_games)
+
+    def test_invalid_placement(self):
+        # The opponent wins, the reason is registered for the player who failed
+        tester = Tester()
+        tester.verbose_level = 0
+        player1 = OffBoardPlacementPlayer(1)
+        player2 = FirstChoicePlayer(2)
+        nb_victories, dic_win_lose_type = tester.play_1v1(player1, player2, 2)
+
+        self.assertEqual(nb_victories, {player1.name(): 0, player2.name(): 2})
+        self.assertEqual(
+            dic_win_lose_type[player1.name()], {Reason.POSITION_OUTSIDE: 2}
+        )
+        self.assertEqual(dic_win_lose_type[player2.name()], {})
+
+    def test_invalid_move(self):
+        tester = Tester()
+        tester.verbose_level = 0
+        player1 = OffBoardMovePlayer(1)
+        player2 = FirstChoicePlayer(2)
+        nb_victories, dic_win_lose_type = tester.play_1v1(player1, player2, 2)
+
+        self.assertEqual(nb_victories, {player1.name(): 0, player2.name(): 2})
+        self.assertEqual(
+            dic_win_lose_type[player1.name()], {Reason.POSITION_OUTSIDE: 2}
+        )
+        self.assertEqual(dic_win_lose_type[player2.name()], {})
+
+
+class OffBoardPlacementPlayer(FirstChoicePlayer):
+    """
+    A player placing its pawns outside of the board
+    """
+
+    def name(self):
+        return "Off board placement"
+
+    def place_pawn(self, board, pawn):
+        return (9, 9)
+
+
+class OffBoardMovePlayer(FirstChoicePlayer):
+    """
+    A player moving its pawns outside of the board
+    """
+
+    def name(self):
+        return "Off board move"
+
+    def play_move(self, board):
+        return 1, (9, 9), (0, 0)
+
+
+class TrustedRandomPlayer(RandomPlayer):
+    trusted = True
+
+
+class TrustedBasicPlayer(BasicPlayer):
+    trusted = True
+
+
+class CheatingPlayer(FirstChoicePlayer):
+    """
+    A trusted player building too far from its pawn after its first move
+    """
+
+    trusted = True
+
+    def name(self):
+        return "Cheater"
+
+    def new_game(self):
+        self.nb_moves = 0
+
+    def play_move(self, board):
+        self.nb_moves += 1
+        pawn_order, move_position, build_position = super().play_move(board)
+        if self.nb_moves > 1 and move_position is not None:
+            build_position = ((move_position[0] + 2) % 5, move_position[1])
+        return pawn_order, move_position, build_position
+
+
+class OffBoardPlayer(FirstChoicePlayer):
+    """
+    A trusted player answering a position outside of the board at its second
+    move, to move its pawn or to build
+    """
+
+    trusted = True
+
+    def __init__(self, player_number, log_level=0, off_board_build=False):
+        super().__init__(player_number, log_level)
+        self.off_board_build = off_board_build
+
+    def name(self):
+        return "Off board"
+
+    def new_game(self):
+        self.nb_moves = 0
+
+    def play_move(self, board):
+        self.nb_moves += 1
+        pawn_order, move_position, build_position = super().play_move(board)
+        if self.nb_moves == 2:
+            if self.off_board_build:
+                return pawn_order, move_position, (9, 9)
+            return pawn_order, (9, 9), (0, 0)
+        return pawn_order, move_position, build_position
+
+
+class TestTesterTrusted(unittest.TestCase):
+    def play_seeded(self, player1, player2, trusted_referee):
+        tester = Tester()
+        tester.verbose_level = 0
+        tester.seed = 0
+        tester.trusted_referee = trusted_referee
+        tester.verify_trusted_games = True
+        return tester, tester.play_1v1(player1, player2, nb_games=40)
+
+    def test_same_games(self):
+        _, expected = self.play_seeded(RandomPlayer(1), BasicPlayer(2), False)
+        tester, results = self.play_seeded(
+            TrustedRandomPlayer(1), TrustedBasicPlayer(2), True
+        )
+        self.assertEqual(results, expected)
+        self.assertEqual(tester.nb_corrected_games, 0)
+
+    def test_replay_corrects_invalid_moves(self):
+        # The results are the ones of a referee validating all the moves
+        _, expected = self.play_seeded(CheatingPlayer(1), RandomPlayer(2), False)
+        tester, results = self.play_seeded(CheatingPlayer(1), RandomPlayer(2), True)
+        self.assertEqual(results, expected)
+        self.assertGreater(tester.nb_corrected_games, 0)
+        self.assertIn("It is not possible to build that far.", results[1]["Cheater"])
+
+    def test_raising_trusted_move(self):
+        # Without replay, the answer is validated and the player forfeits
+        for off_board_build in (False, True):
+            results = []
+            for trusted_referee in (False, True):
+                tester = Tester()
+                tester.verbose_level = 0
+                tester.seed = 0
+                tester.trusted_referee = trusted_referee
+                tester.trusted_sample_rate = 0.0
+                results.append(
+                    tester.play_1v1(
+                        OffBoardPlayer(1, off_board_build=off_board_build),
+                        RandomPlayer(2),
+                        nb_games=5,
+                    )
+                )
+            self.assertEqual(results[1], results[0])
+            self.assertEqual(results[1][0]["Off board"], 0)
+
+    def test_sampled_validation(self):
+        tester = Tester()
+        tester.verbose_level = 0
+        tester.trusted_referee = True
+        tester.verify_trusted_games = False
+        tester.trusted_sample_rate = 1.0
+        nb_victories, _ = tester.play_1v1(
+            CheatingPlayer(1), RandomPlayer(2), nb_games=10
+        )
+        self.assertEqual(nb_victories["Cheater"], 0)
+        self.assertEqual(tester.nb_corrected_games, 0)
+
+
+class BatchedFirstChoicePlayer(BatchedPlayer):
+    """
+    A first choice player recording the size of the batches it receives
+    """
+
+    def __init__(self, player_number, log_level=0) -> None:
+        super().__init__(player_number, log_level)
+        self.player = FirstChoicePlayer(player_number)
+        self.batch_sizes = []
+
+    def name(self):
+        return "Batched First"
+
+    def place_pawn(self, board, pawn):
+        return self.player.place_pawn(board, pawn)
+
+    def play_moves(self, boards):
+        self.batch_sizes.append(len(boards))
+        return [self.player.play_move(board) for board in boards]
+
+
+class NewGameCountingPlayer(RandomPlayer):
+    def __init__(self, player_number, log_level=0):
+        super().__init__(player_number, log_level)
+        self.nb_new_games = 0
+
+    def new_game(self):
+        self.nb_new_games += 1
+
+
+class TestTesterBatched(unittest.TestCase):
+    def test_play_1v1_batched(self):
+        tester = Tester()
+        tester.verbose_level = 0
+
+        player1 = BatchedFirstChoicePlayer(1)
+        player2 = RandomPlayer(2)
+        nb_victories, _ = tester.play_1v1_batched(
+            player1, player2, nb_games=30, nb_parallel_games=10
+        )
+
+        self.assertEqual(sum(nb_victories.values()), 30)
+        self.assertEqual(max(player1.batch_sizes), 10)
+
+    def test_new_game(self):
+        tester = Tester()
+        tester.verbose_level = 0
+
+        # The running games share the player, none of them resets it
+        player1 = NewGameCountingPlayer(1)
+        tester.play_1v1_batched(player1, FirstChoicePlayer(2), nb_games=8)
+        self.assertEqual(player1.nb_new_games, 0)
+
+        tester.play_1v1(player1, FirstChoicePlayer(2), nb_games=3)
+        self.assertEqual(player1.nb_new_games, 3)
+
+    def test_batched_player_in_play_1v1(self):
+        tester = Tester()
+        tester.verbose_level = 0
+
+        player1 = BatchedFirstChoicePlayer(1)
+        nb_victories, _ = tester.play_1v1(player1, RandomPlayer(2), nb_games=3)
+        self.assertEqual(sum(nb_victories.values()), 3)
+        self.assertEqual(set(player1.batch_sizes), {1})
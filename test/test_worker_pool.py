@@ -0,0 +1,163 @@
+# Test file for worker_pool.py
+
+import os
+import tempfile
+import unittest
+
+from santorinai.checkpoint import MatchCheckpoint
+from santorinai.player_examples.basic_player import BasicPlayer
+from santorinai.player_examples.first_choice_player import FirstChoicePlayer
+from santorinai.player_examples.random_player import RandomPlayer
+from santorinai.results_store import ResultsStore
+from santorinai.sprt import SPRT
+from santorinai.tester import Tester
+from santorinai.worker_pool import WorkerPool, player_spec
+
+
+class NamedRandomPlayer(RandomPlayer):
+    """
+    A random player named after its constructor arguments
+    """
+
+    def __init__(self, player_number, log_level=0, name="Named"):
+        super().__init__(player_number, log_level)
+        self.player_name = name
+
+    def name(self):
+        return self.player_name
+
+
+class CreationCountingPlayer(RandomPlayer):
+    """
+    A random player whose name tells how many instances its process created
+    """
+
+    nb_instances = 0
+
+    def __init__(self, player_number, log_level=0):
+        super().__init__(player_number, log_level)
+        CreationCountingPlayer.nb_instances += 1
+
+    def name(self):
+        return f"Counting {CreationCountingPlayer.nb_instances}"
+
+
+class BrokenPlayer(RandomPlayer):
+    def name(self):
+        return "Broken"
+
+    def play_move(self, board):
+        raise ValueError("No move")
+
+
+def make_tester():
+    tester = Tester()
+    tester.verbose_level = 0
+    tester.seed = 0
+    return tester
+
+
+class TestWorkerPool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = WorkerPool(nb_workers=2, max_chunk_size=4)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+
+    def test_same_results_as_play_1v1(self):
+        tester = make_tester()
+        expected = tester.play_1v1(RandomPlayer(1), FirstChoicePlayer(2), nb_games=30)
+        results = tester.play_1v1_parallel(
+            self.pool, RandomPlayer, FirstChoicePlayer, nb_games=30
+        )
+        self.assertEqual(results, expected)
+
+        # The same workers play the next matches
+        pids = list(self.pool.pids)
+        tester.play_1v1_parallel(self.pool, BasicPlayer, RandomPlayer, nb_games=10)
+        self.assertEqual(self.pool.pids, pids)
+
+    def test_sprt(self):
+        tester = make_tester()
+        expected_sprt = SPRT(-100, 100)
+        expected = tester.play_1v1(
+            BasicPlayer(1), RandomPlayer(2), nb_games=500, sprt=expected_sprt
+        )
+
+        sprt = SPRT(-100, 100)
+        results = tester.play_1v1_parallel(
+            self.pool, BasicPlayer, RandomPlayer, nb_games=500, sprt=sprt
+        )
+        self.assertTrue(sprt.is_decided())
+        self.assertEqual(sprt.nb_games, expected_sprt.nb_games)
+        self.assertEqual(results, expected)
+
+        # The chunks of the stopped match are not mixed with the next one
+        nb_victories, _ = tester.play_1v1_parallel(
+            self.pool, RandomPlayer, FirstChoicePlayer, nb_games=5
+        )
+        self.assertEqual(sum(nb_victories.values()), 5)
+
+    def test_players_are_kept(self):
+        tester = make_tester()
+        player1 = (NamedRandomPlayer, {"name": "First"})
+        player2 = (NamedRandomPlayer, {"name": "Second"})
+        nb_victories, _ = tester.play_1v1_parallel(
+            self.pool, player1, player2, nb_games=20
+        )
+        self.assertEqual(set(nb_victories), {"First", "Second"})
+
+        # Created once per worker, whatever the number of games and matches
+        for _ in range(2):
+            nb_victories, _ = tester.play_1v1_parallel(
+                self.pool, CreationCountingPlayer, player2, nb_games=20
+            )
+            self.assertEqual(set(nb_victories), {"Counting 1", "Second"})
+
+    def test_observers_and_checkpoint(self):
+        tester = make_tester()
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = os.path.join(directory, "match.json")
+            with ResultsStore(os.path.join(directory, "results.db")) as store:
+                tester.subscribe(store)
+                nb_victories, _ = tester.play_1v1_parallel(
+                    self.pool,
+                    RandomPlayer,
+                    FirstChoicePlayer,
+                    nb_games=12,
+                    checkpoint=checkpoint,
+                )
+                pairing = store.pairing(RandomPlayer(1).name(), "Firsty First")
+                self.assertEqual(pairing.nb_victories, nb_victories)
+                self.assertGreater(pairing.plies, 12 * 4)
+            self.assertEqual(MatchCheckpoint.load(checkpoint).nb_played_games, 12)
+
+    def test_errors(self):
+        tester = make_tester()
+        with self.assertRaises(TypeError):
+            tester.play_1v1_parallel(self.pool, RandomPlayer(1), FirstChoicePlayer)
+        with self.assertRaises(ValueError):
+            tester.play_1v1_parallel(self.pool, RandomPlayer, RandomPlayer)
+        with self.assertRaises(RuntimeError):
+            tester.play_1v1_parallel(self.pool, BrokenPlayer, RandomPlayer, 10)
+
+        # The pool can still be used
+        nb_victories, _ = tester.play_1v1_parallel(
+            self.pool, RandomPlayer, FirstChoicePlayer, nb_games=3
+        )
+        self.assertEqual(sum(nb_victories.values()), 3)
+
+    def test_player_spec(self):
+        self.assertEqual(player_spec(RandomPlayer), (RandomPlayer, {}))
+        self.assertEqual(
+            player_spec((NamedRandomPlayer, {"name": "a"})),
+            (NamedRandomPlayer, {"name": "a"}),
+        )
+        with self.assertRaises(TypeError):
+            player_spec(Tester)
+
+
+if __name__ == "__main__":
+    unittest.main()